@@ -0,0 +1,1336 @@
+"""
+MemoryCharm Financial Model — Python evaluation engine
+Mirrors the 24-Month Projections formulas with numpy so the model can be
+evaluated across months and scenarios in one vectorized pass, and holds the
+tiered service pricing (free band, breakpoints, per-unit rates) that both the
+emitted Excel formulas and the Python evaluation use.
+
+Values are keyed the same way the workbook is: assumptions by Assumptions cell
+address ("C33"), projections by 24-Month Projections row number (p[23]).
+"""
+
+import numpy as np
+
+ASM = "Assumptions"
+MONTHS = 24
+
+# ── Tiered service pricing ───────────────────────────────────────────────────
+# service: unit    = quantity per priced unit (1M executions, 10K ops, 1 GB ...)
+#          free    = free monthly allowance (Assumptions cell, number or None)
+#          bands   = [(upper breakpoint or None, rate), ...] in ascending order
+# References are Assumptions cell addresses so editing a yellow cell changes
+# both the workbook and the Python evaluation.
+
+PRICING = {
+    "blob_storage":   {"unit": 1,         "free": None,   "bands": [(None, "C47")]},
+    "blob_writes":    {"unit": 10000,     "free": None,   "bands": [(None, "C48")]},
+    "blob_reads":     {"unit": 10000,     "free": None,   "bands": [(None, "C49")]},
+    "blob_retrieval": {"unit": 1,         "free": None,   "bands": [(None, "C50")]},
+    "blob_egress":    {"unit": 1,         "free": "C124", "bands": [(None, "C51")]},
+    "r2_storage":     {"unit": 1,         "free": "C59",  "bands": [(None, "C55")]},
+    "r2_class_a":     {"unit": 1000000,   "free": "C122", "bands": [(None, "C56")]},
+    "r2_class_b":     {"unit": 1000000,   "free": "C123", "bands": [(None, "C57")]},
+    "table_storage":  {"unit": 1,         "free": None,   "bands": [(None, "C63")]},
+    "table_txn":      {"unit": 10000,     "free": None,   "bands": [(None, "C64")]},
+    "fn_executions":  {"unit": 1000000,   "free": "C73",  "bands": [(None, "C69")]},
+    "fn_gb_seconds":  {"unit": 1,         "free": "C74",  "bands": [(None, "C70")]},
+    "ciam_mau":       {"unit": 1,         "free": "C125", "bands": [(None, "C79")]},
+    "flex_executions": {"unit": 1000000,  "free": "C200", "bands": [(None, "C197")]},
+    "flex_gb_seconds": {"unit": 1,        "free": "C201", "bands": [(None, "C198")]},
+}
+
+
+def _ref(x):
+    """Formula text for a pricing reference (cell address or literal)."""
+    return f"{ASM}!{x}" if isinstance(x, str) else repr(x)
+
+
+def _val(x, a):
+    """Numeric value for a pricing reference (cell address or literal)."""
+    if x is None:
+        return 0.0
+    return a[x] if isinstance(x, str) else x
+
+
+def tiered_formula(service, qty):
+    """Excel expression for the monthly cost of `qty` units of `service`."""
+    spec = PRICING[service]
+    unit = "" if spec["unit"] == 1 else f"/{spec['unit']}"
+    lo = _ref(spec["free"]) if spec["free"] is not None else None
+    terms = []
+    for upper, rate in spec["bands"]:
+        if upper is None:
+            span = f"MAX(0,{qty}-{lo})" if lo else f"({qty})"
+        else:
+            span = f"MAX(0,MIN({qty},{_ref(upper)})-{lo or 0})"
+        terms.append(f"{span}*{_ref(rate)}{unit}")
+        lo = _ref(upper) if upper is not None else lo
+    return "+".join(terms)
+
+
+def tiered_marginal_formula(service, qty):
+    """Excel expression for the cost of one more unit at monthly volume `qty`."""
+    spec = PRICING[service]
+    expr = "0"
+    # Build from the top band down so each IF falls through to the next band
+    bounds = [b for b, _ in spec["bands"]]
+    unit = "" if spec["unit"] == 1 else f"/{spec['unit']}"
+    for i in range(len(spec["bands"]) - 1, -1, -1):
+        rate = f"{_ref(spec['bands'][i][1])}{unit}"
+        expr = rate if i == len(spec["bands"]) - 1 else f"IF({qty}<{_ref(bounds[i])},{rate},{expr})"
+    if spec["free"] is not None:
+        expr = f"IF({qty}<{_ref(spec['free'])},0,{expr})"
+    return expr
+
+
+def tiered_cost(service, qty, a):
+    """Monthly cost of `qty` units — numpy, broadcasts over months and scenarios."""
+    spec = PRICING[service]
+    q = np.asarray(qty, dtype=float)
+    lo = _val(spec["free"], a)
+    total = np.zeros(np.broadcast(q, lo).shape)
+    for upper, rate in spec["bands"]:
+        hi = np.inf if upper is None else _val(upper, a)
+        total = total + np.clip(q - lo, 0, hi - lo) * _val(rate, a) / spec["unit"]
+        lo = hi
+    return total
+
+
+def tiered_marginal(service, qty, a):
+    """Cost of one more unit at monthly volume `qty` (0 inside the free band)."""
+    spec = PRICING[service]
+    q = np.asarray(qty, dtype=float)
+    lo = _val(spec["free"], a)
+    rate = np.zeros(np.broadcast(q, lo).shape)
+    for upper, r in spec["bands"]:
+        hi = np.inf if upper is None else _val(upper, a)
+        rate = np.where((q >= lo) & (q < hi), _val(r, a) / spec["unit"], rate)
+        lo = hi
+    return rate
+
+
+# ── Scenarios ────────────────────────────────────────────────────────────────
+# Numeric version of the Scenario Notes sheet: overrides by Assumptions cell.
+
+SCENARIOS = {
+    "Conservative": {
+        "C6": 24.99, "C7": 39.99, "C8": 59.99,
+        "C18": 50, "C19": 20, "C20": 5,
+        "D18": 0.05, "D19": 0.06, "D20": 0.08,
+        "D6": 10.00, "D7": 10.00, "D8": 10.00,
+        "C38": 4, "C39": 1, "D29": 0.40, "D30": 0.50,
+        "C85": 250, "C23": 0.01, "C25": 0.08,
+        # Rug Charm line: tier price / units / growth from its scenario block
+        "C267": "C283", "E267": "E283", "F267": "G283",
+        "C268": "C284", "E268": "E284", "F268": "G284",
+        "C269": "C285", "E269": "E285", "F269": "G285",
+    },
+    "Base Case": {},
+    "Optimistic": {
+        "C6": 34.99, "C7": 54.99, "C8": 89.99,
+        "C18": 200, "C19": 80, "C20": 30,
+        "D18": 0.12, "D19": 0.15, "D20": 0.18,
+        "D6": 7.00, "D7": 7.00, "D8": 7.00,
+        "C38": 15, "C39": 5, "D29": 0.70, "D30": 0.20,
+        "C85": 1000, "C23": 0.04, "C25": 0.25,
+        "C267": "D283", "E267": "F283", "F267": "H283",
+        "C268": "D284", "E268": "F284", "F268": "H284",
+        "C269": "D285", "E269": "F285", "F269": "H285",
+    },
+}
+
+
+def read_assumptions(ws):
+    """Numeric input cells on the Assumptions sheet, keyed by address."""
+    a = {}
+    for row in ws.iter_rows():
+        for cell in row:
+            if isinstance(cell.value, (int, float)) and not isinstance(cell.value, bool):
+                a[cell.coordinate] = float(cell.value)
+    return a
+
+
+def scenario_inputs(a, scenarios=SCENARIOS):
+    """
+    Stack assumptions into (S, 1) arrays — one row per scenario. An override
+    given as a cell address takes that Assumptions cell's value.
+    """
+    names = list(scenarios)
+    pick = lambda v: a[v] if isinstance(v, str) else v  # noqa: E731
+    x = {k: np.array([[pick(scenarios[n].get(k, v))] for n in names], dtype=float) for k, v in a.items()}
+    return names, derive(x)
+
+
+def xround(x, digits=0):
+    """Excel ROUND (half away from zero) — numpy rounds half to even."""
+    f = 10.0 ** digits
+    return np.sign(x) * np.floor(np.abs(x) * f + 0.5) / f
+
+
+def _norm_cdf(x):
+    """Standard normal CDF (Abramowitz & Stegun 7.1.26, |error| < 1.5e-7)."""
+    x = np.asarray(x, dtype=float)
+    z = np.abs(x) / np.sqrt(2)
+    t = 1 / (1 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1 - poly * np.exp(-z * z)
+    return 0.5 * (1 + np.sign(x) * erf)
+
+
+def _lognormal_sigma(median, p95):
+    """Lognormal shape from a median and P95 (z at 95% = 1.645)."""
+    return np.log(p95 / median) / 1.645
+
+
+def _lognormal_mean(median, p95):
+    return median * np.exp(_lognormal_sigma(median, p95) ** 2 / 2)
+
+
+# ── Content size distributions ───────────────────────────────────────────────
+# Gauss-Legendre nodes on the standard-normal axis; integrands are smooth on
+# each side of the cap, so 64 nodes per piece is exact to ~1e-14.
+_GL_X, _GL_W = np.polynomial.legendre.leggauss(64)
+_Z_LO, _Z_HI = -8.0, 8.0
+
+
+def _phi_integral(g, lo, hi):
+    """Integral of g(z) * phi(z) over [lo, hi], vectorized over array bounds."""
+    lo, hi = np.broadcast_arrays(np.asarray(lo, dtype=float), np.asarray(hi, dtype=float))
+    half = (hi - lo)[..., None] / 2
+    z = (_GL_X + 1) * half + lo[..., None]
+    return (g(z) * np.exp(-z * z / 2) / np.sqrt(2 * np.pi) * _GL_W * half).sum(axis=-1)
+
+
+def _z(x, median, sigma):
+    return np.clip(np.log(x / median) / sigma, _Z_LO, _Z_HI)
+
+
+def capped_lognormal_mean(median, sigma, cap):
+    """E[min(X, cap)] for lognormal X — sizes above the upload cap are trimmed to it."""
+    median, sigma = np.asarray(median, dtype=float), np.asarray(sigma, dtype=float)
+    zc = _z(cap, median, sigma)
+    body = _phi_integral(lambda z: median[..., None] * np.exp(sigma[..., None] * z), _Z_LO, zc)
+    return body + cap * _phi_integral(np.ones_like, zc, _Z_HI)
+
+
+def _size_mix(a):
+    """(mix weights, medians, sigmas) for video / gallery / audio, stacked on the last axis."""
+    stack = lambda cols: np.stack([np.asarray(a[c], dtype=float) for c in cols], axis=-1)  # noqa: E731
+    return stack(("D29", "D30", "D31")), stack(("C218", "C219", "C220")), stack(("D218", "D219", "D220"))
+
+
+def size_quantiles(a, qs):
+    """Upload-size quantiles (MB) of the capped three-type mixture."""
+    mix, med, sig = _size_mix(a)
+    grid = np.logspace(-2, np.log10(a["C221"]), 4001)
+    cdf = (mix[..., None, :] * _norm_cdf((np.log(grid[:, None]) - np.log(med[..., None, :]))
+                                          / sig[..., None, :])).sum(axis=-1)
+    cdf = np.minimum(cdf / mix.sum(axis=-1, keepdims=True), 1)
+    cdf[..., -1] = 1                                                       # mass at the cap
+    return np.array([np.interp(q, cdf, grid) for q in qs])
+
+
+def size_tail_share(a, q):
+    """Share of stored MB held by uploads above the mixture's q-quantile."""
+    mix, med, sig = _size_mix(a)
+    cut = size_quantiles(a, [q])[0]
+    cap = a["C221"]
+    zq, zc = _z(cut, med, sig), _z(cap, med, sig)
+    above = _phi_integral(lambda z: med[..., None] * np.exp(sig[..., None] * z), zq, zc)
+    above = above + cap * _phi_integral(np.ones_like, zc, _Z_HI)
+    total = capped_lognormal_mean(med, sig, cap)
+    return float((mix * above).sum() / (mix * total).sum())
+
+
+# (Assumptions column, content-size row) per media type; projection row blocks
+MEDIA_TYPES = ("Video", "Gallery", "Audio")
+MEDIA_COLUMNS = (("C", 29), ("D", 30), ("E", 31))
+MEDIA_ROWS = (163, 168, 173)
+
+
+def derive(a):
+    """Evaluate the Assumptions formula cells the projections depend on."""
+    d = dict(a)
+    # Content size distributions (rows 218-220) feed the per-type averages C29:C31
+    for r, size_row in ((218, 29), (219, 30), (220, 31)):
+        d[f"F{r}"] = capped_lognormal_mean(d[f"C{r}"], d[f"D{r}"], d["C221"])
+        d[f"C{size_row}"] = d[f"F{r}"]
+    d["D32"] = d["D29"] + d["D30"] + d["D31"]
+    for r in (29, 30, 31):
+        d[f"E{r}"] = d[f"C{r}"] * d[f"D{r}"]
+    d["C33"] = d["E29"] + d["E30"] + d["E31"]
+
+    thr, part, fail, imgs = d["C107"], d["C108"], d["C109"], d["C110"]
+
+    def multipart_ops(size):
+        return np.where(size > thr, np.ceil(size / part) * np.exp(fail * np.minimum(part, size)) + 2,
+                        np.exp(fail * size))
+
+    def mirror_ops(size):
+        return np.where(size > thr, np.ceil(size / part) + 1, 1)
+
+    def sent_mb(size):
+        return size * np.exp(fail * np.where(size > thr, np.minimum(part, size), size))
+
+    d["C114"] = (d["D29"] * multipart_ops(d["C29"]) + d["D30"] * imgs * np.exp(fail * d["C30"] / imgs)
+                 + d["D31"] * multipart_ops(d["C31"]) + 1)
+    d["C115"] = d["D29"] * mirror_ops(d["C29"]) + d["D30"] * imgs + d["D31"] * mirror_ops(d["C31"])
+    d["C116"] = (d["D29"] * sent_mb(d["C29"]) + d["D30"] * d["C30"] * np.exp(fail * d["C30"] / imgs)
+                 + d["D31"] * sent_mb(d["C31"]))
+    d["C117"] = d["C116"] * 8 / d["C112"] + (d["C114"] - 1) * d["C111"] / 1000
+    d["C118"] = 1 + d["C35"]
+
+    # Server-side recompression (rows 241-244)
+    on = d["C236"] == 1
+    for col, size_row in MEDIA_COLUMNS:
+        d[f"{col}241"] = 1 - d[f"{col}238"] * (1 - d[f"{col}237"])
+        d[f"{col}242"] = d[f"C{size_row}"] * d[f"{col}238"] * d[f"{col}239"] * d["C240"]
+    d["C243"] = np.where(on, sum(d[f"D{r}"] * d[f"C{r}"] * d[f"{col}241"] for col, r in MEDIA_COLUMNS), d["C33"])
+    d["C244"] = np.where(on, sum(d[f"D{r}"] * d[f"{col}242"] for col, r in MEDIA_COLUMNS), 0)
+
+    # Per-media request shape (rows 226-232) — columns C/D/E = video/gallery/audio
+    d["D226"], d["D228"] = d["C110"], d["C30"] / d["C110"]
+    weight = d["C225"] * d["D29"] + d["D225"] * d["D30"] + d["E225"] * d["D31"]
+    for col, size_row in MEDIA_COLUMNS:
+        d[f"{col}229"] = d[f"{col}225"] * d[f"D{size_row}"] / weight
+        d[f"{col}230"] = d[f"C{size_row}"] * d[f"{col}227"] * np.where(on, d[f"{col}241"], 1)
+    d["C231"] = np.maximum(1, np.ceil(d["C230"] / d["C228"]))
+    d["D231"] = np.maximum(1, np.ceil(d["D226"] * d["D227"]))
+    d["E231"] = np.maximum(1, np.ceil(d["E230"] / d["E228"]))
+    d["C232"] = sum(d[f"{col}229"] * d[f"{col}231"] for col, _ in MEDIA_COLUMNS)
+
+    # Storage lifecycle tiers (rows 130-141) — cells linked to other inputs
+    d["E130"], d["E131"] = d["C38"], d["C39"]
+    d["C137"], d["E137"], d["F137"] = d["C55"], d["C57"] / 100, d["C56"] / 100
+    d["C139"], d["D139"], d["E139"], d["F139"] = d["C47"], d["C50"], d["C49"], d["C48"]
+
+    # Playback fallback (rows 152, 160-161)
+    d["C152"] = d["C149"] * (1 - d["C150"]) + d["C151"] / 43200
+    detect = np.where(d["C152"] > 0, (d["C149"] * (1 - d["C150"]) * d["C157"] + d["C151"] / 43200 * d["C158"])
+                      / np.where(d["C152"] > 0, d["C152"], 1), 0)
+    d["C160"] = ((1 - d["C152"]) * _lognormal_mean(d["C153"], d["C154"])
+                 + d["C152"] * (_lognormal_mean(d["C155"], d["C156"]) + detect))
+    d["C161"] = 1 - d["C152"] * (1 - d["C159"])
+
+    # GetCharm metadata cache (rows 173-175)
+    d["C173"] = cache_hit_ratio(d["C38"], d)
+    d["C174"] = cache_hit_ratio(d["C39"], d)
+    d["C175"] = (d["C165"] * (d["C38"] * 3 * d["C173"] + d["C39"] * 9 * d["C174"])
+                 / np.maximum(1, d["C38"] * 3 + d["C39"] * 9))
+
+    # Table write batching (rows 186-187)
+    batches = np.ceil(d["C181"] / d["C180"])
+    on = d["C179"] == 1
+    d["C186"] = np.where(on, d["C42"] - d["C181"] + batches, d["C42"])
+    d["C187"] = np.where(on, (d["C42"] - d["C181"]) * d["C184"] + batches * d["C185"], d["C42"] * d["C184"])
+    return d
+
+
+def cache_hit_ratio(views, a):
+    """
+    Metadata cache hit ratio for a charm with `views` per month: session
+    repeats always hit; the rest arrive Poisson per PoP and hit while the
+    entry is live (TTL, cut short by invalidate-on-edit). Mirrors C173/C174.
+    """
+    lam = (1 - a["C168"]) * np.asarray(views, dtype=float) / 720 / a["C167"]
+    mu = a["C169"] / 720
+    window = np.where(mu > 0, (1 - np.exp(-mu * a["C166"])) / np.where(mu > 0, mu, 1), a["C166"])
+    return a["C168"] + (1 - a["C168"]) * lam * window / (1 + lam * window)
+
+
+def _grow(start, growth, months, step):
+    """Month-over-month series where each month is step(prev * (1 + growth))."""
+    start, growth = np.broadcast_arrays(start, growth)
+    out = np.empty(start.shape[:-1] + (months,))
+    out[..., 0] = start[..., 0]
+    for m in range(1, months):
+        out[..., m] = step(out[..., m - 1] * (1 + growth[..., 0]))
+    return out
+
+
+def _lag_sum(x, n):
+    """Sum of the current and previous n-1 months along the last axis."""
+    c = np.cumsum(x, axis=-1)
+    out = c.copy()
+    out[..., n:] = c[..., n:] - c[..., :-n]
+    return out
+
+
+RETURN_LAG_ROWS = (260, 261, 262)
+
+
+def return_lag_kernel(a, col):
+    """Assumptions {col}260:{col}262 — share of returns arriving 0, 1, 2 months after sale, (..., K)."""
+    return np.concatenate(np.broadcast_arrays(*[np.atleast_1d(a[f"{col}{r}"]) for r in RETURN_LAG_ROWS]), -1)
+
+
+def returns_arrival_kernel(a):
+    """Pre- and post-claim lag kernels blended by the pre-claim share (C97)."""
+    pre = np.atleast_1d(a["C97"])
+    return pre * return_lag_kernel(a, "C") + (1 - pre) * return_lag_kernel(a, "D")
+
+
+def lag_convolve(x, kernel):
+    """
+    Causal convolution along the last axis: out[m] = sum_k x[m-k] * kernel[k],
+    truncated to len(x). Short kernels (the return lags) use shifted adds;
+    long ones go through a zero-padded real FFT, so both stay linear-ish in
+    horizon and fully batched over leading scenario / draw axes.
+    """
+    x, kernel = np.asarray(x, dtype=float), np.asarray(kernel, dtype=float)
+    n, k = x.shape[-1], kernel.shape[-1]
+    if k <= 32:
+        out = np.zeros(np.broadcast_shapes(x.shape, kernel.shape[:-1] + (n,)))
+        for lag in range(min(k, n)):
+            out[..., lag:] += x[..., :n - lag] * kernel[..., lag:lag + 1]
+        return out
+    size = 1 << (n + k - 1).bit_length()
+    return np.fft.irfft(np.fft.rfft(x, size) * np.fft.rfft(kernel, size), size)[..., :n]
+
+
+def project(a, months=MONTHS):
+    """
+    Evaluate the 24-Month Projections rows for assumption arrays `a`
+    (scalars or (S, 1) arrays from scenario_inputs). Returns {row: (S, months)}.
+    """
+    a = {k: np.atleast_2d(v) for k, v in a.items()}
+    p = {}
+    p[6] = _grow(xround(a["C18"] * a["C208"]), a["D18"], months, xround)
+    p[7] = _grow(xround(a["C19"] * a["C208"]), a["D19"], months, xround)
+    p[8] = _grow(xround(a["C20"] * a["C208"]), a["D20"], months, xround)
+    p[9] = p[6] + p[7] + p[8]
+    p[10] = np.cumsum(p[9], axis=-1)
+    p[11] = xround(p[10] * a["C34"])
+
+    # Storage volume
+    p[14] = xround(p[9] * a["C34"] * a["C243"] / 1024, 2)
+    p[15] = np.cumsum(p[14], axis=-1)
+    p[16] = p[15]
+    p[17] = p[15]
+
+    # Request volume
+    new_charms = _lag_sum(p[9], 3)
+    p[20] = xround(new_charms * a["C38"] + np.maximum(0, p[11] - new_charms) * a["C39"])
+    p[21] = xround(p[20] * a["C40"])
+
+    # GetCharm metadata cache (rows 122-128) — hits skip the Function and Table reads
+    p[122] = xround(new_charms * a["C38"])
+    p[123] = np.minimum(1, a["C170"] / np.maximum(1, p[11]))
+    blended = _safe_div(p[122] * a["C173"] + (p[20] - p[122]) * a["C174"], p[20])
+    p[124] = np.where(p[20] > 0, a["C165"] * (a["C168"] + (blended - a["C168"]) * p[123]), 0)
+    p[125] = xround(p[20] * p[124])
+    p[126] = p[125] * a["C43"]
+    p[127] = p[124] * a["C171"] + (1 - p[124]) * a["C172"]
+    p[128] = a["C172"] - p[127]
+
+    p[22] = xround(p[9] * a["C34"] * a["C41"] + (p[20] - p[125]) + p[21] + p[20] * 0.02)
+    p[23] = xround(p[9] * a["C34"] * a["C118"] * a["C114"])
+    # Per-media-type streams (rows 163-177): stored GB, objects, views, GETs, bandwidth
+    claimed = p[9] * a["C34"]
+    for base, (col, size_row) in zip(MEDIA_ROWS, MEDIA_COLUMNS):
+        factor = np.where(a["C236"] == 1, a[f"{col}241"], 1)
+        p[base] = np.cumsum(xround(claimed * a[f"D{size_row}"] * a[f"C{size_row}"] * factor / 1024, 2), axis=-1)
+        p[base + 1] = np.cumsum(xround(claimed * a[f"D{size_row}"]) * a[f"{col}226"], axis=-1)
+        p[base + 2] = xround(p[20] * a[f"{col}229"])
+        p[base + 3] = p[base + 2] * a[f"{col}231"]
+        p[base + 4] = p[base + 2] * a[f"{col}230"] / 1024
+    p[24] = p[166] + p[171] + p[176]
+    p[25] = xround(p[9] * a["C34"] * a["C118"] * a["C115"])
+    p[26] = xround(p[20] * a["C152"])
+
+    # Table write batching (rows 131-136) — glyph logs and claim setup as EGTs
+    on = a["C179"] == 1
+    log_rate = p[21] / 2592000 / a["C183"]                                  # entities/s per buffer
+    p[131] = p[21]
+    p[132] = np.where(on, np.maximum(1, np.minimum(a["C180"], log_rate * a["C182"])), 1)
+    p[133] = xround(p[131] / p[132])
+    p[134] = xround(p[9] * a["C34"] * a["C186"])
+    p[135] = xround(p[9] * a["C34"] * a["C42"]) + p[131] - p[134] - p[133]
+    p[136] = np.where(on & (p[131] > 0),
+                      np.minimum(a["C182"], _safe_div(a["C180"], log_rate)) * 1000 / 2, 0)
+    p[27] = xround(p[134] + (p[20] - p[125]) * a["C43"] + p[21] + p[133])
+    p[28] = xround(p[167] + p[172] + p[177], 1)
+
+    # Infrastructure costs
+    fallback_gb = p[26] * a["C243"] / 1024
+    p[31] = tiered_cost("blob_storage", p[17], a)
+    p[32] = tiered_cost("blob_writes", p[25], a)
+    p[33] = tiered_cost("blob_reads", p[26], a)
+    p[34] = tiered_cost("blob_retrieval", fallback_gb, a) + tiered_cost("blob_egress", fallback_gb, a)
+    p[35] = p[31] + p[32] + p[33] + p[34]
+    p[36] = tiered_cost("r2_storage", p[16], a)
+    p[37] = tiered_cost("r2_class_a", p[23], a)
+    p[38] = tiered_cost("r2_class_b", p[24], a)
+    p[39] = p[36] + p[37] + p[38]
+    p[40] = tiered_cost("table_storage", p[11] * a["C65"] / 1024 / 1024, a) + tiered_cost("table_txn", p[27], a)
+    gb_seconds = p[22] * (a["C71"] / 1000) * (a["C72"] / 1024)
+    p[41] = tiered_cost("fn_executions", p[22], a) + tiered_cost("fn_gb_seconds", gb_seconds, a)
+    p[42] = a["C78"] + tiered_cost("ciam_mau", p[11] * a["C126"], a) + a["C80"] + a["C81"]
+    # Recompression (rows 180-181) — one-time transcoding per upload, in TOTAL INFRASTRUCTURE
+    p[116] = xround(p[9] * a["C34"] * a["C118"])
+    p[180] = p[116] * a["C244"]
+    p[181] = np.cumsum(xround(p[9] * a["C34"] * (a["C33"] - a["C243"]) / 1024, 2), axis=-1)
+    p[43] = p[35] + p[39] + p[40] + p[41] + p[42] + p[180]
+
+    # Functions hosting plans (rows 139-148) — same invocation load priced three ways
+    plans = functions_plan_costs(a, p[22])
+    p[139] = p[22] / 43200
+    p[140] = p[41]
+    p[141] = plans["premium_instances"]
+    p[142] = plans["premium"]
+    p[143] = plans["flex"]
+    p[144] = np.where((p[140] <= p[142]) & (p[140] <= p[143]), 0, np.where(p[142] <= p[143], 1, 2))
+    p[145] = plans["cold_consumption"]
+    p[146] = plans["cold_flex"]
+    p[147] = p[145] * a["C192"]
+    p[148] = p[146] * a["C204"]
+
+    # Scale limits (rows 151-159)
+    p[151] = p[27] / 2592000 * a["C196"]
+    p[152] = p[151] * a["C211"]
+    p[153] = np.ceil(p[22] / 2592000 * a["C196"] * a["C71"] / 1000 / a["C195"])
+    p[154] = p[23] / 30 * a["C113"] / 3600
+    p[155] = p[24] / 2592000 * a["C196"]
+    p[156] = xround(p[11] * a["C126"])
+    p[157] = gb_seconds
+    util = limit_utilization(a, p)
+    p[158] = (util[:, :5] > 1).sum(axis=1)
+    p[159] = (util[:, 5:] > 1).sum(axis=1)
+
+    # Revenue
+    p[46] = p[6] * a["C6"]
+    p[47] = p[7] * a["C7"]
+    p[48] = p[8] * a["C8"]
+    p[49] = xround(p[10] * a["C23"]) * a["C12"]
+    p[50] = xround(p[10] * a["C24"]) * a["C13"]
+    p[51] = xround(p[9] * a["C25"]) * a["C14"]
+    p[52] = p[46] + p[47] + p[48] + p[49] + p[50] + p[51]
+
+    # COGS
+    p[55] = p[6] * a["D6"]
+    p[56] = p[7] * a["D7"]
+    p[57] = p[8] * a["D8"]
+    p[58] = (xround(p[10] * a["C23"]) * a["D12"] + xround(p[10] * a["C24"]) * a["D13"]
+             + xround(p[9] * a["C25"]) * a["D14"])
+    p[59] = p[55] + p[56] + p[57] + p[58]
+    p[60] = p[52] - p[59]
+    p[61] = _safe_div(p[60], p[52])
+
+    # Operating expenses
+    p[64] = p[43]
+    p[65] = _grow(a["C85"], a["D85"], months, xround)
+    p[66] = p[9] * a["C86"]
+    p[67] = p[52] * a["C87"]
+    p[68] = _grow(a["C88"], a["D88"], months, xround)
+    p[69] = _grow(a["C89"], a["D89"], months, xround)
+    p[70] = p[64] + p[65] + p[66] + p[67] + p[68] + p[69]
+
+    # P&L
+    p[73] = p[60] - p[70]
+    p[74] = _safe_div(p[73], p[52])
+    p[75] = np.where(p[73] > 0, p[73] * a["C92"], 0)
+    p[76] = p[73] - p[75]
+    p[77] = np.cumsum(p[76], axis=-1)
+
+    # Key metrics
+    p[80] = _safe_div(p[65], p[9])
+    p[81] = _safe_div(p[52], p[9])
+    p[82] = _safe_div(p[59] + p[70], p[9])
+    p[83] = _safe_div(p[43], p[11])
+    p[84] = p[15] * 2
+
+    # Returns & replacements
+    p[89] = xround(lag_convolve(p[9], return_lag_kernel(a, "C")) * a["C96"] * a["C97"])
+    p[90] = xround(lag_convolve(p[9], return_lag_kernel(a, "D")) * a["C96"] * (1 - a["C97"]))
+    p[88] = p[89] + p[90]
+    p[91] = xround(p[9] * a["C101"])
+    avg_cogs = _safe_div(p[59], p[9])
+    p[94] = p[88] * _safe_div(p[52], p[9])
+    p[95] = p[88] * a["C99"]
+    p[96] = p[88] * a["C100"]
+    p[97] = p[90] * avg_cogs
+    p[98] = -p[89] * avg_cogs * a["C98"]
+    p[99] = p[91] * avg_cogs * a["C103"]
+    p[100] = p[91] * a["C102"]
+    p[101] = p[94] + p[95] + p[96] + p[97] + p[98] + p[99] + p[100]
+
+    # Adjusted P&L
+    p[104] = p[52] - p[94]
+    p[105] = p[59] + p[97] + p[98] + p[99]
+    p[106] = p[95] + p[96] + p[100]
+    p[107] = p[104] - p[105] - p[106]
+    p[108] = _safe_div(p[107], p[104])
+    p[109] = p[107] - p[70]
+    p[110] = _safe_div(p[109], p[104])
+    p[111] = p[109] - np.where(p[109] > 0, p[109] * a["C92"], 0)
+    net_adds = p[9] * a["C34"] - p[90]
+    net_adds[..., 0] = p[11][..., 0] - p[90][..., 0]
+    p[112] = np.cumsum(net_adds, axis=-1)
+    p[113] = _safe_div(p[101], p[52])
+
+    # Upload ingestion (row 116 computed with the costs — transcoding runs per upload)
+    p[117] = p[116] / 30 * a["C113"]
+    p[118] = p[117] / 3600 * a["C117"]
+    p[119] = p[117] * a["C116"] * 8 / 3600
+    return p
+
+
+PLAN_NAMES = ("Consumption", "Premium", "Flex Consumption")
+
+
+def functions_plan_costs(a, invocations):
+    """
+    Monthly cost and cold-start probability of `invocations` on each Functions
+    hosting plan (Assumptions rows 191-204). Cold start = app idle longer than
+    the scale-to-zero timeout before a call: exp(-calls/min x timeout).
+    Premium keeps pre-warmed instances, Flex only cold-starts with no always-ready;
+    Flex GB-s are shared by calls running concurrently on one instance.
+    """
+    inv = np.asarray(invocations, dtype=float)
+    per_min = inv / 43200
+    consumption = (tiered_cost("fn_executions", inv, a)
+                   + tiered_cost("fn_gb_seconds", inv * (a["C71"] / 1000) * (a["C72"] / 1024), a))
+    peak_concurrency = inv / 2592000 * a["C196"] * a["C71"] / 1000
+    instances = np.maximum(a["C194"], np.ceil(peak_concurrency / a["C195"]))
+    sharing = np.minimum(a["C195"], np.maximum(1, inv / 2592000 * a["C71"] / 1000))
+    flex = (tiered_cost("flex_executions", inv, a)
+            + tiered_cost("flex_gb_seconds", inv * (a["C71"] / 1000) * (a["C199"] / 1024) / sharing, a)
+            + a["C202"] * a["C199"] / 1024 * 2592000 * a["C203"])
+    cold = np.exp(-per_min * a["C191"])
+    return {
+        "consumption": consumption,
+        "premium_instances": instances,
+        "premium": instances * a["C193"],
+        "flex": flex,
+        "cold_consumption": cold,
+        "cold_flex": np.where(a["C202"] > 0, 0, cold),
+    }
+
+
+def plan_crossover(a, p):
+    """First projection month (1-based) each plan is cheaper than Consumption, 0 if never. (S, 3)."""
+    costs = np.stack([p[140], p[142], p[143]], axis=1)                     # (S, plan, month)
+    cheaper = costs < costs[:, :1]
+    first = np.where(cheaper.any(axis=-1), cheaper.argmax(axis=-1) + 1, 0)
+    first[:, 0] = 0
+    return first
+
+
+def media_cost_attribution(a, p, month=-1):
+    """
+    Split the month's cost lines across video / gallery / audio by each line's
+    driver share: storage by GB, writes by objects, R2 reads by GETs, fallback
+    by bandwidth, Functions + Table by views. Returns {line: (S, 3)} in $.
+    """
+    def share(offset):
+        x = np.stack([p[base + offset][:, month] for base in MEDIA_ROWS], axis=-1)
+        return x / np.maximum(x.sum(axis=-1, keepdims=True), 1e-12)
+
+    gb, objects, views, gets, bandwidth = (share(k) for k in range(5))
+    line = lambda rows: sum(p[r][:, month] for r in rows)[:, None]          # noqa: E731
+    return {
+        "Storage (R2 + Azure)": line((31, 36)) * gb,
+        "Upload writes (R2 + Azure)": line((32, 37)) * objects,
+        "R2 reads (Class B)": line((38,)) * gets,
+        "Azure fallback reads + egress": line((33, 34)) * bandwidth,
+        "Functions + Table": line((40, 41)) * views,
+    }
+
+
+# ── Recompression break-even ─────────────────────────────────────────────────
+TIER_LIFETIMES = (("10-Year", 6, 120), ("15-Year", 7, 180), ("Perpetual (30-yr est)", 8, 360))
+
+
+def recompression_per_charm(a):
+    """
+    Per-charm economics of recompressing each media type at marginal rates
+    (free tiers ignored): one-time compute, MB saved, monthly saving on R2 +
+    Azure storage and fallback retrieval/egress, break-even months, and
+    lifetime net per tier. Arrays (..., 3) over video / gallery / audio.
+    """
+    stack = lambda key: np.stack([np.asarray(a[key(col, r)], dtype=float) for col, r in MEDIA_COLUMNS], -1)  # noqa: E731
+    compute = stack(lambda col, r: f"{col}242")
+    saved_gb = stack(lambda col, r: f"C{r}") * (1 - stack(lambda col, r: f"{col}241")) / 1024
+    views = (np.asarray(a["C38"]) * 3 + np.asarray(a["C39"]) * 9) / 12
+    per_gb = (np.asarray(a["C55"]) + np.asarray(a["C47"])
+              + views * np.asarray(a["C152"]) * (np.asarray(a["C50"]) + np.asarray(a["C51"])))
+    saving = saved_gb * per_gb[..., None]
+    return {
+        "compute": compute,
+        "saved_mb": saved_gb * 1024,
+        "monthly_saving": saving,
+        "break_even": _safe_div(compute, saving),
+        "lifetime_net": {label: saving * months - compute for label, _, months in TIER_LIFETIMES},
+    }
+
+
+def recompression_cohorts(a, p):
+    """Lifetime net saving of each monthly cohort (S, months) at marginal rates, by its tier mix."""
+    per = recompression_per_charm(a)
+    mix = np.stack([np.asarray(a[f"D{r}"], dtype=float) for _, r in MEDIA_COLUMNS], -1)
+    saving = (mix * per["monthly_saving"]).sum(axis=-1)                      # (S, 1)
+    compute = (mix * per["compute"]).sum(axis=-1)
+    net = 0
+    for _, row, months in TIER_LIFETIMES:
+        claimed = p[row] * a["C34"]
+        net = net + claimed * (saving * months - compute * a["C118"])
+    return net
+
+
+# ── Deferred revenue waterfall ───────────────────────────────────────────────
+RECOGNITION_METHODS = ("Hybrid", "Straight-Line")
+
+
+def setup_cost_per_charm(a):
+    """Per-Charm Costs C24 — one-time claim-through-finalize hosting cost, no free tier."""
+    return ((a["C41"] / 1000000) * a["C69"] + a["C41"] * (a["C71"] / 1000) * (a["C72"] / 1024) * a["C70"]
+            + (a["C114"] * a["C118"] / 1000000) * a["C56"]
+            + (a["C115"] * a["C118"] / 10000) * a["C48"]
+            + (a["C186"] / 10000) * a["C64"]
+            + (a["C65"] / 1024 / 1024) * a["C63"]
+            + a["C244"] * a["C118"])
+
+
+def revenue_split(a):
+    """
+    Revenue Recognition rows 7-10 per tier, stacked on a trailing axis of 3:
+    sale price, upfront (recognized at sale) and deferred portion.
+    """
+    setup = setup_cost_per_charm(a)
+    price = np.stack([np.asarray(a[f"C{r}"], dtype=float) for _, r, _ in TIER_LIFETIMES], -1)
+    cogs = np.stack([np.asarray(a[f"D{r}"], dtype=float) for _, r, _ in TIER_LIFETIMES], -1)
+    upfront = cogs + np.asarray(a["C86"])[..., None] + price * np.asarray(a["C87"])[..., None] + np.asarray(setup)[..., None]
+    return {"price": price, "upfront": upfront, "deferred": price - upfront}
+
+
+def deferred_waterfall(a, p, method="Hybrid"):
+    """
+    Recognition schedule and deferred-balance runoff for every monthly sales
+    cohort through the end of its tier lifetime (months 1 .. cohorts + 360).
+
+    Each cohort's units net of returns (return rate C96) recognize
+    deferred / lifetime per month from the sale month on; the refunded
+    units' deferral is reversed when the return arrives, per the blended
+    pre/post-claim lag kernel (Assumptions rows 260-262). Recognition is built
+    as a difference array — +rate at each cohort's start, -rate at its end —
+    so one cumsum covers any number of cohorts. Returns (S, H) arrays.
+    """
+    split = revenue_split(a)
+    per_charm = split["deferred"] if method == "Hybrid" else split["price"]  # (S, 1, 3)
+    units = np.stack([p[r] for _, r, _ in TIER_LIFETIMES], -1)               # (S, M, 3)
+    returned = units * np.asarray(a["C96"])[..., None]
+    kept = units - returned
+    cohorts = units.shape[-2]
+    horizon = cohorts + max(months for _, _, months in TIER_LIFETIMES)
+
+    new = np.zeros(units.shape[:-2] + (horizon,))
+    reversals = np.zeros_like(new)
+    diff = np.zeros(units.shape[:-2] + (horizon + 1,))
+    new[..., :cohorts] = (units * per_charm).sum(axis=-1)
+    reversals[..., :cohorts] = (returned * per_charm).sum(axis=-1)
+    reversals = lag_convolve(reversals, returns_arrival_kernel(a))
+    for t, (_, _, months) in enumerate(TIER_LIFETIMES):
+        rate = kept[..., t] * per_charm[..., t] / months
+        diff[..., :cohorts] += rate
+        diff[..., months:months + cohorts] -= rate
+    recognition = np.cumsum(diff, axis=-1)[..., :horizon]
+    return {
+        "new_deferrals": new,
+        "reversals": reversals,
+        "recognition": recognition,
+        "balance": np.cumsum(new - reversals - recognition, axis=-1),
+    }
+
+
+# ── Hosting obligation NPV ───────────────────────────────────────────────────
+SERVICE_GROUPS = ("Storage", "Operations", "Bandwidth", "Compute", "Authentication")
+SERVICE_GROUP_ROWS = (249, 250, 251, 252, 253)
+
+
+def monthly_cost_by_group(a, p):
+    """
+    Per-Charm Costs rows 114-118 — today's monthly hosting cost per charm, stacked (..., 5).
+    CIAM is averaged over the month-24 fleet so the C125 free MAU band applies as in row 42.
+    """
+    gb = a["C243"] / 1024
+    views = xround((a["C38"] * 3 + a["C39"] * 9) / 12, 1)
+    calls = (1 - a["C175"]) + a["C40"]
+    reads = a["C43"] * (1 - a["C175"])
+    batch = np.where(a["C179"] == 1, np.maximum(1, a["C180"]), 1)
+    writes = xround(a["C40"] * (1 + 1 / batch) + 0.1 / batch, 2)
+    fallback = views * a["C152"]
+    active = p[11][..., -1:]
+    groups = [
+        gb * a["C55"] + gb * a["C47"] + (a["C65"] / 1024 / 1024) * a["C63"],
+        (views * a["C232"] / 1000000) * a["C57"] + (fallback / 10000) * a["C49"]
+        + (views * reads / 10000) * a["C64"] + (views * writes / 10000) * a["C64"],
+        views * gb * a["C58"] + fallback * gb * a["C50"] + fallback * gb * a["C51"],
+        (views * calls / 1000000) * a["C69"] + views * calls * (a["C71"] / 1000) * (a["C72"] / 1024) * a["C70"],
+        _safe_div(tiered_cost("ciam_mau", active * a["C126"], a), active),
+    ]
+    return np.stack(np.broadcast_arrays(*groups), -1)
+
+
+def _pv_factor(decline, rate):
+    """Assumptions D249:D253 — monthly price-decline x discount factor."""
+    return ((1 - decline) / (1 + rate)) ** (1 / 12)
+
+
+def _annuity(q, n):
+    """Sum of q^k for k in 0..n-1 — (1-q^n)/(1-q), or n when q == 1."""
+    flat = np.isclose(q, 1)
+    return np.where(flat, n, (1 - q ** n) / np.where(flat, 0.5, 1 - q))
+
+
+def obligation_pv(a, p, decline=None, rate=None):
+    """
+    Present value, at each month end, of the hosting still owed to every
+    cohort sold so far (units net of returns). Each cohort c owes its tier
+    lifetime L minus the months already served, priced at month m's
+    (declined) rates: sum_c u_c * cost * s^(m-1) * (1 - q^(L-m+c)) / (1-q).
+    The q^c term factors out, so one cumsum per tier covers all cohorts.
+
+    `decline` (..., 5) and `rate` broadcast against the scenario axis —
+    pass Monte Carlo draws with leading axes. Returns (..., S, M).
+    """
+    if decline is None:
+        decline = np.stack([np.asarray(a[f"C{r}"], dtype=float) for r in SERVICE_GROUP_ROWS], -1)
+    if rate is None:
+        rate = np.asarray(a["C247"], dtype=float)[..., None]
+    cost = monthly_cost_by_group(a, p)[..., None, :]                         # (S, 1, 1, 5)
+    q = _pv_factor(decline, rate)[..., None, :]                              # (..., S, 1, 1, 5)
+    drift = (1 - decline)[..., None, :] ** (1 / 12)
+    units = np.stack([p[r] for _, r, _ in TIER_LIFETIMES], -1)               # (S, M, 3)
+    kept = units * (1 - np.asarray(a["C96"]))[..., None]
+    m = np.arange(1, units.shape[-2] + 1)[:, None, None]                     # (M, 1, 1)
+    life = np.array([months for _, _, months in TIER_LIFETIMES])[None, :, None]
+    flat = np.isclose(q, 1)
+    q_safe = np.where(flat, 0.5, q)
+    served = np.cumsum(kept[..., None] * q_safe ** m, axis=-3)               # sum_c u_c q^c
+    owed_months = np.cumsum(kept[..., None] * (life + m), axis=-3) - m * np.cumsum(kept[..., None], axis=-3)
+    pv = np.where(flat, owed_months,
+                  (np.cumsum(kept, axis=-2)[..., None] - q_safe ** (life - m) * served) / (1 - q_safe))
+    return (pv * cost * drift ** (m - 1)).sum(axis=(-2, -1))
+
+
+def lifetime_pv_by_group(a, p):
+    """Per-Charm Costs D114:F118 — PV of a full tier lifetime per charm, (S, 1, 5, 3)."""
+    decline = np.stack([np.asarray(a[f"C{r}"], dtype=float) for r in SERVICE_GROUP_ROWS], -1)
+    q = _pv_factor(decline, np.asarray(a["C247"], dtype=float)[..., None])[..., None]
+    life = np.array([months for _, _, months in TIER_LIFETIMES])
+    return monthly_cost_by_group(a, p)[..., None] * _annuity(q, life)
+
+
+def obligation_monte_carlo(a, p, draws=None, seed=0):
+    """
+    obligation_pv over random discount rates and per-group price declines
+    (normal around Assumptions C247 / C249:C253, std devs C254 / C255),
+    clipped to sane ranges. Returns (draws, S, M).
+    """
+    draws = int(np.max(a["C256"])) if draws is None else draws
+    rng = np.random.default_rng(seed)
+    base = np.stack([np.asarray(a[f"C{r}"], dtype=float) for r in SERVICE_GROUP_ROWS], -1)   # (S, 1, 5)
+    decline = base[None] + rng.standard_normal((draws, 1, 1, len(SERVICE_GROUPS))) * a["C254"][..., None]
+    rate = a["C247"][None] + rng.standard_normal((draws, 1, 1)) * a["C255"]
+    return obligation_pv(a, p, decline.clip(-0.10, 0.50), rate.clip(0, 0.30)[..., None])
+
+
+def obligation_coverage(a, p, balance, draws=None, seed=0):
+    """
+    Deferred `balance` (S, >=M) against the hosting still owed: flat
+    (today's price x full lifetime, Revenue Recognition row 61), PV, and
+    Monte Carlo P10 / P90 bands with the probability of under-coverage.
+    """
+    flat = sum(np.cumsum(p[row], axis=-1) * months for _, row, months in TIER_LIFETIMES)
+    flat = flat * monthly_cost_by_group(a, p).sum(axis=-1)
+    pv = obligation_pv(a, p)
+    sims = obligation_monte_carlo(a, p, draws, seed)
+    pool = balance[..., :pv.shape[-1]]
+    cover = pool / sims
+    return {
+        "flat": flat,
+        "pv": pv,
+        "pv_p10": np.percentile(sims, 10, axis=0),
+        "pv_p90": np.percentile(sims, 90, axis=0),
+        "pool": pool,
+        "coverage": _safe_div(pool, pv),
+        "coverage_p10": np.percentile(cover, 10, axis=0),
+        "shortfall_prob": (cover < 1).mean(axis=0),
+        "draws": sims.shape[0],
+    }
+
+
+# ── Scale limits & stress test ───────────────────────────────────────────────
+# (label, projection row, Assumptions limit cell); hard service limits first,
+# then free allowances (pricing steps).
+SCALE_LIMITS = [
+    ("Table hot partition (entities/s)", 152, "C209"),
+    ("Table account (txns/s)", 151, "C210"),
+    ("Functions scale-out (instances)", 153, "C212"),
+    ("R2 bucket writes (Class A ops/s)", 154, "C213"),
+    ("R2 bucket reads (Class B ops/s)", 155, "C214"),
+    ("CIAM free MAU band", 156, "C125"),
+    ("Functions free executions", 22, "C73"),
+    ("Functions free GB-seconds", 157, "C74"),
+    ("R2 free Class A ops", 23, "C122"),
+    ("R2 free Class B ops", 24, "C123"),
+    ("R2 free storage (GB)", 16, "C59"),
+]
+STRESS_MULTIPLIERS = (1, 10, 100, 1000)
+
+
+def limit_utilization(a, p):
+    """
+    Usage / limit for every SCALE_LIMITS entry: (S, limits, months); > 1 means
+    crossed. A zero limit is crossed (inf) as soon as there is any usage,
+    matching the sheet's usage > limit test in rows 158-159.
+    """
+    util = []
+    for _, row, cell in SCALE_LIMITS:
+        limit = np.broadcast_to(a[cell], p[row].shape)
+        util.append(np.where(limit > 0, _safe_div(p[row], limit), np.where(p[row] > 0, np.inf, 0.0)))
+    return np.stack(util, axis=1)
+
+
+def stress_inputs(a, multipliers=STRESS_MULTIPLIERS):
+    """Repeat (S, 1) inputs once per multiplier — rows ordered scenario-major — with C208 set."""
+    m = np.asarray(multipliers, dtype=float)
+    out = {k: np.repeat(np.atleast_2d(v), len(m), axis=0) for k, v in a.items()}
+    out["C208"] = out["C208"] * np.tile(m, len(out["C208"]) // len(m))[:, None]
+    return out
+
+
+def first_crossing(util):
+    """First month (1-based) each limit is crossed, 0 if never: (S, limits)."""
+    crossed = util > 1
+    return np.where(crossed.any(axis=-1), crossed.argmax(axis=-1) + 1, 0)
+
+
+def _safe_div(num, den):
+    """num / den where den > 0, else 0 — the sheet's IF(x>0, a/x, 0) pattern."""
+    den = np.asarray(den, dtype=float)
+    return np.where(den > 0, num / np.where(den > 0, den, 1), 0.0)
+
+
+# ── Per-charm service quantities ─────────────────────────────────────────────
+
+def service_quantities(a, p):
+    """Monthly fleet quantity per priced service, from projection rows."""
+    fallback_gb = p[26] * a["C243"] / 1024
+    return {
+        "blob_storage": p[17],
+        "blob_writes": p[25],
+        "blob_reads": p[26],
+        "blob_retrieval": fallback_gb,
+        "blob_egress": fallback_gb,
+        "r2_storage": p[16],
+        "r2_class_a": p[23],
+        "r2_class_b": p[24],
+        "table_storage": p[11] * a["C65"] / 1024 / 1024,
+        "table_txn": p[27],
+        "fn_executions": p[22],
+        "fn_gb_seconds": p[22] * (a["C71"] / 1000) * (a["C72"] / 1024),
+        "ciam_mau": p[11] * a["C126"],
+    }
+
+
+def service_quantity_formulas(col, sheet="'24-Month Projections'"):
+    """Excel twin of service_quantities for one Projections month column."""
+    p = lambda row: f"{sheet}!{col}{row}"  # noqa: E731
+    fallback_gb = f"{p(26)}*{ASM}!C243/1024"
+    return {
+        "blob_storage": p(17),
+        "blob_writes": p(25),
+        "blob_reads": p(26),
+        "blob_retrieval": fallback_gb,
+        "blob_egress": fallback_gb,
+        "r2_storage": p(16),
+        "r2_class_a": p(23),
+        "r2_class_b": p(24),
+        "table_storage": f"{p(11)}*{ASM}!C65/1024/1024",
+        "table_txn": p(27),
+        "fn_executions": p(22),
+        "fn_gb_seconds": f"{p(22)}*({ASM}!C71/1000)*({ASM}!C72/1024)",
+        "ciam_mau": f"{p(11)}*{ASM}!C126",
+    }
+
+
+MARGINAL_SERVICES = ("blob_storage", "blob_reads", "blob_retrieval", "blob_egress", "r2_storage",
+                     "r2_class_b", "table_storage", "table_txn", "fn_executions", "fn_gb_seconds", "ciam_mau")
+
+
+def marginal_cost_formula(col, sheet="'24-Month Projections'"):
+    """Excel expression for marginal_cost_per_charm in one Projections month column."""
+    q = service_quantity_formulas(col, sheet)
+    total = "+".join(f"({tiered_marginal_formula(s, q[s])})*{q[s]}" for s in MARGINAL_SERVICES)
+    active = f"{sheet}!{col}11"
+    return f"({total})/IF({active}>0,{active},1)"
+
+
+def marginal_cost_per_charm(a, p):
+    """
+    Cost of hosting one more active charm for a month at each month's scale,
+    with free allowances applied. Ongoing services only (storage, reads,
+    transactions, compute, MAU) — setup writes are one-time.
+    """
+    q = service_quantities(a, p)
+    active = np.where(p[11] > 0, p[11], 1)
+    total = np.zeros(p[11].shape)
+    for service in MARGINAL_SERVICES:
+        total = total + tiered_marginal(service, q[service], a) * q[service] / active
+    return total
+
+
+# ── Product portfolio ────────────────────────────────────────────────────────
+# Each product overrides the MemoryCharm cells that describe a product line
+# (tier prices/COGS/volumes, media mix, engagement, attach rates, marketing)
+# with cells from its own Assumptions block. Everything else — cloud pricing,
+# free tiers, fixed overhead — is shared.
+
+PRODUCTS = {
+    "MemoryCharm": {},
+    "Rug Charm": {
+        "C6": "C267", "D6": "D267", "C18": "E267", "D18": "F267",
+        "C7": "C268", "D7": "D268", "C19": "E268", "D19": "F268",
+        "C8": "C269", "D8": "D269", "C20": "E269", "D20": "F269",
+        "D29": "C271", "D30": "D271", "D31": "E271",
+        "C34": "C272", "C38": "C273", "C39": "C274",
+        "C23": "C275", "C24": "C276", "C25": "C277",
+        "C85": "C278", "D85": "D278", "C86": "C279",
+    },
+}
+PORTFOLIO_LINES = ("units", "charm_revenue", "upsell_revenue", "revenue", "cogs", "gross_profit",
+                   "infra_shared", "infra_standalone", "marketing", "fulfillment", "processing",
+                   "overhead", "ebitda", "active")
+
+
+def portfolio_inputs(a, products=PRODUCTS):
+    """
+    Stack products x scenarios into one (N*S, 1) batch so project() runs
+    once for the whole portfolio. `a` is scenario_inputs() output.
+    """
+    names = list(products)
+    x = {k: np.concatenate([np.asarray(a[products[n].get(k, k)], dtype=float) for n in names])
+         for k in a}
+    return names, derive(x)
+
+
+def portfolio(a, products=PRODUCTS):
+    """
+    Per-product P&L lines (N, S, M) and the consolidated portfolio (S, M).
+
+    Infrastructure is priced once on the combined load — free grants, volume
+    tiers and the CIAM MAU band see every product's usage — then allocated
+    back by each product's share of each service's quantity. Fixed platform
+    costs (CIAM/DNS/monitoring) follow active charms; support and misc
+    overhead (C88/C89) are counted once and follow units sold.
+    """
+    names, x = portfolio_inputs(a, products)
+    p = project(x)
+    n = len(names)
+    split = lambda v: np.reshape(v, (n, -1) + np.shape(v)[1:])  # noqa: E731
+    q = service_quantities(x, p)
+
+    infra = 0
+    for service, qty in q.items():
+        qty = split(qty)
+        total = qty.sum(axis=0)
+        infra = infra + tiered_cost(service, total, a) * _safe_div(qty, total)
+    active = split(p[11])
+    units = split(p[9])
+    fixed = a["C78"] + a["C80"] + a["C81"]
+    infra = infra + fixed * _safe_div(active, active.sum(axis=0)) + split(p[180])
+
+    overhead = split(p[68] + p[69])[0] * _safe_div(units, units.sum(axis=0))
+    lines = {
+        "units": units,
+        "charm_revenue": split(p[46] + p[47] + p[48]),
+        "upsell_revenue": split(p[49] + p[50] + p[51]),
+        "revenue": split(p[52]),
+        "cogs": split(p[59]),
+        "gross_profit": split(p[60]),
+        "infra_shared": infra,
+        "infra_standalone": split(p[43]),
+        "marketing": split(p[65]),
+        "fulfillment": split(p[66]),
+        "processing": split(p[67]),
+        "overhead": overhead,
+        "active": active,
+    }
+    lines["ebitda"] = (lines["gross_profit"] - infra - lines["marketing"] - lines["fulfillment"]
+                       - lines["processing"] - overhead)
+    total = {k: v.sum(axis=0) for k, v in lines.items()}
+    total["scale_savings"] = total["infra_standalone"] - total["infra_shared"]
+    total["tax"] = np.where(total["ebitda"] > 0, total["ebitda"] * a["C92"], 0)
+    total["net_income"] = total["ebitda"] - total["tax"]
+    return names, lines, total
+
+
+# ── Storage lifecycle tiering ────────────────────────────────────────────────
+
+AGE_BAND_ROWS = (130, 131, 132, 133, 134)
+TIER_ROWS = {"r2": 137, "r2_ia": 138, "cool": 139, "cold": 140, "archive": 141}
+AZURE_TIERS = ("cool", "cold", "archive")
+
+# (label, serving copy, backup copy or None) — first entry is today's placement
+PLACEMENTS = [
+    ("R2 + Azure Cool (today)", "r2", "cool"),
+    ("R2 + Azure Cold", "r2", "cold"),
+    ("R2 + Azure Archive", "r2", "archive"),
+    ("R2 IA + Azure Cold", "r2_ia", "cold"),
+    ("R2 IA + Azure Archive", "r2_ia", "archive"),
+    ("R2 only", "r2", None),
+    ("R2 IA only", "r2_ia", None),
+    ("Azure Cool only", "cool", None),
+    ("Azure Cold only", "cold", None),
+]
+
+
+def _tier_params(a, tiers):
+    """Stack tier columns C-H into (S, 1, O) arrays for a list of tier keys (None = no copy)."""
+    cols = {"storage": "C", "retrieval": "D", "read": "E", "write": "F", "min_days": "G", "first_byte": "H"}
+    out = {}
+    for name, col in cols.items():
+        vals = [a[f"{col}{TIER_ROWS[t]}"] if t else np.zeros_like(a["C55"]) for t in tiers]
+        out[name] = np.stack(vals, axis=-1)  # (S, 1, O)
+    out["egress"] = np.stack([a["C51"] if t in AZURE_TIERS else np.zeros_like(a["C51"]) for t in tiers], axis=-1)
+    out["present"] = np.array([t is not None for t in tiers], dtype=float)
+    return out
+
+
+def _tier_moves(role):
+    """(previous placement, placement) -> 1 where that copy needs a write to a new tier."""
+    return np.array([[float(pl[role] is not None and pl[role] != old[role]) for pl in PLACEMENTS]
+                     for old in PLACEMENTS])
+
+
+def lifecycle_costs(a, prev=None):
+    """
+    Per-charm monthly cost and added playback latency of every placement in
+    every age band, for every scenario: arrays shaped (S, bands, placements).
+    Early-deletion penalties are amortized over the band, re-upload churn
+    (C35) is charged in the first band, and a copy pays one write per object
+    only when its tier differs from the placement held in the previous band.
+    `prev` (S, bands) gives that placement's index; default is today's
+    placement in every band.
+    """
+    a = {k: np.atleast_2d(v) for k, v in a.items()}
+    start = np.stack([a[f"C{r}"] for r in AGE_BAND_ROWS], axis=-2)     # (S, B, 1)
+    end = np.stack([a[f"D{r}"] for r in AGE_BAND_ROWS], axis=-2)
+    views = np.stack([a[f"E{r}"] for r in AGE_BAND_ROWS], axis=-2)
+    months = np.maximum(end - start, 1)
+    first_band = (np.arange(len(AGE_BAND_ROWS)) == 0)[:, None]           # (B, 1)
+
+    size_gb = a["C243"][..., None] / 1024                                   # (S, 1, 1)
+    objects = (a["D29"] + a["D30"] * a["C110"] + a["D31"])[..., None]
+    prim = _tier_params(a, [pl[1] for pl in PLACEMENTS])
+    back = _tier_params(a, [pl[2] for pl in PLACEMENTS])
+    f = a["C152"][..., None]                                              # fallback share (S, 1, 1)
+
+    prev = np.zeros(len(AGE_BAND_ROWS), dtype=int) if prev is None else np.asarray(prev)
+
+    def copy_cost(t, read_share, moved):
+        storage = size_gb * t["storage"]
+        reads = views * read_share * (objects * t["read"] / 10000 + size_gb * (t["retrieval"] + t["egress"]))
+        penalty_months = np.maximum(0, t["min_days"] / 30 - months)
+        churn = np.where(first_band, a["C35"][..., None] * np.maximum(0, t["min_days"] - 14) / 30, 0)
+        early_delete = (penalty_months + churn) * storage / months
+        transition = objects * t["write"] / 10000 / months * moved
+        return storage + reads + early_delete + transition
+
+    has_backup = back["present"]
+    cost = (copy_cost(prim, 1 - f * has_backup, _tier_moves(1)[prev])
+            + copy_cost(back, f, _tier_moves(2)[prev]))
+
+    latency = (1 - f * has_backup) * prim["first_byte"] + f * has_backup * back["first_byte"]
+    latency = latency - latency[..., :1]
+    feasible = (latency <= a["C144"][..., None]) & ((has_backup > 0) | (a["C145"][..., None] < 1))
+    cost = np.broadcast_to(cost, np.broadcast(cost, views).shape)
+    latency = np.broadcast_to(latency, cost.shape)
+    return cost, latency, np.broadcast_to(feasible, cost.shape)
+
+
+def optimize_lifecycle(a):
+    """
+    Cheapest feasible placement per (scenario, age band), band by band so each
+    band's tier-move writes are charged against the previous band's pick, and
+    its saving vs keeping today's placement throughout.
+    """
+    today = lifecycle_costs(a)[0][..., 0]
+    best = np.zeros(today.shape, dtype=int)                                # (S, B)
+    for b in range(best.shape[-1]):
+        prev = np.concatenate([np.zeros_like(best[..., :1]), best[..., :-1]], axis=-1)
+        cost, latency, feasible = lifecycle_costs(a, prev)
+        best[..., b] = np.argmin(np.where(feasible, cost, np.inf)[..., b, :], axis=-1)
+    pick = lambda arr: np.take_along_axis(arr, best[..., None], axis=-1)[..., 0]
+    return {
+        "best": best,
+        "current_cost": today,
+        "best_cost": pick(cost),
+        "saving": today - pick(cost),
+        "added_latency": pick(latency),
+        "cost": cost,
+        "latency": latency,
+        "feasible": feasible,
+    }
+
+
+def _placement_copies(o):
+    """(tier, read-share role) for each copy of placement `o`: serving copy first, then backup."""
+    _, prim, back = PLACEMENTS[o]
+    return [(prim, "primary", 1), (back, "backup", 2)] if back else [(prim, "only", 1)]
+
+
+def placement_cost_formula(b, o, prev):
+    """
+    Excel twin of lifecycle_costs for age band `b` and placement `o`. `prev`
+    is the 1-based index of the previous band's placement — an int, or a
+    cell reference when the pick is itself a formula.
+    """
+    band = AGE_BAND_ROWS[b]
+    size_gb = f"{ASM}!C243/1024"
+    objects = f"({ASM}!D29+{ASM}!D30*{ASM}!C110+{ASM}!D31)"
+    months = f"MAX({ASM}!D{band}-{ASM}!C{band},1)"
+    share = {"primary": f"(1-{ASM}!C152)", "backup": f"{ASM}!C152", "only": "1"}
+    terms = []
+    for tier, role, copy in _placement_copies(o):
+        t = TIER_ROWS[tier]
+        storage = f"{size_gb}*{ASM}!C{t}"
+        egress = f"+{ASM}!C51" if tier in AZURE_TIERS else ""
+        churn = f"+{ASM}!C35*MAX(0,{ASM}!G{t}-14)/30" if b == 0 else ""
+        terms += [
+            storage,
+            f"{ASM}!E{band}*{share[role]}*({objects}*{ASM}!E{t}/10000+{size_gb}*({ASM}!D{t}{egress}))",
+            f"(MAX(0,{ASM}!G{t}/30-{months}){churn})*{storage}/{months}",
+        ]
+        moves = _tier_moves(copy)[:, o]
+        if isinstance(prev, str):
+            moved = f"CHOOSE({prev},{','.join(f'{m:g}' for m in moves)})"
+        else:
+            moved = "1" if moves[prev - 1] else None
+        if moved:
+            terms.append(f"{objects}*{ASM}!F{t}/10000/{months}*{moved}")
+    return "+".join(terms)
+
+
+def placement_latency_formula(o):
+    """Excel twin of lifecycle_costs' added latency of placement `o` vs today's."""
+    def first_byte(copies):
+        share = {"primary": f"(1-{ASM}!C152)", "backup": f"{ASM}!C152", "only": "1"}
+        return "+".join(f"{share[role]}*{ASM}!H{TIER_ROWS[tier]}" for tier, role, _ in copies)
+    return f"({first_byte(_placement_copies(o))})-({first_byte(_placement_copies(0))})"
+
+
+def placement_feasible_formula(o):
+    """Excel condition for lifecycle_costs' feasibility of placement `o`."""
+    fast = f"{placement_latency_formula(o)}<={ASM}!C144"
+    return fast if PLACEMENTS[o][2] else f"AND({fast},{ASM}!C145<1)"
+
+
+def band_months_within(a, lifetime_months):
+    """Months a charm with the given lifetime spends in each age band: (S, B)."""
+    a = {k: np.atleast_2d(v) for k, v in a.items()}
+    start = np.concatenate([a[f"C{r}"] for r in AGE_BAND_ROWS], axis=-1)
+    end = np.concatenate([a[f"D{r}"] for r in AGE_BAND_ROWS], axis=-1)
+    return np.clip(np.minimum(end, lifetime_months) - start, 0, None)
+
+
+def charms_by_age_band(a, p):
+    """Claimed charms in each age band at the end of the projection: (S, B)."""
+    a = {k: np.atleast_2d(v) for k, v in a.items()}
+    claims = p[9] * a["C34"]                                               # (S, M)
+    months = claims.shape[-1]
+    age = months - 1 - np.arange(months)                                   # cohort age at last month
+    start = np.concatenate([a[f"C{r}"] for r in AGE_BAND_ROWS], axis=-1)[..., None]
+    end = np.concatenate([a[f"D{r}"] for r in AGE_BAND_ROWS], axis=-1)[..., None]
+    in_band = (age >= start) & (age < end)                                 # (S, B, M)
+    return (in_band * claims[:, None, :]).sum(axis=-1)
+
+
+# ── Playback fallback latency & availability ─────────────────────────────────
+
+def fallback_paths(a, outage_minutes=None):
+    """
+    Share of views taking each playback path and that path's extra delay
+    before the Azure copy starts: (r2_share, [(share, detect_ms), ...]).
+    `outage_minutes` overrides C151 and may be an array (sweep axis).
+    """
+    outage = a["C151"] if outage_minutes is None else np.asarray(outage_minutes, dtype=float)
+    error_share = a["C149"] * (1 - a["C150"])
+    outage_share = outage / 43200
+    return 1 - error_share - outage_share, [(error_share, a["C157"]), (outage_share, a["C158"])]
+
+
+def playback_latency(a, outage_minutes=None, quantiles=(0.5, 0.95, 0.99)):
+    """
+    Time-to-first-frame of the R2 / Azure-fallback mixture. Each path is
+    lognormal (median + P95 inputs); fallback paths add their detection delay.
+    Quantiles are read off the mixture CDF on a log-spaced grid, vectorized
+    over any leading axes of `outage_minutes`.
+    """
+    r2_share, fallbacks = fallback_paths(a, outage_minutes)
+    params = [a[k] for k in ("C153", "C154", "C155", "C156")]
+    shape = np.broadcast(r2_share, *params, *(sh for sh, _ in fallbacks)).shape
+    col = lambda v: np.broadcast_to(v, shape)[..., None]                    # noqa: E731
+    grid = np.logspace(0, 6, 6001)                                         # 1 ms .. 1000 s
+    mu_r2, sd_r2 = np.log(col(a["C153"])), _lognormal_sigma(col(a["C153"]), col(a["C154"]))
+    mu_az, sd_az = np.log(col(a["C155"])), _lognormal_sigma(col(a["C155"]), col(a["C156"]))
+
+    cdf = col(r2_share) * _norm_cdf((np.log(grid) - mu_r2) / sd_r2)
+    for share, detect in fallbacks:
+        t = np.log(np.maximum(grid - col(detect), 1e-9))
+        cdf = cdf + col(share) * np.where(grid > col(detect), _norm_cdf((t - mu_az) / sd_az), 0)
+
+    flat = cdf.reshape(-1, grid.size)
+    mean = (r2_share * _lognormal_mean(a["C153"], a["C154"])
+            + sum(sh * (_lognormal_mean(a["C155"], a["C156"]) + d) for sh, d in fallbacks))
+    out = {"mean": np.broadcast_to(mean, shape)}
+    for q in quantiles:
+        out[q] = np.array([np.interp(q, row, grid) for row in flat]).reshape(shape)
+    return out
+
+
+MIRROR_OPTIONS = [
+    # (label, Azure tier key or None) — tier prices from Assumptions rows 139-141
+    ("No backup mirror", None),
+    ("Azure Cool mirror (today)", "cool"),
+    ("Azure Cold mirror", "cold"),
+    ("Azure Archive mirror", "archive"),
+]
+
+
+def mirror_cost_availability(a, p, outage_minutes):
+    """
+    Monthly cost of the backup mirror and resulting playback availability for
+    each mirror option at every outage level, using the last projected month.
+    Returns cost, availability and failed views, each (S, outage levels, options).
+    Archive can't serve playback (hours to rehydrate) so it only buys durability.
+    """
+    a = {k: np.atleast_2d(v) for k, v in a.items()}
+    outage = np.asarray(outage_minutes, dtype=float)[None, :, None]        # (1, K, 1)
+    fallback = a["C149"][..., None] * (1 - a["C150"][..., None]) + outage / 43200
+
+    gb = p[17][:, -1][:, None, None]
+    writes = p[25][:, -1][:, None, None]
+    views = p[20][:, -1][:, None, None]
+    gb_per_view = a["C243"][..., None] / 1024
+    egress_band = {k: a[k][..., None] for k in ("C51", "C124")}             # (S, 1, 1)
+
+    costs, avail = [], []
+    for _, tier in MIRROR_OPTIONS:
+        if tier is None:
+            costs.append(np.zeros(np.broadcast(fallback, gb).shape))
+            avail.append(np.broadcast_to(1 - fallback, np.broadcast(fallback, gb).shape))
+            continue
+        r = TIER_ROWS[tier]
+        st, ret, rd, wr = (a[f"{col}{r}"][..., None] for col in "CDEF")
+        reads = views * fallback * (tier != "archive")
+        # Egress gets the C124 free band, as in Projections row 34
+        costs.append(gb * st + writes * wr / 10000
+                     + reads * (rd / 10000 + gb_per_view * ret)
+                     + tiered_cost("blob_egress", reads * gb_per_view, egress_band))
+        serves = 0.0 if tier == "archive" else a["C159"][..., None]
+        avail.append(np.broadcast_to(1 - fallback * (1 - serves), costs[-1].shape))
+    cost = np.concatenate(costs, axis=-1)
+    availability = np.concatenate(avail, axis=-1)
+    return cost, availability, views * (1 - availability)
@@ -4,11 +4,35 @@ Each slide includes a breadcrumb "You Are Here" progress diagram,
 an image placeholder, and a plain-language description.
 """
 
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import time
+import warnings
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from functools import lru_cache, partial
+
+import numpy as np
+import openpyxl
+from lxml import etree
+from PIL import Image, ImageFont, ImageOps
 from pptx import Presentation
+from pptx.chart.data import CategoryChartData
+from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION, XL_MARKER_STYLE
 from pptx.util import Inches, Pt, Emu
 from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.enum.shapes import MSO_SHAPE
+from pptx.oxml.ns import qn
+from pptx.oxml.shapes.autoshape import CT_Shape
+from pptx.shapes.autoshape import AutoShapeType
+
+from financial_engine import ASM, MONTHS, SCENARIOS, project, read_assumptions, scenario_inputs
 
 # ── Palette ──────────────────────────────────────────────────────────────
 BG_COLOR       = RGBColor(0x1A, 0x1A, 0x2E)   # deep indigo background
@@ -24,97 +48,74 @@ PLACEHOLDER_BG = RGBColor(0x22, 0x22, 0x3A)
 WHITE          = RGBColor(0xFF, 0xFF, 0xFF)
 BLACK          = RGBColor(0x00, 0x00, 0x00)
 
+# Theme defaults baked into deck_template.pptx; runs only restate what differs
+THEME_FONT = "Segoe UI"
+THEME_TEXT = TEXT_LIGHT
+
 # ── Slide dimensions (widescreen 16:9) ──────────────────────────────────
 SLIDE_W = Inches(13.333)
 SLIDE_H = Inches(7.5)
 
-# ── Step definitions ─────────────────────────────────────────────────────
-# We show the FULL possible flow (new user + glyph lock = 6 steps).
-# For the "open charm" variant we'll add a note on the protection slide.
-
-STEPS = [
-    {
-        "id": "register",
-        "short": "Register",
-        "title": "Step 1 \u2014 Register as a Keeper",
-        "description": (
-            "Before you can claim a charm, we need to know who you are.\n\n"
-            "On this screen you'll fill in your name, address, email, and "
-            "phone number. Your email is pre-filled from your sign-in.\n\n"
-            "You'll also need to accept the Terms of Passage before continuing.\n\n"
-            "If you've already registered in a previous session, this step "
-            "is skipped automatically."
-        ),
-    },
-    {
-        "id": "memory_type",
-        "short": "Memory Type",
-        "title": "Step 2 \u2014 Choose Your Memory Type",
-        "description": (
-            "Every charm holds one memory. Here you pick what kind:\n\n"
-            "\u2022  Video \u2013 a moving picture, captured in time\n"
-            "\u2022  Image \u2013 a still photograph (you can add more than one)\n"
-            "\u2022  Audio \u2013 a voice recording or melody\n\n"
-            "Tap the one that matches the file you'd like to upload, "
-            "then press Continue."
-        ),
-    },
-    {
-        "id": "upload",
-        "short": "Upload",
-        "title": "Step 3 \u2014 Upload Your Memory",
-        "description": (
-            "Now you'll select the actual file from your device.\n\n"
-            "The screen shows a file picker \u2014 tap it, find your video, "
-            "photo(s), or audio file, and select it. You'll see the file "
-            "name and size appear on screen.\n\n"
-            "Files can be up to 150 MB. Once you've chosen your file, "
-            "press Continue."
-        ),
-    },
-    {
-        "id": "protection",
-        "short": "Protection",
-        "title": "Step 4 \u2014 Choose How to Protect Your Charm",
-        "description": (
-            "You decide who can see this memory:\n\n"
-            "\u2022  Open \u2013 anyone who scans the charm can view it immediately.\n"
-            "\u2022  Glyph Lock \u2013 the viewer must pick the correct secret "
-            "symbol before the memory is revealed.\n\n"
-            "If you choose Open, the charm is sealed right away and you'll "
-            "jump to the final confirmation.\n\n"
-            "If you choose Glyph Lock, you'll pick your secret symbol "
-            "on the next screen."
-        ),
-    },
-    {
-        "id": "glyph",
-        "short": "Secret Glyph",
-        "title": "Step 5 \u2014 Pick Your Secret Glyph",
-        "description": (
-            "This screen shows a grid of 18 symbols \u2014 stars, hearts, "
-            "moons, butterflies, and more.\n\n"
-            "Tap the one you want as your charm's secret key. Anyone who "
-            "later scans the charm will be shown 9 random symbols and "
-            "must pick the right one to unlock the memory.\n\n"
-            "They get 3 attempts. Choose something meaningful to you "
-            "that the right person will recognise.\n\n"
-            "This step only appears if you chose Glyph Lock."
-        ),
-    },
-    {
-        "id": "done",
-        "short": "Sealed!",
-        "title": "Step 6 \u2014 Your Charm Is Sealed",
-        "description": (
-            "You're done! The memory has been securely bound to your charm.\n\n"
-            "This screen shows a preview of what you uploaded \u2014 you can "
-            "play a video or audio clip, or scroll through your photos.\n\n"
-            "Press \"View Charm\" to see exactly what someone will "
-            "experience when they scan the physical charm."
-        ),
-    },
-]
+# ── Flow spec ────────────────────────────────────────────────────────────
+# Steps and the paths through them live in claim_flow.json. The default deck
+# shows the FULL possible flow (new user + glyph lock = every step); each path
+# can also be built as its own deck whose breadcrumb shows only its steps.
+
+FLOW_SPEC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "claim_flow.json")
+OUTPUT_DIR = r"c:\Users\appli\source\repos\MemoryCharm"
+
+
+def load_flow_spec(path=FLOW_SPEC_PATH):
+    """
+    Read {"steps": [...], "paths": [{"id", "name", "steps": [step ids]}]}
+    from JSON, or YAML when the file ends in .yaml/.yml (needs PyYAML).
+    """
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            import yaml
+            spec = yaml.safe_load(f)
+        else:
+            spec = json.load(f)
+    known = {step["id"] for step in spec["steps"]}
+    for flow in spec["paths"]:
+        unknown = [sid for sid in flow["steps"] if sid not in known]
+        if unknown:
+            raise ValueError(f"Path {flow['id']!r} references unknown steps: {', '.join(unknown)}")
+    return spec
+
+
+def path_steps(spec, path_id=None):
+    """Step dicts along one path (every step when path_id is None), titled with their number on it."""
+    by_id = {step["id"]: step for step in spec["steps"]}
+    if path_id is None:
+        ids = list(by_id)
+    else:
+        ids = next(flow["steps"] for flow in spec["paths"] if flow["id"] == path_id)
+    return [dict(by_id[sid], title=f"Step {n} \u2014 {by_id[sid]['title']}") for n, sid in enumerate(ids, 1)]
+
+
+def path_summary(spec, flow):
+    """One overview line: labels joined by arrows plus the full-flow step numbers it covers."""
+    order = [step["id"] for step in spec["steps"]]
+    short = {step["id"]: step["short"] for step in spec["steps"]}
+    numbers = [order.index(sid) + 1 for sid in flow["steps"]]
+    if numbers == list(range(1, len(order) + 1)):
+        covered = f"all {len(order)} steps"
+    else:
+        runs = []
+        for n in numbers:
+            if runs and n == runs[-1][1] + 1:
+                runs[-1][1] = n
+            else:
+                runs.append([n, n])
+        covered = "steps " + ", then ".join(
+            str(lo) if lo == hi else f"{lo}\u2013{hi}" for lo, hi in runs)
+    route = " \u2192 ".join(short[sid] for sid in flow["steps"])
+    return f"\u2022  {flow['name']}:  {route}   ({covered})"
+
+
+FLOW_SPEC = load_flow_spec()
+STEPS = path_steps(FLOW_SPEC)
 
 # ── Helpers ───────────────────────────────────────────────────────────────
 
@@ -145,8 +146,8 @@ def add_rounded_rect(slide, left, top, width, height, fill_color, line_color=Non
 
 def add_textbox(slide, left, top, width, height, text, font_size=14,
                 color=TEXT_LIGHT, bold=False, alignment=PP_ALIGN.LEFT,
-                font_name="Segoe UI"):
-    """Add a text box with a single run of styled text."""
+                font_name=THEME_FONT):
+    """Add a text box with a single run of styled text; theme colour and font are inherited."""
     txBox = slide.shapes.add_textbox(left, top, width, height)
     tf = txBox.text_frame
     tf.word_wrap = True
@@ -155,143 +156,381 @@ def add_textbox(slide, left, top, width, height, text, font_size=14,
     run = p.add_run()
     run.text = text
     run.font.size = Pt(font_size)
-    run.font.color.rgb = color
-    run.font.bold = bold
-    run.font.name = font_name
+    if color != THEME_TEXT:
+        run.font.color.rgb = color
+    if bold:
+        run.font.bold = True
+    if font_name != THEME_FONT:
+        run.font.name = font_name
     return txBox
 
 
-def draw_breadcrumb(slide, steps, active_index, top_y):
+# ── Template ─────────────────────────────────────────────────────────────
+# deck_template.pptx is python-pptx's default template cut down to one blank
+# layout, with the palette as a dark theme (bg1 = BG_COLOR, tx1 = TEXT_LIGHT,
+# accent1 = ACCENT_GOLD) and Segoe UI as the theme fonts. Slides inherit the
+# master background and runs inherit colour and font, so neither is written
+# per slide or per run. Regenerate with `--make-template`.
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "deck_template.pptx")
+THEME_COLORS = {
+    "dk1": BG_COLOR, "lt1": TEXT_LIGHT, "dk2": PLACEHOLDER_BG, "lt2": TEXT_DIM,
+    "accent1": ACCENT_GOLD, "accent2": STEP_DONE_BG, "accent3": STEP_INACTIVE,
+    "accent4": CONNECTOR_DIM, "accent5": TEXT_DIM, "accent6": WHITE,
+}
+DARK_COLOR_MAP = {"bg1": "dk1", "tx1": "lt1", "bg2": "dk2", "tx2": "lt2"}
+REL_THUMBNAIL = "http://schemas.openxmlformats.org/package/2006/relationships/metadata/thumbnail"
+REL_PRINTER_SETTINGS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/printerSettings"
+REL_THEME = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/theme"
+
+
+def make_template(path=TEMPLATE_PATH):
+    """Write the minimal deck template described above."""
+    prs = Presentation()
+    prs.slide_width, prs.slide_height = SLIDE_W, SLIDE_H
+    blank = prs.slide_layouts[6]
+    for layout in list(prs.slide_layouts):
+        if layout is not blank:
+            prs.slide_layouts.remove(layout)
+
+    master = prs.slide_master
+    for shape in list(master.shapes):  # title/body/date/footer placeholders nobody uses
+        shape._element.getparent().remove(shape._element)
+    set_slide_bg(master, BG_COLOR)
+    master._element.find(qn("p:clrMap")).attrib.update(DARK_COLOR_MAP)
+
+    theme = master.part.part_related_by(REL_THEME)
+    root = etree.fromstring(theme.blob)
+    scheme = root.find(f".//{qn('a:clrScheme')}")
+    scheme.set("name", "MemoryCharm")
+    for slot, color in THEME_COLORS.items():
+        el = scheme.find(qn(f"a:{slot}"))
+        el.clear()
+        etree.SubElement(el, qn("a:srgbClr"), val=str(color))
+    for kind in ("a:majorFont", "a:minorFont"):
+        root.find(f".//{qn(kind)}/{qn('a:latin')}").set("typeface", THEME_FONT)
+    theme._blob = etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+    for rels, reltype in ((prs.part.package._rels, REL_THUMBNAIL), (prs.part.rels, REL_PRINTER_SETTINGS)):
+        for rid in [rid for rid, rel in rels.items() if rel.reltype == reltype]:
+            rels.pop(rid)
+    prs.save(path)
+
+
+# ── Bulk shape insertion ─────────────────────────────────────────────────
+
+class ShapeBatch:
     """
-    Draw a horizontal breadcrumb bar across the slide.
-    Completed steps are green, the active step is gold, future steps are dim.
-    Connectors link the circles.
+    Collects new autoshapes and text boxes for one slide and appends them in
+    one pass on exit. python-pptx rescans every shape id on the slide for
+    each add_shape/add_textbox, so ~35 shapes per slide cost O(n^2); the
+    batch reserves ids from a single scan and builds detached elements.
+    Quacks like a slide for the helpers above (`batch.shapes.add_shape`).
     """
-    n = len(steps)
-    circle_d = Inches(0.55)
-    gap = Inches(1.5)          # center-to-center spacing
-    total_w = (n - 1) * gap
-    start_x = int((SLIDE_W - total_w) / 2 - circle_d / 2)
 
-    connector_h = Pt(3)
-    connector_top = int(top_y + circle_d / 2 - connector_h / 2)
+    def __init__(self, slide):
+        self.slide = slide
+        self._tree = slide.shapes._spTree
+        self._factory = slide.shapes._shape_factory
+        self._next_id = self._tree.max_shape_id + 1
+        self._pending = []
 
-    for i in range(n):
-        cx = int(start_x + i * gap)
+    @property
+    def shapes(self):
+        return self
 
-        # ── connector line to previous circle ──
-        if i > 0:
-            line_left = int(start_x + (i - 1) * gap + circle_d)
-            line_w = int(gap - circle_d)
-            conn = slide.shapes.add_shape(
-                MSO_SHAPE.RECTANGLE, line_left, connector_top, line_w, connector_h
-            )
-            conn.fill.solid()
-            conn.line.fill.background()
-            if i <= active_index:
-                conn.fill.fore_color.rgb = CONNECTOR_DONE
+    def _reserve(self, sp):
+        self._pending.append(sp)
+        self._next_id += 1
+        return self._factory(sp)
+
+    def add_shape(self, autoshape_type_id, left, top, width, height):
+        shape_type = AutoShapeType(autoshape_type_id)
+        id_ = self._next_id
+        return self._reserve(CT_Shape.new_autoshape_sp(
+            id_, f"{shape_type.basename} {id_ - 1}", shape_type.prst, left, top, width, height))
+
+    def add_textbox(self, left, top, width, height):
+        id_ = self._next_id
+        return self._reserve(CT_Shape.new_textbox_sp(id_, f"TextBox {id_ - 1}", left, top, width, height))
+
+    def commit(self):
+        """Append every pending shape, ahead of the tree's extLst if it has one."""
+        ext = self._tree.find(qn("p:extLst"))
+        for sp in self._pending:
+            if ext is not None:
+                ext.addprevious(sp)
             else:
-                conn.fill.fore_color.rgb = CONNECTOR_DIM
+                self._tree.append(sp)
+        self._pending = []
 
-        # ── circle ──
-        if i < active_index:
-            bg = STEP_DONE_BG
-            fg = WHITE
-        elif i == active_index:
-            bg = STEP_ACTIVE_BG
-            fg = BLACK
-        else:
-            bg = STEP_INACTIVE
-            fg = TEXT_DIM
+    def __enter__(self):
+        return self
 
-        circle = slide.shapes.add_shape(
-            MSO_SHAPE.OVAL, cx, top_y, circle_d, circle_d
-        )
-        circle.fill.solid()
-        circle.fill.fore_color.rgb = bg
-        circle.line.fill.background()
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
 
-        # Number inside circle
-        tf = circle.text_frame
-        tf.word_wrap = False
-        p = tf.paragraphs[0]
-        p.alignment = PP_ALIGN.CENTER
-        run = p.add_run()
-        if i < active_index:
-            run.text = "\u2713"   # checkmark
+
+# ── Text fitting ─────────────────────────────────────────────────────────
+# Word-wraps text the way PowerPoint does (greedy, breaking at spaces) with
+# per-font glyph advance tables, so overflowing boxes are caught at build time
+# instead of in PowerPoint. Advances are kept in em units, so one cached table
+# serves every point size, and word widths are memoised on the table.
+# Segoe UI is looked up first, then Selawik (Microsoft's metric-compatible open
+# fallback for it), then a built-in approximation of Segoe UI's widths.
+
+FONT_DIRS = (
+    os.path.join(os.environ.get("WINDIR", r"C:\Windows"), "Fonts"),
+    os.path.expanduser("~/.fonts"),
+    os.path.expanduser("~/.local/share/fonts"),
+    "/usr/share/fonts",
+    "/Library/Fonts",
+)
+FONT_FILES = {
+    ("Segoe UI", False): ("segoeui.ttf", "selawk.ttf", "Selawik-Regular.ttf"),
+    ("Segoe UI", True):  ("segoeuib.ttf", "selawkb.ttf", "Selawik-Bold.ttf"),
+}
+TEXT_INSET_X = Inches(0.1)    # python-pptx text frame default insets
+TEXT_INSET_Y = Inches(0.05)
+APPROX_LINE_HEIGHT = 1.33     # Segoe UI (ascent + descent) / em
+
+# Approximate Segoe UI advances in em, used when no font file is installed
+_APPROX_ADVANCES = {
+    **dict.fromkeys(" ", 0.274),
+    **dict.fromkeys("iljI.,:;'|!", 0.25),
+    **dict.fromkeys("frt()[]{}\"", 0.35),
+    **dict.fromkeys("mw", 0.8),
+    **dict.fromkeys("MW\u2014", 0.9),
+    **dict.fromkeys("ABCDEFGHJKLNOPQRSTUVXYZ", 0.65),
+    **dict.fromkeys("0123456789abcdeghknopqsuvxyz", 0.56),
+}
+_APPROX_DEFAULT = 0.6
+_APPROX_BOLD = 1.05
+
+
+@lru_cache(maxsize=None)
+def _font_index():
+    """Lower-cased font file name -> path, for every font under FONT_DIRS."""
+    index = {}
+    for root_dir in FONT_DIRS:
+        for dirpath, _, names in os.walk(root_dir):
+            for name in names:
+                index.setdefault(name.lower(), os.path.join(dirpath, name))
+    return index
+
+
+class GlyphAdvances(dict):
+    """Advance widths in em for one font, filled per character on first use."""
+
+    def __init__(self, path=None, bold=False):
+        super().__init__()
+        self.path = path
+        self._font = ImageFont.truetype(path, 1000) if path else None
+        self._scale = _APPROX_BOLD if bold and not path else 1.0
+        if self._font:
+            ascent, descent = self._font.getmetrics()
+            self.line_height = (ascent + descent) / 1000
         else:
-            run.text = str(i + 1)
-        run.font.size = Pt(16)
-        run.font.color.rgb = fg
-        run.font.bold = True
-        run.font.name = "Segoe UI"
+            self.line_height = APPROX_LINE_HEIGHT
+        self._words = {}
 
-        # Label below
-        label_top = int(top_y + circle_d + Inches(0.08))
-        lbl = add_textbox(
-            slide, cx - Inches(0.4), label_top, Inches(1.35), Inches(0.35),
-            steps[i]["short"],
-            font_size=9,
-            color=ACCENT_GOLD if i == active_index else TEXT_DIM,
-            bold=(i == active_index),
-            alignment=PP_ALIGN.CENTER,
-        )
+    def __missing__(self, ch):
+        if self._font:
+            advance = self._font.getlength(ch) / 1000
+        else:
+            advance = _APPROX_ADVANCES.get(ch, _APPROX_DEFAULT) * self._scale
+        self[ch] = advance
+        return advance
 
-    # "You are here" callout above active circle
-    arrow_x = int(start_x + active_index * gap - Inches(0.25))
-    arrow_y = int(top_y - Inches(0.55))
-    add_textbox(
-        slide, arrow_x, arrow_y, Inches(1.1), Inches(0.35),
-        "\u25BC  You are here",
-        font_size=10, color=ACCENT_GOLD, bold=True, alignment=PP_ALIGN.CENTER,
-    )
+    def word(self, text):
+        """Width of a word in em, memoised."""
+        width = self._words.get(text)
+        if width is None:
+            width = self._words[text] = sum(map(self.__getitem__, text))
+        return width
+
+
+@lru_cache(maxsize=None)
+def glyph_advances(font_name="Segoe UI", bold=False):
+    """Cached advance table for the first installed file of a font, else the approximation."""
+    index = _font_index()
+    for name in FONT_FILES.get((font_name, bold), ()):
+        if name.lower() in index:
+            return GlyphAdvances(index[name.lower()], bold)
+    return GlyphAdvances(None, bold)
 
 
-def draw_breadcrumb_compact(slide, steps, active_index, top_y, region_left, region_w):
+def wrap_line_count(text, width_em, advances):
+    """Lines text wraps to in a box width_em wide; words wider than a line break mid-word."""
+    space = advances[" "]
+    lines = 0
+    for para in text.split("\n"):
+        lines += 1
+        x = None
+        for word in para.split(" "):
+            w = advances.word(word)
+            if x is not None and x + space + w <= width_em:
+                x += space + w
+                continue
+            if x is not None:
+                lines += 1
+            x = w
+            if w > width_em:
+                extra = int(w // width_em)
+                lines += extra
+                x = w - extra * width_em
+    return lines
+
+
+def wrap_text(text, width_em, advances):
+    """The lines text wraps to in a box width_em wide, by the same rules as wrap_line_count."""
+    space = advances[" "]
+    lines = []
+    for para in text.split("\n"):
+        line, x = [], None
+        for word in para.split(" "):
+            w = advances.word(word)
+            if x is not None and x + space + w <= width_em:
+                line.append(word)
+                x += space + w
+                continue
+            if x is not None:
+                lines.append(" ".join(line))
+            line, x = [word], w
+            if w > width_em:
+                chunk, x = "", 0.0
+                for ch in word:
+                    if chunk and x + advances[ch] > width_em:
+                        lines.append(chunk)
+                        chunk, x = "", 0.0
+                    chunk += ch
+                    x += advances[ch]
+                line = [chunk]
+        lines.append(" ".join(line))
+    return lines
+
+
+def fit_text_size(text, width, height, font_size, font_name="Segoe UI", bold=False, min_size=10, step=0.5):
     """
-    Draw a breadcrumb bar constrained within a specific horizontal region.
-    Used for the right-column layout on step slides.
+    Largest size from font_size down to min_size (in `step` pt) at which text
+    fits a width x height text box. Returns (size, fits).
     """
-    n = len(steps)
-    circle_d = Inches(0.45)
-    gap = Inches(1.25)          # center-to-center spacing
-    total_w = (n - 1) * gap
-    start_x = int(region_left + (region_w - total_w) / 2 - circle_d / 2)
+    advances = glyph_advances(font_name, bold)
+    avail_w = Emu(width - 2 * TEXT_INSET_X).pt
+    avail_h = Emu(height - 2 * TEXT_INSET_Y).pt
+    size = font_size
+    while True:
+        lines = wrap_line_count(text, avail_w / size, advances)
+        if lines * advances.line_height * size <= avail_h:
+            return size, True
+        if size - step < min_size:
+            return size, False
+        size -= step
+
 
-    connector_h = Pt(3)
-    connector_top = int(top_y + circle_d / 2 - connector_h / 2)
+def fit_textbox(shape, min_size=10):
+    """Shrink a single-run text box's font until its text fits; False if it still overflows."""
+    run = shape.text_frame.paragraphs[0].runs[0]
+    size, fits = fit_text_size(run.text, shape.width, shape.height, run.font.size.pt,
+                               run.font.name or THEME_FONT, bool(run.font.bold), min_size)
+    if size != run.font.size.pt:
+        run.font.size = Pt(size)
+    return fits
 
+
+# ── Breadcrumb layout engine ─────────────────────────────────────────────
+# Geometry depends only on (step count, region, style), so it is computed once
+# and cached; each slide then only applies the done/active/pending colouring.
+
+BREADCRUMB_STYLES = {
+    # Full-width bar with a "You are here" callout
+    "full": dict(
+        circle_d=Inches(0.55), gap=Inches(1.5), connector_h=Pt(3), number_pt=16,
+        label_dx=Inches(0.4), label_dy=Inches(0.08), label_w=Inches(1.35), label_h=Inches(0.35), label_pt=9,
+        callout=(Inches(0.25), Inches(0.55), Inches(1.1), Inches(0.35), 10),
+    ),
+    # Right-column bar on step slides
+    "compact": dict(
+        circle_d=Inches(0.45), gap=Inches(1.25), connector_h=Pt(3), number_pt=13,
+        label_dx=Inches(0.35), label_dy=Inches(0.05), label_w=Inches(1.15), label_h=Inches(0.3), label_pt=8,
+        callout=(Inches(0.2), Inches(0.45), Inches(0.9), Inches(0.3), 9),
+    ),
+    # "Journey at a Glance" map — every step highlighted, no callout
+    "overview": dict(
+        circle_d=Inches(0.7), gap=Inches(1.7), connector_h=Pt(4), number_pt=22,
+        label_dx=Inches(0.5), label_dy=Inches(0.15), label_w=Inches(1.7), label_h=Inches(0.3), label_pt=13,
+        callout=None,
+    ),
+}
+
+# state -> (circle fill, number colour, label colour, label bold, connector into this step)
+BREADCRUMB_STATES = {
+    "done":    (STEP_DONE_BG, WHITE, TEXT_DIM, False, CONNECTOR_DONE),
+    "active":  (STEP_ACTIVE_BG, BLACK, ACCENT_GOLD, True, CONNECTOR_DONE),
+    "pending": (STEP_INACTIVE, TEXT_DIM, TEXT_DIM, False, CONNECTOR_DIM),
+    "map":     (ACCENT_GOLD, BLACK, TEXT_LIGHT, True, ACCENT_GOLD),
+}
+
+
+@lru_cache(maxsize=None)
+def breadcrumb_geometry(n, top_y, region_left, region_w, style):
+    """
+    Positions for an n-step breadcrumb centred in a horizontal region.
+    Returns (circles, connectors, labels, callouts) — each a tuple of
+    (left, top, width, height) per step; connectors[0] is None.
+    """
+    st = BREADCRUMB_STYLES[style]
+    d, gap = st["circle_d"], st["gap"]
+    start_x = int(region_left + (region_w - (n - 1) * gap) / 2 - d / 2)
+    connector_top = int(top_y + d / 2 - st["connector_h"] / 2)
+    label_top = int(top_y + d + st["label_dy"])
+
+    circles, connectors, labels, callouts = [], [], [], []
     for i in range(n):
         cx = int(start_x + i * gap)
+        circles.append((cx, top_y, d, d))
+        connectors.append(None if i == 0 else
+                          (int(start_x + (i - 1) * gap + d), connector_top, int(gap - d), st["connector_h"]))
+        labels.append((cx - st["label_dx"], label_top, st["label_w"], st["label_h"]))
+        if st["callout"]:
+            dx, dy, w, h, _ = st["callout"]
+            callouts.append((int(cx - dx), int(top_y - dy), w, h))
+    return tuple(circles), tuple(connectors), tuple(labels), tuple(callouts)
+
+
+def step_state(i, active_index):
+    """done / active / pending relative to the active step; None = overview map."""
+    if active_index is None:
+        return "map"
+    return "done" if i < active_index else "active" if i == active_index else "pending"
+
+
+def draw_breadcrumb(slide, steps, active_index, top_y, region_left=0, region_w=SLIDE_W, style="full"):
+    """
+    Draw a horizontal breadcrumb bar. Completed steps are green, the active
+    step is gold, future steps are dim; active_index=None draws the
+    all-gold overview map. Connectors link the circles.
+    """
+    st = BREADCRUMB_STYLES[style]
+    circles, connectors, labels, callouts = breadcrumb_geometry(
+        len(steps), int(top_y), int(region_left), int(region_w), style)
+
+    for i, step in enumerate(steps):
+        state = step_state(i, active_index)
+        bg, fg, label_color, label_bold, conn_color = BREADCRUMB_STATES[state]
 
         # ── connector line to previous circle ──
-        if i > 0:
-            line_left = int(start_x + (i - 1) * gap + circle_d)
-            line_w = int(gap - circle_d)
-            conn = slide.shapes.add_shape(
-                MSO_SHAPE.RECTANGLE, line_left, connector_top, line_w, connector_h
-            )
+        if connectors[i]:
+            conn = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, *connectors[i])
+            conn.name = f"Crumb Connector {i + 1}"
             conn.fill.solid()
+            conn.fill.fore_color.rgb = conn_color
             conn.line.fill.background()
-            if i <= active_index:
-                conn.fill.fore_color.rgb = CONNECTOR_DONE
-            else:
-                conn.fill.fore_color.rgb = CONNECTOR_DIM
 
         # ── circle ──
-        if i < active_index:
-            bg = STEP_DONE_BG
-            fg = WHITE
-        elif i == active_index:
-            bg = STEP_ACTIVE_BG
-            fg = BLACK
-        else:
-            bg = STEP_INACTIVE
-            fg = TEXT_DIM
-
-        circle = slide.shapes.add_shape(
-            MSO_SHAPE.OVAL, cx, top_y, circle_d, circle_d
-        )
+        circle = slide.shapes.add_shape(MSO_SHAPE.OVAL, *circles[i])
+        circle.name = f"Crumb Step {i + 1}"
         circle.fill.solid()
         circle.fill.fore_color.rgb = bg
         circle.line.fill.background()
@@ -302,177 +541,72 @@ def draw_breadcrumb_compact(slide, steps, active_index, top_y, region_left, regi
         p = tf.paragraphs[0]
         p.alignment = PP_ALIGN.CENTER
         run = p.add_run()
-        if i < active_index:
-            run.text = "\u2713"
-        else:
-            run.text = str(i + 1)
-        run.font.size = Pt(13)
+        run.text = "\u2713" if state == "done" else str(i + 1)
+        run.font.size = Pt(st["number_pt"])
         run.font.color.rgb = fg
         run.font.bold = True
-        run.font.name = "Segoe UI"
 
         # Label below
-        label_top = int(top_y + circle_d + Inches(0.05))
-        add_textbox(
-            slide, cx - Inches(0.35), label_top, Inches(1.15), Inches(0.3),
-            steps[i]["short"],
-            font_size=8,
-            color=ACCENT_GOLD if i == active_index else TEXT_DIM,
-            bold=(i == active_index),
+        label = add_textbox(
+            slide, *labels[i], step["short"],
+            font_size=st["label_pt"], color=label_color, bold=label_bold,
             alignment=PP_ALIGN.CENTER,
         )
+        label.name = f"Crumb Label {i + 1}"
 
     # "You are here" callout above active circle
-    arrow_x = int(start_x + active_index * gap - Inches(0.2))
-    arrow_y = int(top_y - Inches(0.45))
-    add_textbox(
-        slide, arrow_x, arrow_y, Inches(0.9), Inches(0.3),
-        "\u25BC  You are here",
-        font_size=9, color=ACCENT_GOLD, bold=True, alignment=PP_ALIGN.CENTER,
-    )
-
-
-# ── Build presentation ───────────────────────────────────────────────────
-
-prs = Presentation()
-prs.slide_width = SLIDE_W
-prs.slide_height = SLIDE_H
-blank_layout = prs.slide_layouts[6]  # blank
-
-# ╔══════════════════════════════════════════════════════════════════════╗
-# ║  TITLE SLIDE                                                        ║
-# ╚══════════════════════════════════════════════════════════════════════╝
-slide = prs.slides.add_slide(blank_layout)
-set_slide_bg(slide, BG_COLOR)
-
-add_textbox(
-    slide, Inches(1), Inches(1.8), Inches(11.3), Inches(1),
-    "MemoryCharm", font_size=48, color=ACCENT_GOLD, bold=True,
-    alignment=PP_ALIGN.CENTER,
-)
-add_textbox(
-    slide, Inches(1), Inches(3.0), Inches(11.3), Inches(0.6),
-    "Claim Flow \u2014 UX Walkthrough", font_size=28, color=TEXT_LIGHT,
-    alignment=PP_ALIGN.CENTER,
-)
-add_textbox(
-    slide, Inches(1), Inches(4.2), Inches(11.3), Inches(1),
-    (
-        "This deck walks through every screen a user sees when they scan a charm\n"
-        "and bind a memory to it. Each slide shows where the user is in the\n"
-        "overall journey and describes what they do on that screen."
-    ),
-    font_size=14, color=TEXT_DIM, alignment=PP_ALIGN.CENTER,
-)
-
-# ╔══════════════════════════════════════════════════════════════════════╗
-# ║  OVERVIEW SLIDE                                                      ║
-# ╚══════════════════════════════════════════════════════════════════════╝
-slide = prs.slides.add_slide(blank_layout)
-set_slide_bg(slide, BG_COLOR)
-
-add_textbox(
-    slide, Inches(0.7), Inches(0.4), Inches(11.9), Inches(0.6),
-    "The Journey at a Glance", font_size=32, color=ACCENT_GOLD, bold=True,
-    alignment=PP_ALIGN.CENTER,
-)
-
-# Draw the breadcrumb with no active step (all neutral)
-# We'll draw it manually as a "map"
-overview_top = Inches(1.5)
-n = len(STEPS)
-circle_d = Inches(0.7)
-gap = Inches(1.7)
-total_w = (n - 1) * gap
-start_x = int((SLIDE_W - total_w) / 2 - circle_d / 2)
-
-for i in range(n):
-    cx = int(start_x + i * gap)
-    # connector
-    if i > 0:
-        line_left = int(start_x + (i - 1) * gap + circle_d)
-        line_w = int(gap - circle_d)
-        conn = slide.shapes.add_shape(
-            MSO_SHAPE.RECTANGLE, line_left,
-            int(overview_top + circle_d / 2 - Pt(2)),
-            line_w, Pt(4)
+    if callouts and active_index is not None:
+        callout = add_textbox(
+            slide, *callouts[active_index], "\u25BC  You are here",
+            font_size=st["callout"][4], color=ACCENT_GOLD, bold=True, alignment=PP_ALIGN.CENTER,
         )
-        conn.fill.solid()
-        conn.fill.fore_color.rgb = ACCENT_GOLD
-        conn.line.fill.background()
+        callout.name = "Crumb Callout"
 
-    circle = slide.shapes.add_shape(
-        MSO_SHAPE.OVAL, cx, overview_top, circle_d, circle_d
-    )
-    circle.fill.solid()
-    circle.fill.fore_color.rgb = ACCENT_GOLD
-    circle.line.fill.background()
-    tf = circle.text_frame
-    tf.word_wrap = False
-    p = tf.paragraphs[0]
-    p.alignment = PP_ALIGN.CENTER
-    run = p.add_run()
-    run.text = str(i + 1)
-    run.font.size = Pt(22)
-    run.font.color.rgb = BLACK
-    run.font.bold = True
-    run.font.name = "Segoe UI"
-
-    # label + mini description
-    label_top = int(overview_top + circle_d + Inches(0.15))
-    add_textbox(
-        slide, cx - Inches(0.5), label_top, Inches(1.7), Inches(0.3),
-        STEPS[i]["short"], font_size=13, color=TEXT_LIGHT, bold=True,
-        alignment=PP_ALIGN.CENTER,
-    )
 
-# Add two flow variant notes at the bottom
-add_textbox(
-    slide, Inches(1), Inches(3.6), Inches(11.3), Inches(1.2),
-    (
-        "Two possible paths through the flow:\n\n"
-        "\u2022  Open charm (no lock):  Register \u2192 Memory Type \u2192 Upload "
-        "\u2192 Protection \u2192 Sealed!   (steps 1\u20134, then 6)\n"
-        "\u2022  Glyph-locked charm:    Register \u2192 Memory Type \u2192 Upload "
-        "\u2192 Protection \u2192 Secret Glyph \u2192 Sealed!   (all 6 steps)\n\n"
-        "If the user has already registered, step 1 is skipped."
-    ),
-    font_size=14, color=TEXT_LIGHT, alignment=PP_ALIGN.LEFT,
-)
+def apply_breadcrumb_state(shapes, steps, active_index, top_y, region_left=0, region_w=SLIDE_W, style="full"):
+    """
+    Recolour a breadcrumb already on a slide (drawn by draw_breadcrumb) for a
+    new active step. `shapes` maps shape name -> shape. Only fills, run
+    text/colour and the callout position change; geometry comes from cache.
+    """
+    _, _, _, callouts = breadcrumb_geometry(len(steps), int(top_y), int(region_left), int(region_w), style)
+    for i in range(len(steps)):
+        bg, fg, label_color, label_bold, conn_color = BREADCRUMB_STATES[step_state(i, active_index)]
+        if i > 0:
+            shapes[f"Crumb Connector {i + 1}"].fill.fore_color.rgb = conn_color
+        circle = shapes[f"Crumb Step {i + 1}"]
+        circle.fill.fore_color.rgb = bg
+        number = circle.text_frame.paragraphs[0].runs[0]
+        number.text = "\u2713" if i < active_index else str(i + 1)
+        number.font.color.rgb = fg
+        label = shapes[f"Crumb Label {i + 1}"].text_frame.paragraphs[0].runs[0]
+        label.font.color.rgb = label_color
+        label.font.bold = label_bold
+    if callouts:
+        callout = shapes["Crumb Callout"]
+        callout.left, callout.top = callouts[active_index][:2]
 
-# Decorative divider
-div = slide.shapes.add_shape(
-    MSO_SHAPE.RECTANGLE, Inches(2), Inches(5.2), Inches(9.3), Pt(1)
-)
-div.fill.solid()
-div.fill.fore_color.rgb = ACCENT_GOLD
-div.line.fill.background()
-
-add_textbox(
-    slide, Inches(1), Inches(5.5), Inches(11.3), Inches(0.8),
-    (
-        "The following slides show each step in detail. "
-        "Add a screenshot to the placeholder on each slide for the full picture."
-    ),
-    font_size=12, color=TEXT_DIM, alignment=PP_ALIGN.CENTER,
-)
 
-# ╔══════════════════════════════════════════════════════════════════════╗
-# ║  STEP SLIDES                                                        ║
-# ╚══════════════════════════════════════════════════════════════════════╝
+# ── Step slides ──────────────────────────────────────────────────────────
+# Layout: LEFT 1/3 = screenshot, RIGHT 2/3 = breadcrumb + text
+STEP_MARGIN = Inches(0.5)
+STEP_COL_GAP = Inches(0.4)
+STEP_PH_W = Inches(3.9)
+STEP_RIGHT_LEFT = int(STEP_MARGIN + STEP_PH_W + STEP_COL_GAP)
+STEP_RIGHT_W = int(SLIDE_W - STEP_RIGHT_LEFT - STEP_MARGIN)
+STEP_BREADCRUMB_TOP = Inches(1.4)
+STEP_DESCRIPTION_MIN_PT = 10
 
-for idx, step in enumerate(STEPS):
-    slide = prs.slides.add_slide(blank_layout)
-    set_slide_bg(slide, BG_COLOR)
 
-    # ── Layout: LEFT 1/3 = screenshot, RIGHT 2/3 = breadcrumb + text ──
-    margin = Inches(0.5)
-    col_gap = Inches(0.4)
+def draw_step_slide(slide, steps, idx):
+    """Draw one step slide shape by shape: placeholder, title, breadcrumb, description panel."""
+    step = steps[idx]
+    margin = STEP_MARGIN
 
     # Left column: screenshot placeholder (full height, portrait proportion)
     ph_left = margin
     ph_top = margin
-    ph_w = Inches(3.9)
+    ph_w = STEP_PH_W
     ph_h = SLIDE_H - 2 * margin  # nearly full slide height
 
     ph_shape = add_rounded_rect(
@@ -481,34 +615,35 @@ for idx, step in enumerate(STEPS):
     )
 
     # "Insert screenshot here" label centred in placeholder
-    add_textbox(
+    hint = add_textbox(
         slide, ph_left, int(ph_top + ph_h / 2 - Inches(0.5)),
         ph_w, Inches(0.6),
         "\u2702  Insert screenshot here",
         font_size=16, color=TEXT_DIM, alignment=PP_ALIGN.CENTER,
     )
-    add_textbox(
+    hint.name = "Screenshot Hint"
+    hint = add_textbox(
         slide, ph_left, int(ph_top + ph_h / 2 + Inches(0.1)),
         ph_w, Inches(0.5),
         "(right-click \u2192 Change Picture)",
         font_size=11, color=TEXT_DIM, alignment=PP_ALIGN.CENTER,
     )
+    hint.name = "Screenshot Hint Detail"
 
     # Right column starts after the screenshot + gap
-    right_left = int(ph_left + ph_w + col_gap)
-    right_w = int(SLIDE_W - right_left - margin)
+    right_left, right_w = STEP_RIGHT_LEFT, STEP_RIGHT_W
 
     # ── Step title (top of right column) ──
     title_top = Inches(0.5)
-    add_textbox(
+    title = add_textbox(
         slide, right_left, title_top, right_w, Inches(0.55),
         step["title"],
         font_size=26, color=ACCENT_GOLD, bold=True, alignment=PP_ALIGN.LEFT,
     )
+    title.name = "Step Title"
 
     # ── Breadcrumb (below title) ──
-    breadcrumb_top = Inches(1.4)
-    draw_breadcrumb_compact(slide, STEPS, idx, breadcrumb_top, right_left, right_w)
+    draw_breadcrumb(slide, steps, idx, STEP_BREADCRUMB_TOP, right_left, right_w, style="compact")
 
     # ── Description panel (below breadcrumb, fills remaining height) ──
     desc_top = Inches(2.8)
@@ -528,35 +663,667 @@ for idx, step in enumerate(STEPS):
     )
 
     # Description body
-    add_textbox(
+    description = add_textbox(
         slide, int(right_left + Inches(0.3)), int(desc_top + Inches(0.7)),
         int(right_w - Inches(0.6)), int(desc_h - Inches(1.0)),
         step["description"],
         font_size=13, color=TEXT_LIGHT,
     )
+    description.name = "Step Description"
+
+
+# Prototype step slides, keyed by the flow's step labels. Each new step slide
+# deep-copies the prototype's shape XML and patches only text and colours,
+# instead of re-running ~35 python-pptx add_shape/add_textbox calls.
+_STEP_PROTOTYPES = {}
+
+
+def step_prototype(steps):
+    """Step-slide furniture drawn once on a scratch presentation."""
+    key = tuple(step["short"] for step in steps)
+    if key not in _STEP_PROTOTYPES:
+        proto = add_blank_slide(new_presentation())
+        with ShapeBatch(proto) as batch:
+            draw_step_slide(batch, steps, 0)
+        _STEP_PROTOTYPES[key] = proto
+    return _STEP_PROTOTYPES[key]
+
+
+def clone_slide(prs, prototype):
+    """Append a blank slide carrying deep copies of the prototype's background and shapes."""
+    slide = add_blank_slide(prs)
+    bg = prototype._element.cSld.bg
+    if bg is not None:
+        slide._element.cSld.insert(0, deepcopy(bg))
+    tree = slide.shapes._spTree
+    for el in prototype.shapes._spTree.iterchildren():
+        if el.tag not in (qn("p:nvGrpSpPr"), qn("p:grpSpPr")):
+            tree.append(deepcopy(el))
+    return slide
+
+
+def add_step_slide(prs, steps, idx, screenshot=None):
+    """
+    Clone the step prototype and patch in this step's title, description and
+    breadcrumb state; a prepared screenshot replaces the placeholder hint.
+    """
+    slide = clone_slide(prs, step_prototype(steps))
+    shapes = {shape.name: shape for shape in slide.shapes}
+    shapes["Step Title"].text_frame.paragraphs[0].runs[0].text = steps[idx]["title"]
+    shapes["Step Description"].text_frame.paragraphs[0].runs[0].text = steps[idx]["description"]
+    apply_breadcrumb_state(shapes, steps, idx, STEP_BREADCRUMB_TOP, STEP_RIGHT_LEFT, STEP_RIGHT_W, style="compact")
+    check_step_text(shapes, steps[idx])
+    if screenshot:
+        insert_screenshot(slide, shapes, *screenshot)
+    return slide
+
+
+def check_step_text(shapes, step):
+    """Shrink an overflowing description to fit its panel; warn when it can't, or when the title wraps."""
+    if not fit_textbox(shapes["Step Description"], min_size=STEP_DESCRIPTION_MIN_PT):
+        warnings.warn(f"Step {step['id']!r}: description overflows its panel even at {STEP_DESCRIPTION_MIN_PT}pt")
+    title = shapes["Step Title"]
+    run = title.text_frame.paragraphs[0].runs[0]
+    width_em = Emu(title.width - 2 * TEXT_INSET_X).pt / run.font.size.pt
+    if wrap_line_count(run.text, width_em, glyph_advances(run.font.name or THEME_FONT, bool(run.font.bold))) > 1:
+        warnings.warn(f"Step {step['id']!r}: title wraps onto the breadcrumb")
+
+
+# ── Screenshot ingestion ─────────────────────────────────────────────────
+# Screenshots are matched to steps by file name (<step id>.png, .jpg, ...) or
+# by a "screenshot" file name on the step in the flow spec, then downscaled in
+# a worker pool to the placeholder's pixel size at SCREENSHOT_DPI. Files are
+# keyed by content, and python-pptx stores image parts by SHA-1, so one image
+# shown on several slides is processed once and lands in the package once.
+
+SCREENSHOT_DPI = 150
+SCREENSHOT_PAD = Inches(0.08)        # keeps the placeholder's gold frame visible
+SCREENSHOT_EXTS = (".png", ".jpg", ".jpeg", ".webp")
+SCREENSHOT_JPEG_QUALITY = 85
+
+
+def screenshot_box():
+    """(left, top, width, height) inside the step-slide placeholder frame."""
+    return (int(STEP_MARGIN + SCREENSHOT_PAD), int(STEP_MARGIN + SCREENSHOT_PAD),
+            int(STEP_PH_W - 2 * SCREENSHOT_PAD), int(SLIDE_H - 2 * STEP_MARGIN - 2 * SCREENSHOT_PAD))
+
+
+def find_screenshots(folder, steps):
+    """{step id: file path} for the steps that have a screenshot in folder; warns on a missing named file."""
+    files = {}
+    for name in sorted(os.listdir(folder)):
+        stem, ext = os.path.splitext(name)
+        if ext.lower() in SCREENSHOT_EXTS:
+            files.setdefault(stem, os.path.join(folder, name))
+    found = {}
+    for step in steps:
+        if step.get("screenshot"):
+            path = os.path.join(folder, step["screenshot"])
+            if os.path.isfile(path):
+                found[step["id"]] = path
+            else:
+                warnings.warn(f"Step {step['id']!r}: screenshot {step['screenshot']!r} not found in {folder}; "
+                              "using the placeholder")
+        elif step["id"] in files:
+            found[step["id"]] = files[step["id"]]
+    return found
+
+
+def _prepare_screenshot(job):
+    """
+    Worker: fit one screenshot inside max_px (never upscaling) and recompress
+    it — JPEG sources stay JPEG, everything else becomes optimised PNG.
+    Returns (image bytes, frame width px, frame height px).
+    """
+    path, (max_w, max_h) = job
+    with Image.open(path) as src:
+        is_jpeg = src.format == "JPEG"
+        im = ImageOps.exif_transpose(src)
+        scale = min(max_w / im.width, max_h / im.height)
+        frame = (max(1, round(im.width * scale)), max(1, round(im.height * scale)))
+        if scale < 1:
+            im = im.resize(frame, Image.LANCZOS)
+        out = io.BytesIO()
+        if is_jpeg:
+            im.convert("RGB").save(out, "JPEG", quality=SCREENSHOT_JPEG_QUALITY, optimize=True)
+        else:
+            im.save(out, "PNG", optimize=True)
+    return out.getvalue(), frame[0], frame[1]
+
+
+def ingest_screenshots(folder, steps, workers=None):
+    """Prepare the screenshots for steps in parallel: {step id: (image bytes, frame w px, frame h px)}."""
+    files = find_screenshots(folder, steps)
+    _, _, box_w, box_h = screenshot_box()
+    max_px = (round(Emu(box_w).inches * SCREENSHOT_DPI), round(Emu(box_h).inches * SCREENSHOT_DPI))
+
+    digests, unique = {}, {}
+    for step_id, path in files.items():
+        with open(path, "rb") as f:
+            digests[step_id] = hashlib.sha1(f.read()).hexdigest()
+        unique.setdefault(digests[step_id], path)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        prepared = dict(zip(unique, pool.map(_prepare_screenshot, [(p, max_px) for p in unique.values()])))
+    return {step_id: prepared[digest] for step_id, digest in digests.items()}
+
+
+def insert_screenshot(slide, shapes, data, frame_w, frame_h):
+    """Centre a prepared screenshot in the placeholder and drop the "Insert screenshot" hint."""
+    left, top, box_w, box_h = screenshot_box()
+    w = int(Inches(frame_w / SCREENSHOT_DPI))
+    h = int(Inches(frame_h / SCREENSHOT_DPI))
+    pic = slide.shapes.add_picture(io.BytesIO(data), int(left + (box_w - w) / 2), int(top + (box_h - h) / 2), w, h)
+    pic.name = "Screenshot"
+    for name in ("Screenshot Hint", "Screenshot Hint Detail"):
+        el = shapes[name]._element
+        el.getparent().remove(el)
+    return pic
+
+
+# ── Financial outlook ────────────────────────────────────────────────────
+# Headline projection series from financial_engine (every scenario in one
+# vectorised pass over the workbook's inputs), drawn as native charts with
+# embedded data so they stay small and editable in PowerPoint.
+
+FINANCIAL_MODEL_PATH = os.path.join(OUTPUT_DIR, "MemoryCharm_Financial_Model.xlsx")
+SCENARIO_COLORS = (TEXT_DIM, ACCENT_GOLD, STEP_DONE_BG, TEXT_LIGHT)
+CHART_BOX = (Inches(0.7), Inches(1.6), Inches(11.9), Inches(5.4))
+
+
+def financial_series(model_path=FINANCIAL_MODEL_PATH, scenarios=SCENARIOS):
+    """Storage, infra cost per active charm and EBITDA by scenario and month, as plain lists."""
+    wb = openpyxl.load_workbook(model_path, read_only=True)
+    names, a = scenario_inputs(read_assumptions(wb[ASM]), scenarios)
+    wb.close()
+    p = project(a)
+    positive = p[73] > 0
+    return dict(
+        scenarios=names,
+        months=[f"M{m}" for m in range(1, MONTHS + 1)],
+        storage_gb=p[15].round(2).tolist(),
+        infra_per_charm=np.divide(p[43], p[11], out=np.zeros_like(p[43]), where=p[11] > 0).round(4).tolist(),
+        ebitda=p[73].round(2).tolist(),
+        months_to_ebitda=[int(row.argmax()) + 1 if row.any() else None for row in positive],
+    )
+
+
+def finance_charts(finance):
+    """Keyword arguments for add_chart_slide, one dict per chart slide."""
+    names, months = finance["scenarios"], finance["months"]
+    breakeven = "  \u00b7  ".join(
+        f"{name}: month {m}" if m else f"{name}: not within {MONTHS} months"
+        for name, m in zip(names, finance["months_to_ebitda"]))
+    return [
+        dict(title="Storage Growth", subtitle="Cumulative GB stored, by scenario",
+             categories=months, series=list(zip(names, finance["storage_gb"])), number_format="#,##0"),
+        dict(title="Infrastructure Cost per Active Charm",
+             subtitle="Monthly infrastructure spend \u00f7 active charms, by scenario",
+             categories=months, series=list(zip(names, finance["infra_per_charm"])), number_format="$#,##0.000"),
+        dict(title="Months to EBITDA > 0", subtitle=f"EBITDA-positive from  {breakeven}",
+             categories=months, series=list(zip(names, finance["ebitda"])), number_format="$#,##0"),
+    ]
+
+
+def style_chart(chart):
+    """Palette fonts, axes and one line colour per scenario on a dark slide."""
+    chart.font.size = Pt(11)
+    chart.font.color.rgb = TEXT_LIGHT
+    chart.has_legend = True
+    chart.legend.position = XL_LEGEND_POSITION.BOTTOM
+    chart.legend.include_in_layout = False
+    for axis in (chart.category_axis, chart.value_axis):
+        axis.format.line.color.rgb = CONNECTOR_DIM
+        axis.tick_labels.font.color.rgb = TEXT_DIM
+    chart.value_axis.major_gridlines.format.line.color.rgb = CONNECTOR_DIM
+    for i, series in enumerate(chart.plots[0].series):
+        series.smooth = False
+        series.marker.style = XL_MARKER_STYLE.NONE
+        series.format.line.color.rgb = SCENARIO_COLORS[i % len(SCENARIO_COLORS)]
+        series.format.line.width = Pt(2.25)
+
+
+def add_chart_slide(prs, title, subtitle, categories, series, number_format):
+    """A titled line chart of scenario series over the projection months."""
+    slide = add_blank_slide(prs)
+    add_textbox(
+        slide, Inches(0.7), Inches(0.4), Inches(11.9), Inches(0.6),
+        title, font_size=28, color=ACCENT_GOLD, bold=True,
+    )
+    add_textbox(
+        slide, Inches(0.7), Inches(1.0), Inches(11.9), Inches(0.4),
+        subtitle, font_size=14, color=TEXT_DIM,
+    )
+    data = CategoryChartData(number_format=number_format)
+    data.categories = categories
+    for name, values in series:
+        data.add_series(name, values)
+    frame = slide.shapes.add_chart(XL_CHART_TYPE.LINE, *CHART_BOX, data)
+    style_chart(frame.chart)
+    return slide
+
+
+# ── Build presentation ───────────────────────────────────────────────────
+
+def new_presentation():
+    """Empty widescreen presentation on the deck template."""
+    return Presentation(TEMPLATE_PATH)
+
+
+def add_blank_slide(prs):
+    """Append a slide on the template's only layout (blank, deck background)."""
+    return prs.slides.add_slide(prs.slide_layouts[0])
+
 
 # ╔══════════════════════════════════════════════════════════════════════╗
-# ║  END SLIDE                                                          ║
+# ║  TITLE SLIDE                                                         ║
 # ╚══════════════════════════════════════════════════════════════════════╝
-slide = prs.slides.add_slide(blank_layout)
-set_slide_bg(slide, BG_COLOR)
 
-add_textbox(
-    slide, Inches(1), Inches(2.2), Inches(11.3), Inches(1),
-    "Thank you!", font_size=44, color=ACCENT_GOLD, bold=True,
-    alignment=PP_ALIGN.CENTER,
-)
-add_textbox(
-    slide, Inches(1), Inches(3.5), Inches(11.3), Inches(1.2),
-    (
-        "We'd love your feedback on this flow.\n\n"
-        "Is each step clear?  Anything confusing or unnecessary?\n"
-        "Would you change the order of any steps?"
-    ),
-    font_size=18, color=TEXT_LIGHT, alignment=PP_ALIGN.CENTER,
-)
+def add_title_slide(prs, flow_name=None):
+    """Deck title, subtitled with the path name for per-path decks."""
+    slide = add_blank_slide(prs)
+
+    add_textbox(
+        slide, Inches(1), Inches(1.8), Inches(11.3), Inches(1),
+        "MemoryCharm", font_size=48, color=ACCENT_GOLD, bold=True,
+        alignment=PP_ALIGN.CENTER,
+    )
+    add_textbox(
+        slide, Inches(1), Inches(3.0), Inches(11.3), Inches(0.6),
+        f"Claim Flow \u2014 {flow_name or 'UX Walkthrough'}", font_size=28, color=TEXT_LIGHT,
+        alignment=PP_ALIGN.CENTER,
+    )
+    add_textbox(
+        slide, Inches(1), Inches(4.2), Inches(11.3), Inches(1),
+        (
+            "This deck walks through every screen a user sees when they scan a charm\n"
+            "and bind a memory to it. Each slide shows where the user is in the\n"
+            "overall journey and describes what they do on that screen."
+        ),
+        font_size=14, color=TEXT_DIM, alignment=PP_ALIGN.CENTER,
+    )
+    return slide
+
+
+# ╔══════════════════════════════════════════════════════════════════════╗
+# ║  OVERVIEW SLIDE                                                      ║
+# ╚══════════════════════════════════════════════════════════════════════╝
+
+def add_overview_slide(prs, steps, spec):
+    """Breadcrumb map of the deck's steps plus every path in the spec."""
+    slide = add_blank_slide(prs)
+
+    add_textbox(
+        slide, Inches(0.7), Inches(0.4), Inches(11.9), Inches(0.6),
+        "The Journey at a Glance", font_size=32, color=ACCENT_GOLD, bold=True,
+        alignment=PP_ALIGN.CENTER,
+    )
+
+    # Draw the breadcrumb with no active step — every step gold, as a "map"
+    with ShapeBatch(slide) as batch:
+        draw_breadcrumb(batch, steps, None, Inches(1.5), style="overview")
+
+    # One line per path in the spec, numbered against the full flow
+    add_textbox(
+        slide, Inches(1), Inches(3.2), Inches(11.3), Inches(1.9),
+        "Possible paths through the flow:\n\n"
+        + "\n".join(path_summary(spec, flow) for flow in spec["paths"]),
+        font_size=14, color=TEXT_LIGHT, alignment=PP_ALIGN.LEFT,
+    )
+
+    # Decorative divider
+    div = slide.shapes.add_shape(
+        MSO_SHAPE.RECTANGLE, Inches(2), Inches(5.4), Inches(9.3), Pt(1)
+    )
+    div.fill.solid()
+    div.fill.fore_color.rgb = ACCENT_GOLD
+    div.line.fill.background()
+
+    add_textbox(
+        slide, Inches(1), Inches(5.7), Inches(11.3), Inches(0.8),
+        (
+            "The following slides show each step in detail. "
+            "Add a screenshot to the placeholder on each slide for the full picture."
+        ),
+        font_size=12, color=TEXT_DIM, alignment=PP_ALIGN.CENTER,
+    )
+    return slide
+
+
+# ╔══════════════════════════════════════════════════════════════════════╗
+# ║  END SLIDE                                                           ║
+# ╚══════════════════════════════════════════════════════════════════════╝
+
+def add_end_slide(prs):
+    """Closing slide asking for feedback."""
+    slide = add_blank_slide(prs)
+
+    add_textbox(
+        slide, Inches(1), Inches(2.2), Inches(11.3), Inches(1),
+        "Thank you!", font_size=44, color=ACCENT_GOLD, bold=True,
+        alignment=PP_ALIGN.CENTER,
+    )
+    add_textbox(
+        slide, Inches(1), Inches(3.5), Inches(11.3), Inches(1.2),
+        (
+            "We'd love your feedback on this flow.\n\n"
+            "Is each step clear?  Anything confusing or unnecessary?\n"
+            "Would you change the order of any steps?"
+        ),
+        font_size=18, color=TEXT_LIGHT, alignment=PP_ALIGN.CENTER,
+    )
+    return slide
+
+
+def deck_slides(steps=None, spec=FLOW_SPEC, path_id=None, screenshots=None, finance=None):
+    """
+    The deck's slides in order as (inputs, builder) pairs: `inputs` is
+    everything the slide's content depends on besides the style constants,
+    and builder(prs) appends the slide.
+    """
+    if steps is None:
+        steps = path_steps(spec, path_id)
+    screenshots = screenshots or {}
+    flow_name = next((flow["name"] for flow in spec["paths"] if flow["id"] == path_id), None)
+    labels = [step["short"] for step in steps]
+
+    slides = [
+        (("title", flow_name), partial(add_title_slide, flow_name=flow_name)),
+        (("overview", labels, [(st["id"], st["short"]) for st in spec["steps"]], spec["paths"]), partial(add_overview_slide, steps=steps, spec=spec)),
+    ]
+    for idx, step in enumerate(steps):
+        shot = screenshots.get(step["id"])
+        digest = hashlib.sha1(shot[0]).hexdigest() if shot else None
+        slides.append((("step", idx, step, labels, digest, shot and shot[1:]),
+                       partial(add_step_slide, steps=steps, idx=idx, screenshot=shot)))
+    if finance:
+        for chart in finance_charts(finance):
+            slides.append((("chart", chart), partial(add_chart_slide, **chart)))
+    slides.append((("end",), add_end_slide))
+    return slides
+
+
+def build_deck(steps=None, spec=FLOW_SPEC, path_id=None, screenshots=None, finance=None):
+    """
+    Build the claim-flow walkthrough deck. With path_id the step slides and
+    breadcrumbs follow that path only; otherwise every step in the spec.
+    screenshots maps step id -> prepared image from ingest_screenshots();
+    finance (from financial_series()) adds the chart slides before the close.
+    """
+    prs = new_presentation()
+    for _, build in deck_slides(steps, spec, path_id, screenshots, finance):
+        build(prs)
+    return prs
+
+
+# ── Incremental rebuild ──────────────────────────────────────────────────
+# A manifest beside the deck records a hash of each slide's inputs and the
+# slide part it was written to. An incremental build hashes the new inputs,
+# builds only the slides whose hash changed on a scratch presentation, and
+# swaps those slide parts (plus their rels and any new media) into the
+# existing zip; every other entry is copied through unchanged. A different
+# slide count, or any edit to this script, falls back to a full build.
+
+MANIFEST_SUFFIX = ".manifest.json"
+REL_IMAGE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/image"
+REL_SLIDE_LAYOUT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout"
+MEDIA_CONTENT_TYPES = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg"}
+
+
+def style_constants():
+    """Palette, geometry and type settings that every slide's look depends on."""
+    return dict(
+        palette=[str(c) for c in (BG_COLOR, ACCENT_GOLD, TEXT_LIGHT, TEXT_DIM, STEP_INACTIVE, STEP_ACTIVE_BG,
+                                  STEP_DONE_BG, CONNECTOR_DIM, CONNECTOR_DONE, PLACEHOLDER_BG, WHITE, BLACK)],
+        slide=(SLIDE_W, SLIDE_H),
+        breadcrumb=BREADCRUMB_STYLES,
+        step=(STEP_MARGIN, STEP_COL_GAP, STEP_PH_W, STEP_BREADCRUMB_TOP, STEP_DESCRIPTION_MIN_PT),
+        screenshot=(SCREENSHOT_DPI, SCREENSHOT_PAD),
+    )
+
+
+def slide_hash(inputs, style):
+    return hashlib.sha256(json.dumps([inputs, style], sort_keys=True, default=str).encode()).hexdigest()
+
 
-# ── Save ──────────────────────────────────────────────────────────────
-output_path = r"c:\Users\appli\source\repos\MemoryCharm\MemoryCharm_ClaimFlow_UX_v2.pptx"
-prs.save(output_path)
-print(f"Saved to {output_path}")
+def generator_digest():
+    """Hash of this script and the template, so changes to either force a full rebuild."""
+    digest = hashlib.sha256()
+    for path in (os.path.abspath(__file__), TEMPLATE_PATH):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _rels_xml(rels):
+    items = "".join(f'<Relationship Id="{rid}" Type="{reltype}" Target="{target}"/>' for rid, reltype, target in rels)
+    return ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f"{items}</Relationships>").encode()
+
+
+def patch_slides(deck_path, builders):
+    """
+    Rewrite the slide parts named in builders ({"ppt/slides/slideN.xml":
+    builder}) inside an existing deck. Images are stored under a content
+    hash, reusing identical media already in the zip, and media no longer
+    referenced by any part is dropped. Returns False, leaving the deck
+    untouched, when a rebuilt slide carries other parts (charts).
+    """
+    scratch = new_presentation()
+    for build in builders.values():
+        build(scratch)
+
+    with zipfile.ZipFile(deck_path) as src:
+        infos = src.infolist()
+        media_by_sha = {hashlib.sha1(src.read(info)).hexdigest(): info.filename
+                        for info in infos if info.filename.startswith("ppt/media/")}
+        replaced, new_media = {}, {}
+        for partname, slide in zip(builders, scratch.slides):
+            rels = []
+            for rid, rel in slide.part.rels.items():
+                target = rel.target_ref
+                if rel.reltype not in (REL_IMAGE, REL_SLIDE_LAYOUT):
+                    return False
+                if rel.reltype == REL_IMAGE:
+                    blob = rel.target_part.blob
+                    sha = hashlib.sha1(blob).hexdigest()
+                    name = media_by_sha.get(sha)
+                    if name is None:
+                        ext = os.path.splitext(rel.target_part.partname)[1]
+                        name = media_by_sha[sha] = f"ppt/media/image-{sha[:16]}{ext}"
+                        new_media[name] = blob
+                    target = "../media/" + os.path.basename(name)
+                rels.append((rid, rel.reltype, target))
+            replaced[partname] = slide.part.blob
+            replaced[partname.replace("slides/", "slides/_rels/") + ".rels"] = _rels_xml(rels)
+
+        # Media still referenced by some rels part after the swap
+        referenced = set()
+        for info in infos:
+            if info.filename.endswith(".rels"):
+                xml = replaced.get(info.filename) or src.read(info)
+                referenced.update(re.findall(rb'Target="\.\./media/([^"]+)"', xml))
+
+        content_types = src.read("[Content_Types].xml")
+        for name in new_media:
+            ext = os.path.splitext(name)[1]
+            if f'Extension="{ext[1:]}"'.encode() not in content_types:
+                content_types = content_types.replace(
+                    b"<Default ", f'<Default Extension="{ext[1:]}" ContentType="{MEDIA_CONTENT_TYPES[ext]}"/><Default '.encode(), 1)
+        replaced["[Content_Types].xml"] = content_types
+
+        tmp_path = deck_path + ".tmp"
+        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as dst:
+            for info in infos:
+                name = info.filename
+                if name.startswith("ppt/media/") and os.path.basename(name).encode() not in referenced:
+                    continue
+                dst.writestr(info, replaced[name] if name in replaced else src.read(info))
+            for name, blob in new_media.items():
+                dst.writestr(name, blob)
+    os.replace(tmp_path, deck_path)
+    return True
+
+
+def build_incremental(output_path, steps=None, spec=FLOW_SPEC, path_id=None, screenshots=None, finance=None):
+    """
+    Bring the deck at output_path up to date, rewriting only slides whose
+    inputs changed since its manifest. Returns (slides rewritten, total).
+    """
+    slides = deck_slides(steps, spec, path_id, screenshots, finance)
+    style = style_constants()
+    hashes = [slide_hash(inputs, style) for inputs, _ in slides]
+    manifest_path = output_path + MANIFEST_SUFFIX
+    generator = generator_digest()
+
+    old = None
+    if os.path.exists(output_path) and os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            old = json.load(f)
+    patched = False
+    if old and old["generator"] == generator and len(old["slides"]) == len(slides):
+        parts = [entry["part"] for entry in old["slides"]]
+        changed = [i for i, entry in enumerate(old["slides"]) if entry["hash"] != hashes[i]]
+        patched = not changed or patch_slides(output_path, {parts[i]: slides[i][1] for i in changed})
+    if not patched:
+        prs = new_presentation()
+        for _, build in slides:
+            build(prs)
+        prs.save(output_path)
+        parts = [slide.part.partname.lstrip("/") for slide in prs.slides]
+        changed = range(len(slides))
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"generator": generator,
+                   "slides": [{"part": part, "hash": h} for part, h in zip(parts, hashes)]}, f, indent=1)
+    return len(changed), len(slides)
+
+
+# ── Bulk-insert benchmark ────────────────────────────────────────────────
+
+def benchmark_bulk_insert(step_counts=(6, 12, 24, 48, 96, 192), repeats=3):
+    """
+    Time building one step slide for an n-step flow on the deck template:
+    drawn shape by shape, drawn through a ShapeBatch, and cloned from the
+    step prototype as build_deck does. Per-shape cost through python-pptx
+    grows with the shapes already on the slide; the batch stays flat, and
+    the clone only patches text and colours.
+    """
+    def per_slide(n, mode):
+        prs = new_presentation()
+        steps = [{"id": f"s{i + 1}", "short": f"S{i + 1}", "title": f"Step {i + 1}",
+                  "description": "Benchmark step."} for i in range(n)]
+        if mode == "clone":
+            step_prototype(steps)  # drawn once per flow, outside the timed loop as in a real build
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            if mode == "clone":
+                slide = add_step_slide(prs, steps, n // 2)
+            else:
+                slide = add_blank_slide(prs)
+                if mode == "batch":
+                    with ShapeBatch(slide) as batch:
+                        draw_step_slide(batch, steps, n // 2)
+                else:
+                    draw_step_slide(slide, steps, n // 2)
+            best = min(best, time.perf_counter() - start)
+        return best, len(slide.shapes)
+
+    print(f"{'steps':>6} {'shapes':>7} {'per-shape ms':>13} {'bulk ms':>9} {'clone ms':>9} "
+          f"{'per-shape us/shape':>19} {'bulk us/shape':>14}")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # crowded breadcrumbs at large n are the point, not a problem
+        for n in step_counts:
+            single, shapes = per_slide(n, "shape")
+            bulk, _ = per_slide(n, "batch")
+            clone, _ = per_slide(n, "clone")
+            print(f"{n:>6} {shapes:>7} {single * 1e3:>13.1f} {bulk * 1e3:>9.1f} {clone * 1e3:>9.1f} "
+                  f"{single * 1e6 / shapes:>19.1f} {bulk * 1e6 / shapes:>14.1f}")
+
+
+def benchmark_text_fit(boxes=5000):
+    """Measure-and-fit throughput for description-sized boxes with fresh word orderings."""
+    words = " ".join(step["description"] for step in STEPS).split(" ")
+    texts = [" ".join(words[i % len(words):] + words[:i % len(words)])[:450] for i in range(boxes)]
+    width = int(STEP_RIGHT_W - Inches(0.6))
+    height = int(SLIDE_H - Inches(2.8) - STEP_MARGIN - Inches(1.0))
+    advances = glyph_advances()
+    start = time.perf_counter()
+    shrunk = sum(fit_text_size(text, width, height, 13)[0] < 13 for text in texts)
+    elapsed = time.perf_counter() - start
+    print(f"{boxes} boxes in {elapsed * 1e3:.0f} ms ({boxes / elapsed:,.0f} boxes/s), {shrunk} shrunk; "
+          f"metrics from {advances.path or 'built-in Segoe UI approximation'}")
+
+
+# ── Per-path variants ────────────────────────────────────────────────────
+
+def _build_variant(job):
+    """Worker: build and save one path's deck; returns (path id, file, seconds, slides written)."""
+    spec, path_id, output_path, screenshots, finance, incremental = job
+    start = time.perf_counter()
+    if incremental:
+        written, _ = build_incremental(output_path, spec=spec, path_id=path_id, screenshots=screenshots,
+                                       finance=finance)
+    else:
+        prs = build_deck(spec=spec, path_id=path_id, screenshots=screenshots, finance=finance)
+        prs.save(output_path)
+        written = len(prs.slides)
+    return path_id, output_path, time.perf_counter() - start, written
+
+
+def build_variants(spec, out_dir=OUTPUT_DIR, workers=None, screenshots=None, finance=None, incremental=False):
+    """Build one deck per path in the spec, each in its own worker process."""
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(spec, flow["id"], os.path.join(out_dir, f"MemoryCharm_ClaimFlow_{flow['id']}.pptx"),
+             {sid: shot for sid, shot in (screenshots or {}).items() if sid in flow["steps"]}, finance, incremental)
+            for flow in spec["paths"]]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_build_variant, jobs))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--make-template", action="store_true", help="rewrite deck_template.pptx")
+    parser.add_argument("--benchmark", action="store_true", help="time bulk shape insertion and text fitting")
+    parser.add_argument("--variants", action="store_true", help="build one deck per path in the flow spec")
+    parser.add_argument("--spec", default=FLOW_SPEC_PATH, help="flow spec (JSON, or YAML with PyYAML)")
+    parser.add_argument("--out-dir", default=OUTPUT_DIR)
+    parser.add_argument("--screenshots", help="folder of screenshots named after step ids")
+    parser.add_argument("--finance", nargs="?", const=FINANCIAL_MODEL_PATH,
+                        help="add projection charts from the financial model workbook")
+    parser.add_argument("--incremental", action="store_true",
+                        help="rewrite only slides whose inputs changed since the last build's manifest")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes for --variants and --screenshots")
+    args = parser.parse_args()
+
+    spec = load_flow_spec(args.spec)
+    screenshots = {}
+    if args.screenshots:
+        screenshots = ingest_screenshots(args.screenshots, spec["steps"], args.workers)
+        print(f"Prepared {len(screenshots)} screenshots "
+              f"({len({shot[0] for shot in screenshots.values()})} unique images)")
+    finance = financial_series(args.finance) if args.finance else None
+
+    if args.make_template:
+        make_template()
+        print(f"Saved to {TEMPLATE_PATH}")
+    elif args.benchmark:
+        benchmark_bulk_insert()
+        benchmark_text_fit()
+    elif args.variants:
+        start = time.perf_counter()
+        for path_id, output_path, seconds, written in build_variants(
+                spec, args.out_dir, args.workers, screenshots, finance, args.incremental):
+            print(f"{path_id:<18} {seconds:6.2f}s  {written:>2} slides written  {output_path}")
+        print(f"Built variants in {time.perf_counter() - start:.2f}s")
+    else:
+        os.makedirs(args.out_dir, exist_ok=True)
+        output_path = os.path.join(args.out_dir, "MemoryCharm_ClaimFlow_UX_v2.pptx")
+        if args.incremental:
+            written, total = build_incremental(output_path, spec=spec, screenshots=screenshots, finance=finance)
+            print(f"Saved to {output_path} ({written} of {total} slides rewritten)")
+        else:
+            build_deck(spec=spec, screenshots=screenshots, finance=finance).save(output_path)
+            print(f"Saved to {output_path}")
@@ -7,8 +7,21 @@ Functions invocations, content-size-by-type, and playback request volume.
 
 import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.formatting.rule import FormulaRule
 from openpyxl.utils import get_column_letter
 
+from financial_engine import (
+    tiered_formula, tiered_marginal_formula, read_assumptions, scenario_inputs, project,
+    marginal_cost_per_charm, marginal_cost_formula, optimize_lifecycle, placement_cost_formula,
+    placement_latency_formula, placement_feasible_formula, band_months_within, charms_by_age_band,
+    playback_latency, mirror_cost_availability, plan_crossover,
+    limit_utilization, stress_inputs, first_crossing, derive,
+    media_cost_attribution, recompression_per_charm, recompression_cohorts,
+    deferred_waterfall, obligation_coverage,
+    portfolio, SERVICE_GROUPS, SERVICE_GROUP_ROWS, MEDIA_TYPES, MEDIA_COLUMNS, MEDIA_ROWS, TIER_LIFETIMES, RECOGNITION_METHODS,
+    PLACEMENTS, AGE_BAND_ROWS, TIER_ROWS, MIRROR_OPTIONS, PLAN_NAMES, SCALE_LIMITS, STRESS_MULTIPLIERS,
+)
+
 # ── Styling ──────────────────────────────────────────────────────────────────
 
 DARK_BLUE = "1B2A4A"
@@ -44,6 +57,10 @@ thin_border = Border(
 )
 green_fill = PatternFill(start_color=GREEN_FILL, end_color=GREEN_FILL, fill_type="solid")
 red_fill = PatternFill(start_color=RED_FILL, end_color=RED_FILL, fill_type="solid")
+# Values computed by financial_engine at build time where a cell formula can't
+# express the calculation (scenario overrides, Monte Carlo, convolutions)
+snapshot_font = Font(name="Calibri", italic=True, size=11, color="808080")
+SNAPSHOT = " — SNAPSHOT (build time)"
 blue_fill = PatternFill(start_color=LIGHT_BLUE, end_color=LIGHT_BLUE, fill_type="solid")
 
 
@@ -201,25 +218,25 @@ note(ws, R, 6, "API enforces 150 MB max per charm")
 
 R += 1  # 28
 section_header(ws, R, 2, 5, ["Media Type", "Avg Size (MB)", "% of Charms", "Weighted MB"])
-note(ws, R, 6, "Weighted MB = Size x Mix %")
+note(ws, R, 6, "Avg size = capped lognormal mean (rows 216-221); Weighted MB = Size x Mix %")
 
 R += 1  # 29 — Video
 sc(ws, R, 2, "Video charms (single mp4/webm/mov)", font=normal_font, border=thin_border)
-inp(ws, R, 3, 55, num_fmt)
+formula(ws, R, 3, "=F218", normal_font, num_1dp)
 inp(ws, R, 4, 0.55, pct_fmt)
 formula(ws, R, 5, "=C29*D29", normal_font, num_2dp)
 note(ws, R, 6, "iPhone 1080p: HEVC ~20MB, H.264 ~65MB, 4K ~67MB for 30s")
 
 R += 1  # 30 — Image gallery
 sc(ws, R, 2, "Image gallery charms (1-20 images)", font=normal_font, border=thin_border)
-inp(ws, R, 3, 15, num_fmt)
+formula(ws, R, 3, "=F219", normal_font, num_1dp)
 inp(ws, R, 4, 0.35, pct_fmt)
 formula(ws, R, 5, "=C30*D30", normal_font, num_2dp)
 note(ws, R, 6, "~4-6 iPhone photos avg at 2.5-4 MB each (HEIF/JPEG)")
 
 R += 1  # 31 — Audio
 sc(ws, R, 2, "Audio charms (single mp3/wav/ogg/aac)", font=normal_font, border=thin_border)
-inp(ws, R, 3, 6, num_fmt)
+formula(ws, R, 3, "=F220", normal_font, num_1dp)
 inp(ws, R, 4, 0.10, pct_fmt)
 formula(ws, R, 5, "=C31*D31", normal_font, num_2dp)
 note(ws, R, 6, "Voice message or song clip, 1-3 min")
@@ -552,6 +569,809 @@ sc(ws, R, 2, "Replacement COGS (% of original — may use cheaper housing)", fon
 inp(ws, R, 3, 1.00, pct_fmt)
 note(ws, R, 4, "100% = full COGS; could be lower if reusing parts")
 
+# ════════════════════════════════════════════════════════════════════════════
+# SECTION: MULTIPART UPLOAD INGESTION  (rows 105-118)
+# ════════════════════════════════════════════════════════════════════════════
+R = 105
+sc(ws, R, 2, "MULTIPART UPLOAD INGESTION", font=section_font)
+note(ws, R, 6, "Uploads above the threshold go up as multipart (1 Class A op per part)")
+
+R += 1  # 106
+section_header(ws, R, 2, 4, ["Parameter", "Value", "Unit"])
+
+R += 1  # 107
+sc(ws, R, 2, "Multipart threshold (files above this use multipart)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 16, num_fmt)
+note(ws, R, 4, "MB")
+note(ws, R, 6, "Smaller files go up as a single PUT")
+
+R += 1  # 108
+sc(ws, R, 2, "Multipart part size", font=normal_font, border=thin_border)
+inp(ws, R, 3, 10, num_fmt)
+note(ws, R, 4, "MB")
+note(ws, R, 6, "R2 minimum 5 MiB (except last part); also used as Azure block size")
+
+R += 1  # 109
+sc(ws, R, 2, "Mobile upload failure rate (per MB in flight)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 0.002, '0.000%')
+note(ws, R, 4, "per MB")
+note(ws, R, 6, "A failed part is re-sent whole: expected attempts = EXP(rate x part MB)")
+
+R += 1  # 110
+sc(ws, R, 2, "Images per gallery charm (avg)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 5, num_fmt)
+note(ws, R, 4, "objects")
+note(ws, R, 6, "Each image is its own single-PUT object")
+
+R += 1  # 111
+sc(ws, R, 2, "Per-request overhead (RTT + signing)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 250, num_fmt)
+note(ws, R, 4, "ms per PUT / part")
+
+R += 1  # 112
+sc(ws, R, 2, "Mobile upstream bandwidth", font=normal_font, border=thin_border)
+inp(ws, R, 3, 8, num_1dp)
+note(ws, R, 4, "Mbps")
+note(ws, R, 6, "Typical LTE uplink; Wi-Fi uploads finish faster")
+
+R += 1  # 113
+sc(ws, R, 2, "Peak-hour share of daily claims", font=normal_font, border=thin_border)
+inp(ws, R, 3, 0.12, pct_fmt)
+note(ws, R, 6, "Evening / gift-opening peak; flat day = 4.2%")
+
+R += 1  # 114 — Derived: R2 Class A ops per upload
+sc(ws, R, 2, "R2 Class A ops per upload (parts + retries + verify)", font=bold_font, border=thin_border)
+formula(ws, R, 3,
+    "=D29*IF(C29>C107,ROUNDUP(C29/C108,0)*EXP(C109*MIN(C108,C29))+2,EXP(C109*C29))"
+    "+D30*C110*EXP(C109*C30/C110)"
+    "+D31*IF(C31>C107,ROUNDUP(C31/C108,0)*EXP(C109*MIN(C108,C31))+2,EXP(C109*C31))"
+    "+1",
+    bold_font, num_2dp)
+note(ws, R, 4, "ops / upload")
+note(ws, R, 6, "Multipart = create + parts + complete; +1 list verify. Feeds Projections row 23")
+
+R += 1  # 115 — Derived: Azure mirror write ops per upload
+sc(ws, R, 2, "Azure Blob write ops per upload (blocks + commit)", font=bold_font, border=thin_border)
+formula(ws, R, 3,
+    "=D29*IF(C29>C107,ROUNDUP(C29/C108,0)+1,1)"
+    "+D30*C110"
+    "+D31*IF(C31>C107,ROUNDUP(C31/C108,0)+1,1)",
+    bold_font, num_2dp)
+note(ws, R, 4, "ops / upload")
+note(ws, R, 6, "Server-side mirror (Put Block + Put Block List) — no mobile retries. Feeds row 25")
+
+R += 1  # 116 — Derived: MB sent per upload including retries
+sc(ws, R, 2, "MB sent per upload (incl. retried parts)", font=normal_font, border=thin_border)
+formula(ws, R, 3,
+    "=D29*C29*EXP(C109*IF(C29>C107,MIN(C108,C29),C29))"
+    "+D30*C30*EXP(C109*C30/C110)"
+    "+D31*C31*EXP(C109*IF(C31>C107,MIN(C108,C31),C31))",
+    normal_font, num_2dp)
+note(ws, R, 4, "MB")
+
+R += 1  # 117 — Derived: upload time per charm
+sc(ws, R, 2, "Upload time per charm (mobile)", font=normal_font, border=thin_border)
+formula(ws, R, 3, "=C116*8/C112+(C114-1)*C111/1000", normal_font, num_1dp)
+note(ws, R, 4, "seconds")
+note(ws, R, 6, "Sequential parts: transfer time + per-request overhead")
+
+R += 1  # 118 — Derived: uploads per claimed charm
+sc(ws, R, 2, "Uploads per claimed charm (incl. re-uploads)", font=normal_font, border=thin_border)
+formula(ws, R, 3, "=1+C35", normal_font, num_2dp)
+note(ws, R, 4, "uploads")
+
+# ════════════════════════════════════════════════════════════════════════════
+# SECTION: FREE ALLOWANCES  (rows 120-126)
+# ════════════════════════════════════════════════════════════════════════════
+R = 120
+sc(ws, R, 2, "FREE ALLOWANCES (per month, applied before unit rates)", font=section_font)
+note(ws, R, 6, "Also: R2 storage C59, Functions C73/C74")
+
+R += 1  # 121
+section_header(ws, R, 2, 4, ["Allowance", "Free / Month", "Unit"])
+
+R += 1  # 122
+sc(ws, R, 2, "R2 Class A ops free", font=normal_font, border=thin_border)
+inp(ws, R, 3, 10000000, num_fmt)
+note(ws, R, 4, "ops/month")
+
+R += 1  # 123
+sc(ws, R, 2, "R2 Class B ops free", font=normal_font, border=thin_border)
+inp(ws, R, 3, 10000000, num_fmt)
+note(ws, R, 4, "ops/month")
+
+R += 1  # 124
+sc(ws, R, 2, "Azure Blob egress free", font=normal_font, border=thin_border)
+inp(ws, R, 3, 100, num_fmt)
+note(ws, R, 4, "GB/month")
+
+R += 1  # 125
+sc(ws, R, 2, "Entra CIAM free MAU", font=normal_font, border=thin_border)
+inp(ws, R, 3, 50000, num_fmt)
+note(ws, R, 4, "MAU/month")
+
+R += 1  # 126
+sc(ws, R, 2, "Monthly active users per active charm", font=normal_font, border=thin_border)
+inp(ws, R, 3, 0.3, num_2dp)
+note(ws, R, 4, "MAU/charm")
+note(ws, R, 6, "Not every charm = unique monthly active user")
+
+# ════════════════════════════════════════════════════════════════════════════
+# SECTION: STORAGE LIFECYCLE TIERS  (rows 128-145)
+# ════════════════════════════════════════════════════════════════════════════
+R = 128
+sc(ws, R, 2, "STORAGE LIFECYCLE TIERS (placement by charm age)", font=section_font)
+note(ws, R, 6, "Feeds the Storage Tiering optimizer sheet")
+
+R += 1  # 129
+section_header(ws, R, 2, 5, ["Charm Age Band", "From Month", "To Month", "Views / Charm / Month"])
+
+age_bands = [
+    # (row, label, from, to, views/month — number or formula)
+    (130, "Novelty (0-3 months)", 0, 3, "=C38"),
+    (131, "Settled (3-12 months)", 3, 12, "=C39"),
+    (132, "Keepsake (1-3 years)", 12, 36, 1),
+    (133, "Archive-age (3-10 years)", 36, 120, 0.5),
+    (134, "Heirloom (10+ years)", 120, 360, 0.25),
+]
+for row, label, start, end, views in age_bands:
+    sc(ws, row, 2, label, font=normal_font, border=thin_border)
+    inp(ws, row, 3, start, num_fmt)
+    inp(ws, row, 4, end, num_fmt)
+    if isinstance(views, str):
+        formula(ws, row, 5, views, normal_font, num_2dp)
+    else:
+        inp(ws, row, 5, views, num_2dp)
+note(ws, 134, 6, "Perpetual charms assumed hosted 30 years (360 months)")
+
+R = 136
+section_header(ws, R, 2, 8, ["Storage Tier", "Storage $/GB/mo", "Retrieval $/GB", "Read $/10K ops",
+                             "Write $/10K ops", "Min Retention (days)", "First Byte (ms)"])
+ws.column_dimensions["G"].width = 18
+ws.column_dimensions["H"].width = 16
+
+storage_tiers = [
+    # (row, label, storage, retrieval, read/10K, write/10K, min days, first-byte ms)
+    (137, "Cloudflare R2 Standard", "=C55", 0, "=C57/100", "=C56/100", 0, 120),
+    (138, "Cloudflare R2 Infrequent Access", 0.01, 0.01, 0.009, 0.09, 30, 200),
+    (139, "Azure Blob Cool", "=C47", "=C50", "=C49", "=C48", 30, 250),
+    (140, "Azure Blob Cold", 0.0036, 0.03, 0.10, 0.18, 90, 250),
+    (141, "Azure Blob Archive", 0.00099, 0.022, 5.00, 0.10, 180, 54000000),
+]
+tier_formats = [currency_micro, currency_micro, currency_micro, currency_micro, num_fmt, num_fmt]
+for row, label, *values in storage_tiers:
+    sc(ws, row, 2, label, font=normal_font, border=thin_border)
+    for k, (v, fmt) in enumerate(zip(values, tier_formats)):
+        if isinstance(v, str):
+            formula(ws, row, 3 + k, v, normal_font, fmt)
+        else:
+            inp(ws, row, 3 + k, v, fmt)
+note(ws, 142, 2, "Archive first byte = standard-priority rehydration (up to 15 h). Azure tiers pay egress C51 when serving directly.")
+
+R = 144
+sc(ws, R, 2, "Max expected added playback latency", font=normal_font, border=thin_border)
+inp(ws, R, 3, 1000, num_fmt)
+note(ws, R, 4, "ms per view")
+note(ws, R, 6, "Placements slower than this vs today's R2 + Cool are rejected")
+
+R += 1  # 145
+sc(ws, R, 2, "Require a backup copy (1 = yes, 0 = allow single copy)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 1, num_fmt)
+note(ws, R, 6, "Single-copy placements lose the fallback path for R2 outages")
+
+# ════════════════════════════════════════════════════════════════════════════
+# SECTION: PLAYBACK FALLBACK & AVAILABILITY  (rows 147-161)
+# ════════════════════════════════════════════════════════════════════════════
+R = 147
+sc(ws, R, 2, "PLAYBACK FALLBACK & AVAILABILITY", font=section_font)
+note(ws, R, 6, "Drives the Azure fallback read share (rows 26/33) and the Playback SLO sheet")
+
+R += 1  # 148
+section_header(ws, R, 2, 4, ["Parameter", "Value", "Unit"])
+
+R += 1  # 149
+sc(ws, R, 2, "R2 request error rate (5xx / timeouts)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 0.005, '0.00%')
+note(ws, R, 4, "of requests")
+
+R += 1  # 150
+sc(ws, R, 2, "Share of R2 errors recovered by client retry", font=normal_font, border=thin_border)
+inp(ws, R, 3, 0.60, pct_fmt)
+note(ws, R, 6, "One immediate retry against R2 before switching to Azure")
+
+R += 1  # 151
+sc(ws, R, 2, "R2 regional outage minutes per month", font=normal_font, border=thin_border)
+inp(ws, R, 3, 43, num_fmt)
+note(ws, R, 4, "minutes")
+note(ws, R, 6, "99.9% availability = 43 min/month")
+
+R += 1  # 152 — Derived: fallback probability
+sc(ws, R, 2, "AZURE FALLBACK READ SHARE (modeled)", font=bold_font, border=thin_border)
+formula(ws, R, 3, "=C149*(1-C150)+C151/43200", bold_font, '0.00%')
+note(ws, R, 4, "of views")
+note(ws, R, 6, "Unrecovered errors + outage time share (43,200 min/month)")
+
+R += 1  # 153
+sc(ws, R, 2, "R2 edge time-to-first-frame — median", font=normal_font, border=thin_border)
+inp(ws, R, 3, 350, num_fmt)
+note(ws, R, 4, "ms")
+
+R += 1  # 154
+sc(ws, R, 2, "R2 edge time-to-first-frame — P95", font=normal_font, border=thin_border)
+inp(ws, R, 3, 900, num_fmt)
+note(ws, R, 4, "ms")
+
+R += 1  # 155
+sc(ws, R, 2, "Azure Cool direct time-to-first-frame — median", font=normal_font, border=thin_border)
+inp(ws, R, 3, 600, num_fmt)
+note(ws, R, 4, "ms")
+note(ws, R, 6, "No CDN in front of the backup account")
+
+R += 1  # 156
+sc(ws, R, 2, "Azure Cool direct time-to-first-frame — P95", font=normal_font, border=thin_border)
+inp(ws, R, 3, 1600, num_fmt)
+note(ws, R, 4, "ms")
+
+R += 1  # 157
+sc(ws, R, 2, "Fallback detection — R2 error (fast fail)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 300, num_fmt)
+note(ws, R, 4, "ms")
+
+R += 1  # 158
+sc(ws, R, 2, "Fallback detection — R2 outage (client timeout)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 4000, num_fmt)
+note(ws, R, 4, "ms")
+
+R += 1  # 159
+sc(ws, R, 2, "Azure Blob availability while R2 is failing", font=normal_font, border=thin_border)
+inp(ws, R, 3, 0.999, '0.0%')
+
+R += 1  # 160 — Derived: expected time-to-first-frame
+sc(ws, R, 2, "Expected time-to-first-frame (all views)", font=bold_font, border=thin_border)
+formula(ws, R, 3,
+    "=(1-C152)*C153*EXP((LN(C154/C153)/1.645)^2/2)"
+    "+C152*(C155*EXP((LN(C156/C155)/1.645)^2/2)"
+    "+IF(C152>0,(C149*(1-C150)*C157+C151/43200*C158)/C152,0))",
+    bold_font, num_fmt)
+note(ws, R, 4, "ms")
+note(ws, R, 6, "Lognormal per path (median + P95); P50/P95 of the mix on Playback SLO")
+
+R += 1  # 161 — Derived: playback availability
+sc(ws, R, 2, "Playback availability (with Azure mirror)", font=normal_font, border=thin_border)
+formula(ws, R, 3, "=1-C152*(1-C159)", normal_font, '0.000%')
+
+# ════════════════════════════════════════════════════════════════════════════
+# SECTION: GETCHARM METADATA CACHE  (rows 163-175)
+# ════════════════════════════════════════════════════════════════════════════
+R = 163
+sc(ws, R, 2, "GETCHARM METADATA CACHE (edge / in-process)", font=section_font)
+note(ws, R, 6, "Cache hits skip the GetCharm Function and its Table reads (rows 22/27)")
+
+R += 1  # 164
+section_header(ws, R, 2, 4, ["Parameter", "Value", "Unit"])
+
+R += 1  # 165
+sc(ws, R, 2, "Cache enabled (1 = yes, 0 = no)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 1, num_fmt)
+
+R += 1  # 166
+sc(ws, R, 2, "Cache TTL", font=normal_font, border=thin_border)
+inp(ws, R, 3, 6, num_fmt)
+note(ws, R, 4, "hours")
+
+R += 1  # 167
+sc(ws, R, 2, "Edge PoPs serving one charm's viewers", font=normal_font, border=thin_border)
+inp(ws, R, 3, 3, num_fmt)
+note(ws, R, 6, "Each PoP caches separately; use 1 for a single in-process cache")
+
+R += 1  # 168
+sc(ws, R, 2, "Repeat scans within a session (% of views)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 0.35, pct_fmt)
+note(ws, R, 6, "Re-tap / replay within minutes — always a hit when the cache is on")
+
+R += 1  # 169
+sc(ws, R, 2, "Edits per charm per month (invalidate on edit)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 0.2, num_2dp)
+note(ws, R, 4, "purges/charm/month")
+
+R += 1  # 170
+sc(ws, R, 2, "Cache capacity per PoP", font=normal_font, border=thin_border)
+inp(ws, R, 3, 100000, num_fmt)
+note(ws, R, 4, "charm entries")
+note(ws, R, 6, "~2 KB each; hit ratio scales down once active charms exceed this")
+
+R += 1  # 171
+sc(ws, R, 2, "Metadata latency — cache hit", font=normal_font, border=thin_border)
+inp(ws, R, 3, 20, num_fmt)
+note(ws, R, 4, "ms")
+
+R += 1  # 172
+sc(ws, R, 2, "Metadata latency — GetCharm origin (Function + Table)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 180, num_fmt)
+note(ws, R, 4, "ms")
+
+
+def cache_hit_formula(views):
+    """Hit ratio for a charm with `views`/month: session repeats + Poisson arrivals per PoP over a TTL cut short by edits."""
+    lam = f"(1-C168)*{views}/720/C167"
+    window = "IF(C169>0,(1-EXP(-C169/720*C166))/(C169/720),C166)"
+    return f"=C168+(1-C168)*{lam}*{window}/(1+{lam}*{window})"
+
+
+R += 1  # 173 — Derived: hit ratio for novelty charms
+sc(ws, R, 2, "Hit ratio — charm in first 3 months (C38 views)", font=normal_font, border=thin_border)
+formula(ws, R, 3, cache_hit_formula("C38"), normal_font, pct_fmt)
+
+R += 1  # 174 — Derived: hit ratio for long-tail charms
+sc(ws, R, 2, "Hit ratio — long-tail charm (C39 views)", font=normal_font, border=thin_border)
+formula(ws, R, 3, cache_hit_formula("C39"), normal_font, pct_fmt)
+
+R += 1  # 175 — Derived: year-weighted per-charm hit ratio
+sc(ws, R, 2, "PER-CHARM CACHE HIT RATIO (year-weighted)", font=bold_font, border=thin_border)
+formula(ws, R, 3, "=C165*(C38*3*C173+C39*9*C174)/MAX(1,C38*3+C39*9)", bold_font, pct_fmt)
+note(ws, R, 6, "Used on Per-Charm Costs; Projections blend by fleet age and capacity")
+
+# ════════════════════════════════════════════════════════════════════════════
+# SECTION: TABLE WRITE BATCHING  (rows 177-187)
+# ════════════════════════════════════════════════════════════════════════════
+R = 177
+sc(ws, R, 2, "TABLE WRITE BATCHING (entity group transactions)", font=section_font)
+note(ws, R, 6, "One EGT commits up to 100 entities in the same partition as a single transaction")
+
+R += 1  # 178
+section_header(ws, R, 2, 4, ["Parameter", "Value", "Unit"])
+
+R += 1  # 179
+sc(ws, R, 2, "Batching enabled (1 = yes, 0 = no)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 1, num_fmt)
+
+R += 1  # 180
+sc(ws, R, 2, "Max entities per batch", font=normal_font, border=thin_border)
+inp(ws, R, 3, 100, num_fmt)
+note(ws, R, 6, "Azure Table EGT limit is 100 entities / 4 MB")
+
+R += 1  # 181
+sc(ws, R, 2, "Setup writes sharing one partition (of C42)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 5, num_fmt)
+note(ws, R, 6, "Charm entity + request log rows keyed by charm; user-charm / profile differ")
+
+R += 1  # 182
+sc(ws, R, 2, "Glyph-attempt log flush interval", font=normal_font, border=thin_border)
+inp(ws, R, 3, 5, num_fmt)
+note(ws, R, 4, "seconds")
+note(ws, R, 6, "Buffer flushes when full or on this timer, whichever comes first")
+
+R += 1  # 183
+sc(ws, R, 2, "Function instances buffering logs", font=normal_font, border=thin_border)
+inp(ws, R, 3, 4, num_fmt)
+note(ws, R, 6, "Each instance fills its own batch — splits the arrival stream")
+
+R += 1  # 184
+sc(ws, R, 2, "Table write latency — single entity", font=normal_font, border=thin_border)
+inp(ws, R, 3, 25, num_fmt)
+note(ws, R, 4, "ms")
+
+R += 1  # 185
+sc(ws, R, 2, "Table write latency — entity group transaction", font=normal_font, border=thin_border)
+inp(ws, R, 3, 40, num_fmt)
+note(ws, R, 4, "ms")
+
+R += 1  # 186 — Derived: setup transactions per charm
+sc(ws, R, 2, "TABLE SETUP TRANSACTIONS PER CHARM", font=bold_font, border=thin_border)
+formula(ws, R, 3, "=IF(C179=1,C42-C181+CEILING(C181/C180,1),C42)", bold_font, num_fmt)
+note(ws, R, 6, "Replaces C42 in Projections row 27 and Per-Charm setup cost")
+
+R += 1  # 187 — Derived: claim setup write latency
+sc(ws, R, 2, "Claim setup write latency (sequential)", font=normal_font, border=thin_border)
+formula(ws, R, 3, "=IF(C179=1,(C42-C181)*C184+CEILING(C181/C180,1)*C185,C42*C184)", normal_font, num_fmt)
+note(ws, R, 4, "ms")
+
+# ════════════════════════════════════════════════════════════════════════════
+# SECTION: FUNCTIONS HOSTING PLAN COMPARISON  (rows 189-204)
+# ════════════════════════════════════════════════════════════════════════════
+R = 189
+sc(ws, R, 2, "AZURE FUNCTIONS — HOSTING PLAN COMPARISON", font=section_font)
+note(ws, R, 6, "Same invocation load as row 22 priced on Premium and Flex; Consumption stays in row 41")
+
+R += 1  # 190
+section_header(ws, R, 2, 4, ["Parameter", "Value", "Unit"])
+
+R += 1  # 191
+sc(ws, R, 2, "Idle time before scale-to-zero", font=normal_font, border=thin_border)
+inp(ws, R, 3, 20, num_fmt)
+note(ws, R, 4, "minutes")
+note(ws, R, 6, "A call after this much idle time lands on a cold instance")
+
+R += 1  # 192
+sc(ws, R, 2, "Consumption cold-start latency", font=normal_font, border=thin_border)
+inp(ws, R, 3, 3000, num_fmt)
+note(ws, R, 4, "ms")
+
+R += 1  # 193
+sc(ws, R, 2, "Premium EP1 instance (1 vCPU / 3.5 GB)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 157.68, currency_fmt)
+note(ws, R, 4, "$/instance/month")
+
+R += 1  # 194
+sc(ws, R, 2, "Premium pre-warmed (minimum) instances", font=normal_font, border=thin_border)
+inp(ws, R, 3, 1, num_fmt)
+
+R += 1  # 195
+sc(ws, R, 2, "Concurrent executions per instance", font=normal_font, border=thin_border)
+inp(ws, R, 3, 50, num_fmt)
+note(ws, R, 6, "I/O-bound lookups; sets Premium scale-out")
+
+R += 1  # 196
+sc(ws, R, 2, "Peak-to-average load ratio", font=normal_font, border=thin_border)
+inp(ws, R, 3, 4, num_1dp)
+
+R += 1  # 197
+sc(ws, R, 2, "Flex Consumption: executions (per 1,000,000)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 0.40, currency_fmt)
+
+R += 1  # 198
+sc(ws, R, 2, "Flex Consumption: on-demand compute (per GB-second)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 0.000026, '$#,##0.000000')
+
+R += 1  # 199
+sc(ws, R, 2, "Flex Consumption: instance memory", font=normal_font, border=thin_border)
+inp(ws, R, 3, 2048, num_fmt)
+note(ws, R, 4, "MB")
+note(ws, R, 6, "Billed on instance memory, not per-function allocation")
+
+R += 1  # 200
+sc(ws, R, 2, "Flex free executions (per month)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 250000, num_fmt)
+
+R += 1  # 201
+sc(ws, R, 2, "Flex free GB-seconds (per month)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 100000, num_fmt)
+
+R += 1  # 202
+sc(ws, R, 2, "Flex always-ready instances", font=normal_font, border=thin_border)
+inp(ws, R, 3, 0, num_fmt)
+note(ws, R, 6, "0 = pure on-demand (cold starts); 1+ = baseline charge, no cold starts")
+
+R += 1  # 203
+sc(ws, R, 2, "Flex always-ready baseline (per GB-second)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 0.000004, '$#,##0.000000')
+
+R += 1  # 204
+sc(ws, R, 2, "Flex cold-start latency", font=normal_font, border=thin_border)
+inp(ws, R, 3, 1000, num_fmt)
+note(ws, R, 4, "ms")
+
+# ════════════════════════════════════════════════════════════════════════════
+# SECTION: SCALE LIMITS & STRESS TEST  (rows 206-214)
+# ════════════════════════════════════════════════════════════════════════════
+R = 206
+sc(ws, R, 2, "SCALE LIMITS & STRESS TEST", font=section_font)
+note(ws, R, 6, "Projections rows 151-159 compare peak rates with these; Scale Limits sheet runs 10x-1000x")
+
+R += 1  # 207
+section_header(ws, R, 2, 4, ["Parameter", "Value", "Unit"])
+
+R += 1  # 208
+sc(ws, R, 2, "Stress multiplier on launch sales (C18-C20)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 1, num_fmt)
+note(ws, R, 4, "x")
+note(ws, R, 6, "1 = normal; set 10 / 100 / 1000 to stress the whole workbook")
+
+R += 1  # 209
+sc(ws, R, 2, "Table partition throughput target", font=normal_font, border=thin_border)
+inp(ws, R, 3, 2000, num_fmt)
+note(ws, R, 4, "entities/s")
+note(ws, R, 6, "Per partition; single-table layout puts rate-limit + log rows in hot partitions")
+
+R += 1  # 210
+sc(ws, R, 2, "Table account throughput target", font=normal_font, border=thin_border)
+inp(ws, R, 3, 20000, num_fmt)
+note(ws, R, 4, "txns/s")
+
+R += 1  # 211
+sc(ws, R, 2, "Hottest partition share of Table transactions", font=normal_font, border=thin_border)
+inp(ws, R, 3, 0.10, pct_fmt)
+
+R += 1  # 212
+sc(ws, R, 2, "Consumption plan max scale-out", font=normal_font, border=thin_border)
+inp(ws, R, 3, 200, num_fmt)
+note(ws, R, 4, "instances")
+note(ws, R, 6, "Windows Consumption; Linux is 100")
+
+R += 1  # 213
+sc(ws, R, 2, "R2 bucket write rate (planning limit)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 1000, num_fmt)
+note(ws, R, 4, "Class A ops/s")
+note(ws, R, 6, "Sustained rate we plan to stay under before sharding buckets")
+
+R += 1  # 214
+sc(ws, R, 2, "R2 bucket read rate (planning limit)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 10000, num_fmt)
+note(ws, R, 4, "Class B ops/s")
+
+# ════════════════════════════════════════════════════════════════════════════
+# SECTION: CONTENT SIZE DISTRIBUTIONS  (rows 216-221)
+# ════════════════════════════════════════════════════════════════════════════
+R = 216
+sc(ws, R, 2, "CONTENT SIZE DISTRIBUTIONS (lognormal, capped at upload limit)", font=section_font)
+note(ws, R, 9, "Uploads over the cap are trimmed to fit, so the mean is E[min(size, cap)]")
+
+R += 1  # 217
+section_header(ws, R, 2, 8, ["Media Type", "Median MB", "Sigma (log)", "% Hitting Cap",
+                             "Mean MB (capped)", "P95 MB", "Uncapped Mean MB"])
+
+
+def capped_mean_formula(r):
+    """E[min(X, cap)] for lognormal X with median C{r}, sigma D{r}."""
+    return (f"=C{r}*EXP(D{r}^2/2)*NORMSDIST((LN(C221/C{r})-D{r}^2)/D{r})"
+            f"+C221*(1-NORMSDIST(LN(C221/C{r})/D{r}))")
+
+
+for r, label, median, sigma, src in [
+        (218, "Video", 42, 0.80, "iPhone clips: HEVC ~20 MB to H.264/4K ~65 MB+ for 30 s"),
+        (219, "Image gallery (all images)", 12, 0.70, "Gallery total; 1-20 photos at 2.5-4 MB"),
+        (220, "Audio", 4.5, 0.75, "Voice notes to full songs")]:
+    R = r
+    sc(ws, R, 2, label, font=normal_font, border=thin_border)
+    inp(ws, R, 3, median, num_1dp)
+    inp(ws, R, 4, sigma, num_2dp)
+    formula(ws, R, 5, f"=1-NORMSDIST(LN(C221/C{r})/D{r})", normal_font, '0.00%')
+    formula(ws, R, 6, capped_mean_formula(r), bold_font, num_2dp)
+    formula(ws, R, 7, f"=MIN(C221,C{r}*EXP(1.645*D{r}))", normal_font, num_1dp)
+    formula(ws, R, 8, f"=C{r}*EXP(D{r}^2/2)", normal_font, num_2dp)
+    note(ws, R, 9, src)
+
+R = 221
+sc(ws, R, 2, "Upload size cap (API limit)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 150, num_fmt)
+note(ws, R, 4, "MB")
+
+# ════════════════════════════════════════════════════════════════════════════
+# SECTION: PER-MEDIA REQUEST SHAPE  (rows 223-232)
+# ════════════════════════════════════════════════════════════════════════════
+R = 223
+sc(ws, R, 2, "PER-MEDIA REQUEST SHAPE", font=section_font)
+note(ws, R, 6, "Drives the per-type streams in Projections rows 163-177 (R2 reads row 24, bandwidth row 28)")
+
+R += 1  # 224
+section_header(ws, R, 2, 5, ["Parameter", "Video", "Gallery", "Audio"])
+
+R += 1  # 225
+sc(ws, R, 2, "Relative view rate (1.0 = average)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 1.0, num_2dp); inp(ws, R, 4, 1.3, num_2dp); inp(ws, R, 5, 0.7, num_2dp)
+note(ws, R, 6, "Galleries get browsed more often; audio less")
+
+R += 1  # 226
+sc(ws, R, 2, "Objects stored per charm", font=normal_font, border=thin_border)
+inp(ws, R, 3, 1, num_fmt); formula(ws, R, 4, "=C110", normal_font, num_fmt); inp(ws, R, 5, 1, num_fmt)
+
+R += 1  # 227
+sc(ws, R, 2, "Share of content fetched per view", font=normal_font, border=thin_border)
+inp(ws, R, 3, 0.70, pct_fmt); inp(ws, R, 4, 1.0, pct_fmt); inp(ws, R, 5, 0.80, pct_fmt)
+note(ws, R, 6, "Partial video watches; every gallery image loads")
+
+R += 1  # 228
+sc(ws, R, 2, "MB per GET (range request / image)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 4, num_1dp); formula(ws, R, 4, "=C30/C110", normal_font, num_1dp); inp(ws, R, 5, 2, num_1dp)
+note(ws, R, 6, "Players stream video/audio as byte ranges; galleries GET each image")
+
+R += 1  # 229 — Derived: share of views
+sc(ws, R, 2, "Share of views", font=normal_font, border=thin_border)
+mix_weight = "(C225*D29+D225*D30+E225*D31)"
+formula(ws, R, 3, f"=C225*D29/{mix_weight}", normal_font, pct_fmt)
+formula(ws, R, 4, f"=D225*D30/{mix_weight}", normal_font, pct_fmt)
+formula(ws, R, 5, f"=E225*D31/{mix_weight}", normal_font, pct_fmt)
+
+R += 1  # 230 — Derived: MB delivered per view
+sc(ws, R, 2, "MB delivered per view", font=normal_font, border=thin_border)
+formula(ws, R, 3, "=C29*C227*IF($C$236=1,C241,1)", normal_font, num_2dp)
+formula(ws, R, 4, "=C30*D227*IF($C$236=1,D241,1)", normal_font, num_2dp)
+formula(ws, R, 5, "=C31*E227*IF($C$236=1,E241,1)", normal_font, num_2dp)
+
+R += 1  # 231 — Derived: R2 Class B GETs per view
+sc(ws, R, 2, "R2 GETs per view", font=normal_font, border=thin_border)
+formula(ws, R, 3, "=MAX(1,ROUNDUP(C230/C228,0))", normal_font, num_fmt)
+formula(ws, R, 4, "=MAX(1,ROUNDUP(D226*D227,0))", normal_font, num_fmt)
+formula(ws, R, 5, "=MAX(1,ROUNDUP(E230/E228,0))", normal_font, num_fmt)
+
+R += 1  # 232 — Derived: blended GETs per view
+sc(ws, R, 2, "BLENDED R2 GETs PER VIEW", font=bold_font, border=thin_border)
+formula(ws, R, 3, "=C229*C231+D229*D231+E229*E231", bold_font, num_2dp)
+note(ws, R, 6, "Used on Per-Charm Costs (was 1 GET per view)")
+
+# ════════════════════════════════════════════════════════════════════════════
+# SECTION: SERVER-SIDE RECOMPRESSION  (rows 234-244)
+# ════════════════════════════════════════════════════════════════════════════
+R = 234
+sc(ws, R, 2, "SERVER-SIDE RECOMPRESSION (optional transcoding stage)", font=section_font)
+note(ws, R, 6, "H.264 -> HEVC, JPEG -> HEIF, WAV -> AAC after upload; stored size drives rows 14-17 and 31-39")
+
+R += 1  # 235
+section_header(ws, R, 2, 5, ["Parameter", "Video", "Gallery", "Audio"])
+
+R += 1  # 236
+sc(ws, R, 2, "Recompression enabled (1 = yes, 0 = no)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 0, num_fmt)
+note(ws, R, 6, "Off by default — the Recompression sheet compares on vs off")
+
+R += 1  # 237
+sc(ws, R, 2, "Output / input size ratio", font=normal_font, border=thin_border)
+inp(ws, R, 3, 0.45, pct_fmt); inp(ws, R, 4, 0.55, pct_fmt); inp(ws, R, 5, 0.60, pct_fmt)
+note(ws, R, 6, "HEVC ~45% of H.264 at equal quality; HEIF ~50-60% of JPEG")
+
+R += 1  # 238
+sc(ws, R, 2, "Eligible share of uploads", font=normal_font, border=thin_border)
+inp(ws, R, 3, 0.50, pct_fmt); inp(ws, R, 4, 0.60, pct_fmt); inp(ws, R, 5, 0.30, pct_fmt)
+note(ws, R, 6, "Already-HEVC/HEIF/AAC uploads are left alone")
+
+R += 1  # 239
+sc(ws, R, 2, "Compute per MB processed", font=normal_font, border=thin_border)
+inp(ws, R, 3, 1.2, num_2dp); inp(ws, R, 4, 0.15, num_2dp); inp(ws, R, 5, 0.05, num_2dp)
+note(ws, R, 6, "vCPU-seconds per input MB (CPU ffmpeg / libheif)")
+
+R += 1  # 240
+sc(ws, R, 2, "vCPU-second price", font=normal_font, border=thin_border)
+inp(ws, R, 3, 0.000024, '$#,##0.000000')
+note(ws, R, 6, "Container Apps consumption vCPU-s")
+
+R += 1  # 241 — Derived: stored-size factor per type
+sc(ws, R, 2, "Stored size factor after recompression", font=normal_font, border=thin_border)
+for col in "CDE":
+    formula(ws, R, "CDE".index(col) + 3, f"=1-{col}238*(1-{col}237)", normal_font, pct_fmt)
+
+R += 1  # 242 — Derived: compute cost per charm per type
+sc(ws, R, 2, "Transcoding compute per charm", font=normal_font, border=thin_border)
+for col, size_row in (("C", 29), ("D", 30), ("E", 31)):
+    formula(ws, R, "CDE".index(col) + 3, f"=C{size_row}*{col}238*{col}239*$C$240", normal_font, currency_micro)
+
+R += 1  # 243 — Derived: stored MB per charm
+sc(ws, R, 2, "STORED MB PER CHARM (after recompression)", font=bold_font, border=thin_border)
+formula(ws, R, 3, "=IF(C236=1,D29*C29*C241+D30*C30*D241+D31*C31*E241,C33)", bold_font, num_2dp)
+note(ws, R, 6, "Replaces C33 wherever stored or re-served bytes are priced")
+
+R += 1  # 244 — Derived: compute per upload
+sc(ws, R, 2, "Transcoding compute per upload", font=normal_font, border=thin_border)
+formula(ws, R, 3, "=IF(C236=1,D29*C242+D30*D242+D31*E242,0)", normal_font, currency_micro)
+
+# ════════════════════════════════════════════════════════════════════════════
+# SECTION: HOSTING OBLIGATION NPV  (rows 246-256)
+# ════════════════════════════════════════════════════════════════════════════
+R = 246
+sc(ws, R, 2, "HOSTING OBLIGATION NPV (discounting + price declines)", font=section_font)
+note(ws, R, 6, "Replaces flat-price x lifetime on Per-Charm Costs rows 112-120 and Revenue Recognition rows 65-66")
+
+R += 1  # 247
+sc(ws, R, 2, "Discount rate (annual)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 0.08, pct_fmt)
+note(ws, R, 6, "Cost of capital for money held against future hosting")
+
+R += 1  # 248
+section_header(ws, R, 2, 4, ["Service Group", "Price Decline / Year", "PV Factor / Month"])
+
+for label, decline, why in [
+    ("Storage (R2 + Blob + Table entities)", 0.05, "Historic $/GB-month declines on object storage"),
+    ("Operations (reads / writes / txns)", 0.02, "Per-op prices move slowly"),
+    ("Bandwidth & retrieval", 0.03, "R2 egress is free; Azure egress drifts down"),
+    ("Compute (Functions)", 0.03, "Per-GB-s and per-execution rates"),
+    ("Authentication (CIAM MAU)", 0.00, "Flat — priced per MAU, no history of cuts"),
+]:
+    R += 1  # 249-253
+    sc(ws, R, 2, label, font=normal_font, border=thin_border)
+    inp(ws, R, 3, decline, pct_fmt)
+    formula(ws, R, 4, f"=((1-C{R})/(1+$C$247))^(1/12)", normal_font, '0.000000')
+    note(ws, R, 6, why)
+
+R += 1  # 254
+sc(ws, R, 2, "Monte Carlo: decline std dev (annual)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 0.02, pct_fmt)
+note(ws, R, 6, "Per service group, independent draws (Obligation NPV sheet)")
+
+R += 1  # 255
+sc(ws, R, 2, "Monte Carlo: discount rate std dev", font=normal_font, border=thin_border)
+inp(ws, R, 3, 0.02, pct_fmt)
+
+R += 1  # 256
+sc(ws, R, 2, "Monte Carlo: draws", font=normal_font, border=thin_border)
+inp(ws, R, 3, 2000, num_fmt)
+note(ws, R, 6, "Evaluated at build time; not used by sheet formulas")
+
+# ════════════════════════════════════════════════════════════════════════════
+# SECTION: RETURN ARRIVAL LAG  (rows 258-264)
+# ════════════════════════════════════════════════════════════════════════════
+R = 258
+sc(ws, R, 2, "RETURN ARRIVAL LAG (share of a month's returns arriving k months later)", font=section_font)
+note(ws, R, 6, "Convolved over charm sales on Projections rows 89-90; refunds, dead stock and reversals follow")
+
+R += 1  # 259
+section_header(ws, R, 2, 4, ["Months After Sale", "Pre-Claim", "Post-Claim"])
+
+for lag, pre, post, why in [
+    (0, 0.70, 0.35, "Days 0-30: unopened gifts sent back early"),
+    (1, 0.25, 0.45, "Days 31-60: post-claim returns follow setup trouble"),
+    (2, 0.05, 0.20, "Days 61-90: tail inside the extended holiday window"),
+]:
+    R += 1  # 260-262
+    sc(ws, R, 2, lag, font=normal_font, number_format=num_fmt, border=thin_border)
+    inp(ws, R, 3, pre, pct_fmt); inp(ws, R, 4, post, pct_fmt)
+    note(ws, R, 6, why)
+
+R += 1  # 263
+sc(ws, R, 2, "Check (must be 100%)", font=bold_font, border=thin_border)
+formula(ws, R, 3, "=SUM(C260:C262)", bold_font, pct_fmt)
+formula(ws, R, 4, "=SUM(D260:D262)", bold_font, pct_fmt)
+note(ws, R, 6, "Put 100% in the 0 row to return to same-month returns")
+
+# ════════════════════════════════════════════════════════════════════════════
+# SECTION: RUG CHARM LINE  (rows 265-279) — second product on shared infra
+# ════════════════════════════════════════════════════════════════════════════
+R = 265
+sc(ws, R, 2, "RUG CHARM LINE (Tapis Décor provenance charms)", font=section_font)
+note(ws, R, 7, "Replaces rows 6-8, 18-20, 23-25, 29-31, 34, 38-39, 85-86 for this product; cloud pricing is shared")
+
+R += 1  # 266
+section_header(ws, R, 2, 6, ["Tier", "Unit Price", "COGS / Unit", "Units / Month", "MoM Growth %"])
+
+for label, price, cogs, units, growth in [
+    ("10-Year Provenance Charm", 39.00, 11.00, 10, 0.05),
+    ("15-Year Provenance Charm", 59.00, 11.00, 20, 0.06),
+    ("Heirloom (Perpetual) Provenance Charm", 99.00, 12.00, 30, 0.08),
+]:
+    R += 1  # 267-269
+    sc(ws, R, 2, label, font=normal_font, border=thin_border)
+    inp(ws, R, 3, price, currency_fmt); inp(ws, R, 4, cogs, currency_fmt)
+    inp(ws, R, 5, units, num_fmt); inp(ws, R, 6, growth, pct_fmt)
+
+R += 1  # 270
+section_header(ws, R, 2, 5, ["Content & Engagement", "Video", "Gallery", "Audio"])
+
+R += 1  # 271
+sc(ws, R, 2, "Media mix (% of rug charms)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 0.30, pct_fmt); inp(ws, R, 4, 0.65, pct_fmt); inp(ws, R, 5, 0.05, pct_fmt)
+note(ws, R, 7, "12-step provenance gallery is the default; artisan video optional")
+
+for label, value, fmt, why in [
+    ("Claim rate", 0.95, pct_fmt, "Dealer claims at point of sale"),
+    ("Avg views per charm per month (first 3 months)", 4, num_fmt, "Buyer shows off a new rug"),
+    ("Avg views per charm per month (after 3 months)", 1, num_fmt, "Occasional look-up; resale checks"),
+    ("Extend Memory attach (monthly % of base)", 0.005, pct_fmt, None),
+    ("Upgrade Tier attach (monthly % of base)", 0.00, pct_fmt, None),
+    ("Gift Wrap attach (% of new sales)", 0.00, pct_fmt, "Ships with the rug"),
+]:
+    R += 1  # 272-277
+    sc(ws, R, 2, label, font=normal_font, border=thin_border)
+    inp(ws, R, 3, value, fmt)
+    if why:
+        note(ws, R, 7, why)
+
+R += 1  # 278
+sc(ws, R, 2, "Trade marketing (monthly, MoM growth)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 300, currency_whole); inp(ws, R, 4, 0.04, pct_fmt)
+note(ws, R, 7, "Dealer kits and trade shows — replaces C85:D85 for this line")
+
+R += 1  # 279
+sc(ws, R, 2, "Fulfillment per charm (attached by dealer)", font=normal_font, border=thin_border)
+inp(ws, R, 3, 1.00, currency_fmt)
+note(ws, R, 7, "Bulk-shipped to dealers; replaces C86")
+
+R = 281
+sc(ws, R, 2, "RUG CHARM SCENARIOS (Base Case = rows 267-269)", font=section_font)
+note(ws, R, 9, "Swapped into rows 267-269 for the Conservative / Optimistic runs (financial_engine.SCENARIOS)")
+
+R += 1  # 282
+section_header(ws, R, 2, 8, ["Tier", "Price (Cons.)", "Price (Opt.)", "Units/Mo (Cons.)", "Units/Mo (Opt.)",
+                             "MoM Growth (Cons.)", "MoM Growth (Opt.)"])
+
+for label, prices, units, growth in [
+    ("10-Year Provenance Charm", (34.00, 45.00), (5, 20), (0.03, 0.08)),
+    ("15-Year Provenance Charm", (49.00, 69.00), (10, 40), (0.04, 0.09)),
+    ("Heirloom (Perpetual) Provenance Charm", (89.00, 119.00), (15, 60), (0.05, 0.12)),
+]:
+    R += 1  # 283-285
+    sc(ws, R, 2, label, font=normal_font, border=thin_border)
+    inp(ws, R, 3, prices[0], currency_fmt); inp(ws, R, 4, prices[1], currency_fmt)
+    inp(ws, R, 5, units[0], num_fmt); inp(ws, R, 6, units[1], num_fmt)
+    inp(ws, R, 7, growth[0], pct_fmt); inp(ws, R, 8, growth[1], pct_fmt)
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # SHEET 2: 24-MONTH PROJECTIONS
@@ -603,15 +1423,15 @@ R = 5; sc(ws2, R, 2, "UNIT SALES", font=section_font)
 
 # Row 6: 10-Year sold
 R = 6; proj_row(ws2, R, "10-Year Charms Sold")
-proj_formula(ws2, R, lambda m,col,c,p: f"={ASM}!C18" if m==1 else f"=ROUND({p}{R}*(1+{ASM}!D18),0)")
+proj_formula(ws2, R, lambda m,col,c,p: f"=ROUND({ASM}!C18*{ASM}!C208,0)" if m==1 else f"=ROUND({p}{R}*(1+{ASM}!D18),0)")
 
 # Row 7: 15-Year sold
 R = 7; proj_row(ws2, R, "15-Year Charms Sold")
-proj_formula(ws2, R, lambda m,col,c,p: f"={ASM}!C19" if m==1 else f"=ROUND({p}{R}*(1+{ASM}!D19),0)")
+proj_formula(ws2, R, lambda m,col,c,p: f"=ROUND({ASM}!C19*{ASM}!C208,0)" if m==1 else f"=ROUND({p}{R}*(1+{ASM}!D19),0)")
 
 # Row 8: Perpetual sold
 R = 8; proj_row(ws2, R, "Retail (Perpetual) Charms Sold")
-proj_formula(ws2, R, lambda m,col,c,p: f"={ASM}!C20" if m==1 else f"=ROUND({p}{R}*(1+{ASM}!D20),0)")
+proj_formula(ws2, R, lambda m,col,c,p: f"=ROUND({ASM}!C20*{ASM}!C208,0)" if m==1 else f"=ROUND({p}{R}*(1+{ASM}!D20),0)")
 
 # Row 9: Total monthly
 R = 9; proj_row(ws2, R, "Total Charms Sold (Month)", bold_font, fill_=blue_fill)
@@ -631,7 +1451,7 @@ R = 13; sc(ws2, R, 2, "STORAGE VOLUME", font=section_font)
 # Row 14: New content uploaded this month (GB)
 R = 14; proj_row(ws2, R, "New Content Uploaded (GB)")
 proj_formula(ws2, R,
-    lambda m,col,c,p: f"=ROUND({c}9*{ASM}!C34*{ASM}!C33/1024,2)",
+    lambda m,col,c,p: f"=ROUND({c}9*{ASM}!C34*{ASM}!C243/1024,2)",
     fmt=num_2dp)
 note(ws2, R, 2, None)  # label already set
 
@@ -677,67 +1497,71 @@ proj_formula(ws2, R, lambda m,col,c,p: f"=ROUND({c}20*{ASM}!C40,0)")
 
 # Row 22: Total Azure Functions invocations
 R = 22; proj_row(ws2, R, "Total Azure Functions Invocations", bold_font)
-# = (new charms * lifecycle calls) + (views * 1 GetCharm call each) + (glyph calls) + (admin overhead ~2%)
+# = (new charms * lifecycle calls) + (uncached views * 1 GetCharm call each) + (glyph calls) + (admin overhead ~2%)
 proj_formula(ws2, R,
-    lambda m,col,c,p: f"=ROUND(({c}9*{ASM}!C34*{ASM}!C41)+{c}20+{c}21+({c}20*0.02),0)",
+    lambda m,col,c,p: f"=ROUND(({c}9*{ASM}!C34*{ASM}!C41)+({c}20-{c}125)+{c}21+({c}20*0.02),0)",
     font_=bold_font)
 
 # Row 23: R2 write operations (Class A) — initial upload + re-uploads
-R = 23; proj_row(ws2, R, "R2 Class A Ops (Writes)")
-# Each claimed charm = ~2 writes (PUT blob + list verify). Re-uploads add more.
+R = 23; proj_row(ws2, R, "R2 Class A Ops (Writes — parts + retries)")
+# Each upload = multipart parts + retries + list verify (Assumptions C114). Re-uploads add more.
 proj_formula(ws2, R,
-    lambda m,col,c,p: f"=ROUND({c}9*{ASM}!C34*2*(1+{ASM}!C35),0)")
+    lambda m,col,c,p: f"=ROUND({c}9*{ASM}!C34*{ASM}!C118*{ASM}!C114,0)")
 
 # Row 24: R2 read operations (Class B) — every playback view
 R = 24; proj_row(ws2, R, "R2 Class B Ops (Reads / Playback)")
-proj_formula(ws2, R, lambda m,col,c,p: f"={c}20")
+# Sum of the per-type GETs (rows 166/171/176): ranges for video/audio, one GET per gallery image
+proj_formula(ws2, R, lambda m,col,c,p: f"={c}166+{c}171+{c}176")
 
-# Row 25: Azure Blob write operations (mirror of R2 writes)
+# Row 25: Azure Blob write operations (server-side mirror — blocks + commit, no retries)
 R = 25; proj_row(ws2, R, "Azure Blob Write Ops (Backup Uploads)")
-proj_formula(ws2, R, lambda m,col,c,p: f"={c}23")
+proj_formula(ws2, R,
+    lambda m,col,c,p: f"=ROUND({c}9*{ASM}!C34*{ASM}!C118*{ASM}!C115,0)")
 
 # Row 26: Azure Blob read operations (fallback only — small %)
-R = 26; proj_row(ws2, R, "Azure Blob Read Ops (Fallback — est 2%)")
-proj_formula(ws2, R, lambda m,col,c,p: f"=ROUND({c}20*0.02,0)")
+R = 26; proj_row(ws2, R, "Azure Blob Read Ops (Fallback — modeled share)")
+proj_formula(ws2, R, lambda m,col,c,p: f"=ROUND({c}20*{ASM}!C152,0)")
 
 # Row 27: Table Storage transactions
 R = 27; proj_row(ws2, R, "Azure Table Transactions (Total)", bold_font)
-# = (new charms * setup writes) + (all views * reads per view) + (glyph * 2 writes each)
+# = setup txns (row 134) + (uncached views * reads per view) + glyph rate-limit writes + batched glyph logs (row 133)
 proj_formula(ws2, R,
-    lambda m,col,c,p: f"=ROUND({c}9*{ASM}!C34*{ASM}!C42+{c}20*{ASM}!C43+{c}21*2,0)",
+    lambda m,col,c,p: f"=ROUND({c}134+({c}20-{c}125)*{ASM}!C43+{c}21+{c}133,0)",
     font_=bold_font)
 
 # Row 28: Playback bandwidth from R2 (GB)
 R = 28; proj_row(ws2, R, "R2 Playback Bandwidth (GB) — FREE egress")
 proj_formula(ws2, R,
-    lambda m,col,c,p: f"=ROUND({c}20*{ASM}!C33/1024,1)",
+    lambda m,col,c,p: f"=ROUND({c}167+{c}172+{c}177,1)",
     fmt=num_1dp)
 
 # ── INFRASTRUCTURE COSTS (rows 30-42) ───────────────────────────────────────
 R = 30; sc(ws2, R, 2, "INFRASTRUCTURE COST BREAKDOWN", font=section_font)
 
 # Row 31: Azure Blob Cool — Storage
+# Service rows 31-42 use the tiered pricing engine (free band + rate bands per service)
 R = 31; proj_row(ws2, R, "  Azure Blob: Storage Cost")
 proj_formula(ws2, R,
-    lambda m,col,c,p: f"={c}17*{ASM}!C47",
+    lambda m,col,c,p: "=" + tiered_formula("blob_storage", f"{c}17"),
     fmt=currency_fmt)
 
 # Row 32: Azure Blob Cool — Write ops
 R = 32; proj_row(ws2, R, "  Azure Blob: Write Operations")
 proj_formula(ws2, R,
-    lambda m,col,c,p: f"=({c}25/10000)*{ASM}!C48",
+    lambda m,col,c,p: "=" + tiered_formula("blob_writes", f"{c}25"),
     fmt=currency_fmt)
 
 # Row 33: Azure Blob Cool — Read ops (fallback)
 R = 33; proj_row(ws2, R, "  Azure Blob: Read Ops (Fallback)")
 proj_formula(ws2, R,
-    lambda m,col,c,p: f"=({c}26/10000)*{ASM}!C49",
+    lambda m,col,c,p: "=" + tiered_formula("blob_reads", f"{c}26"),
     fmt=currency_fmt)
 
-# Row 34: Azure Blob — Data retrieval (fallback reads)
-R = 34; proj_row(ws2, R, "  Azure Blob: Data Retrieval (Fallback)")
+# Row 34: Azure Blob — Data retrieval + egress (fallback reads; egress after free GB)
+R = 34; proj_row(ws2, R, "  Azure Blob: Retrieval + Egress (Fallback)")
 proj_formula(ws2, R,
-    lambda m,col,c,p: f"=({c}26*{ASM}!C33/1024)*{ASM}!C50",
+    lambda m,col,c,p: ("=" + tiered_formula("blob_retrieval", f"{c}26*{ASM}!C243/1024")
+                       + "+" + tiered_formula("blob_egress", f"{c}26*{ASM}!C243/1024")),
     fmt=currency_fmt)
 
 # Row 35: TOTAL Azure Blob
@@ -749,19 +1573,19 @@ proj_formula(ws2, R,
 # Row 36: R2 — Storage cost (minus free tier)
 R = 36; proj_row(ws2, R, "  R2: Storage Cost")
 proj_formula(ws2, R,
-    lambda m,col,c,p: f"=MAX(0,{c}16-{ASM}!C59)*{ASM}!C55",
+    lambda m,col,c,p: "=" + tiered_formula("r2_storage", f"{c}16"),
     fmt=currency_fmt)
 
 # Row 37: R2 — Class A (writes)
 R = 37; proj_row(ws2, R, "  R2: Class A Ops (Writes)")
 proj_formula(ws2, R,
-    lambda m,col,c,p: f"=MAX(0,{c}23-10000000)*{ASM}!C56/1000000",
+    lambda m,col,c,p: "=" + tiered_formula("r2_class_a", f"{c}23"),
     fmt=currency_fmt)
 
 # Row 38: R2 — Class B (reads/playback)
 R = 38; proj_row(ws2, R, "  R2: Class B Ops (Reads)")
 proj_formula(ws2, R,
-    lambda m,col,c,p: f"=MAX(0,{c}24-10000000)*{ASM}!C57/1000000",
+    lambda m,col,c,p: "=" + tiered_formula("r2_class_b", f"{c}24"),
     fmt=currency_fmt)
 
 # Row 39: TOTAL R2
@@ -774,30 +1598,30 @@ proj_formula(ws2, R,
 R = 40; proj_row(ws2, R, "Azure Table Storage")
 # Storage cost + transaction cost
 proj_formula(ws2, R,
-    lambda m,col,c,p: f"=({c}11*{ASM}!C65/1024/1024)*{ASM}!C63+({c}27/10000)*{ASM}!C64",
+    lambda m,col,c,p: ("=" + tiered_formula("table_storage", f"{c}11*{ASM}!C65/1024/1024")
+                       + "+" + tiered_formula("table_txn", f"{c}27")),
     fmt=currency_fmt)
 
 # Row 41: Azure Functions
 R = 41; proj_row(ws2, R, "Azure Functions (Compute)")
 # Execution cost (above free tier) + GB-seconds cost (above free tier)
 proj_formula(ws2, R,
-    lambda m,col,c,p: (
-        f"=MAX(0,{c}22-{ASM}!C73)/1000000*{ASM}!C69"
-        f"+MAX(0,{c}22*({ASM}!C71/1000)*({ASM}!C72/1024)-{ASM}!C74)*{ASM}!C70"
-    ),
+    lambda m,col,c,p: ("=" + tiered_formula("fn_executions", f"{c}22")
+                       + "+" + tiered_formula("fn_gb_seconds", f"{c}22*({ASM}!C71/1000)*({ASM}!C72/1024)")),
     fmt=currency_fmt)
 
 # Row 42: Other platform (CIAM + DNS + Monitoring)
 R = 42; proj_row(ws2, R, "Other Platform (CIAM + DNS + Monitoring)")
-# CIAM: free up to 50K MAU, then per-MAU. Approximate MAU ≈ active charms * 0.3 (not every charm = unique user)
+# CIAM: free MAU band (C125), then per-MAU. MAU ≈ active charms x C126 (not every charm = unique user)
 proj_formula(ws2, R,
-    lambda m,col,c,p: f"={ASM}!C78+MAX(0,{c}11*0.3-50000)*{ASM}!C79+{ASM}!C80+{ASM}!C81",
+    lambda m,col,c,p: (f"={ASM}!C78+" + tiered_formula("ciam_mau", f"{c}11*{ASM}!C126")
+                       + f"+{ASM}!C80+{ASM}!C81"),
     fmt=currency_fmt)
 
 # Row 43: TOTAL INFRASTRUCTURE
 R = 43; proj_row(ws2, R, "TOTAL INFRASTRUCTURE", bold_font, fill_=red_fill)
 proj_formula(ws2, R,
-    lambda m,col,c,p: f"={c}35+{c}39+{c}40+{c}41+{c}42",
+    lambda m,col,c,p: f"={c}35+{c}39+{c}40+{c}41+{c}42+{c}180",
     fmt=currency_fmt, font_=bold_font, fill_=red_fill)
 
 # ── REVENUE (rows 45-52) ────────────────────────────────────────────────────
@@ -932,17 +1756,24 @@ for m in range(1, 25):
 # ── RETURNS & REPLACEMENTS (rows 87-101) ─────────────────────────────────────
 R = 87; sc(ws2, R, 2, "RETURNS & REPLACEMENTS", font=section_font)
 
-# Row 88: Returned units
+# Row 88: Returned units (arriving this month)
 R = 88; proj_row(ws2, R, "Returned Charms (units)")
-proj_formula(ws2, R, lambda m,col,c,p: f"=ROUND({c}9*{ASM}!C96,0)")
+proj_formula(ws2, R, lambda m,col,c,p: f"={c}89+{c}90")
 
-# Row 89: Of which pre-claim (restockable)
+
+def return_lag_formula(m, share, kernel_col):
+    """Returns arriving in month m: sum over lags k of sales(m-k) x rate x share x kernel(k)."""
+    terms = [f"{get_column_letter(m + 2 - k)}9*{ASM}!{kernel_col}{260 + k}" for k in range(3) if m - k >= 1]
+    return f"=ROUND(({'+'.join(terms)})*{ASM}!C96*{share},0)"
+
+
+# Row 89: Of which pre-claim (restockable) — sales convolved with the pre-claim lag kernel
 R = 89; proj_row(ws2, R, "  Pre-Claim Returns (restockable)")
-proj_formula(ws2, R, lambda m,col,c,p: f"=ROUND({c}88*{ASM}!C97,0)")
+proj_formula(ws2, R, lambda m,col,c,p: return_lag_formula(m, f"{ASM}!C97", "C"))
 
-# Row 90: Of which post-claim (dead stock)
+# Row 90: Of which post-claim (dead stock) — later kernel: claimed first, returned after
 R = 90; proj_row(ws2, R, "  Post-Claim Returns (dead stock)")
-proj_formula(ws2, R, lambda m,col,c,p: f"={c}88-{c}89")
+proj_formula(ws2, R, lambda m,col,c,p: return_lag_formula(m, f"(1-{ASM}!C97)", "D"))
 
 # Row 91: Replacement units (defects)
 R = 91; proj_row(ws2, R, "Replacement Charms Shipped (defects)")
@@ -1048,6 +1879,220 @@ for m in range(1, 25):
 R = 113; proj_row(ws2, R, "Margin Erosion from Returns (% of gross revenue)")
 proj_formula(ws2, R, lambda m,col,c,p: f"=IF({c}52>0,{c}101/{c}52,0)", fmt=pct_fmt)
 
+# ── UPLOAD INGESTION (rows 115-119) ─────────────────────────────────────────
+R = 115; sc(ws2, R, 2, "UPLOAD INGESTION (peak claim hour)", font=section_font)
+
+# Row 116: Uploads this month (claims + re-uploads)
+R = 116; proj_row(ws2, R, "Uploads (claims + re-uploads)")
+proj_formula(ws2, R, lambda m,col,c,p: f"=ROUND({c}9*{ASM}!C34*{ASM}!C118,0)")
+
+# Row 117: Uploads in the peak hour of an average day
+R = 117; proj_row(ws2, R, "Peak-Hour Uploads")
+proj_formula(ws2, R, lambda m,col,c,p: f"={c}116/30*{ASM}!C113", fmt=num_1dp)
+
+# Row 118: Concurrent uploads at peak (Little's law: arrival rate x time in system)
+R = 118; proj_row(ws2, R, "Peak Concurrent Uploads")
+proj_formula(ws2, R, lambda m,col,c,p: f"={c}117/3600*{ASM}!C117", fmt=num_2dp)
+
+# Row 119: Upstream ingest bandwidth needed at peak (Mbps)
+R = 119; proj_row(ws2, R, "Peak Upstream Ingest Bandwidth (Mbps)", bold_font)
+proj_formula(ws2, R, lambda m,col,c,p: f"={c}117*{ASM}!C116*8/3600", fmt=num_2dp, font_=bold_font)
+
+# ── GETCHARM METADATA CACHE (rows 121-128) ──────────────────────────────────
+R = 121; sc(ws2, R, 2, "GETCHARM METADATA CACHE", font=section_font)
+
+# Row 122: Views on charms sold in the last 3 months (same split as row 20)
+R = 122; proj_row(ws2, R, "Views on Charms in First 3 Months")
+proj_formula(ws2, R, lambda m,col,c,p: "=ROUND((" + "+".join(
+    f"{get_column_letter(k)}9" for k in range(max(3, col - 2), col + 1)) + f")*{ASM}!C38,0)")
+
+# Row 123: Share of active charms that fit in each PoP's cache
+R = 123; proj_row(ws2, R, "Cache Capacity Factor")
+proj_formula(ws2, R, lambda m,col,c,p: f"=MIN(1,{ASM}!C170/MAX(1,{c}11))", fmt=pct_fmt)
+
+# Row 124: Blended hit ratio — novelty vs long-tail views; capacity only limits
+# cross-session hits (session repeats are minutes apart and stay resident)
+R = 124; proj_row(ws2, R, "Cache Hit Ratio (blended)", bold_font)
+proj_formula(ws2, R,
+    lambda m,col,c,p: f"=IF({c}20>0,{ASM}!C165*({ASM}!C168+(({c}122*{ASM}!C173+({c}20-{c}122)*{ASM}!C174)/{c}20-{ASM}!C168)*{c}123),0)",
+    fmt=pct_fmt, font_=bold_font)
+
+# Row 125: GetCharm lookups answered by the cache (Function invocations avoided)
+R = 125; proj_row(ws2, R, "GetCharm Calls Served by Cache")
+proj_formula(ws2, R, lambda m,col,c,p: f"=ROUND({c}20*{c}124,0)")
+
+# Row 126: Table reads avoided
+R = 126; proj_row(ws2, R, "Table Transactions Avoided")
+proj_formula(ws2, R, lambda m,col,c,p: f"={c}125*{ASM}!C43")
+
+# Row 127: Average metadata lookup latency per view
+R = 127; proj_row(ws2, R, "Avg Metadata Latency per View (ms)")
+proj_formula(ws2, R, lambda m,col,c,p: f"={c}124*{ASM}!C171+(1-{c}124)*{ASM}!C172", fmt=num_1dp)
+
+# Row 128: Latency saved per view vs no cache
+R = 128; proj_row(ws2, R, "Latency Saved per View (ms)", bold_font)
+proj_formula(ws2, R, lambda m,col,c,p: f"={ASM}!C172-{c}127", fmt=num_1dp, font_=bold_font)
+
+# ── TABLE WRITE BATCHING (rows 130-136) ─────────────────────────────────────
+R = 130; sc(ws2, R, 2, "TABLE WRITE BATCHING", font=section_font)
+
+# Row 131: Glyph-attempt log writes (one per glyph call; rate-limit write stays single)
+R = 131; proj_row(ws2, R, "Glyph Log Writes (entities)")
+proj_formula(ws2, R, lambda m,col,c,p: f"={c}21")
+
+# Row 132: Entities per EGT — what one buffer collects before the flush timer fires
+R = 132; proj_row(ws2, R, "Effective Log Batch Size")
+proj_formula(ws2, R,
+    lambda m,col,c,p: f"=IF({ASM}!C179=1,MAX(1,MIN({ASM}!C180,{c}131/2592000/{ASM}!C183*{ASM}!C182)),1)",
+    fmt=num_1dp)
+
+# Row 133: Log transactions after batching
+R = 133; proj_row(ws2, R, "Glyph Log Transactions (batched)")
+proj_formula(ws2, R, lambda m,col,c,p: f"=ROUND({c}131/{c}132,0)")
+
+# Row 134: Claim setup transactions after batching
+R = 134; proj_row(ws2, R, "Setup Transactions (batched)")
+proj_formula(ws2, R, lambda m,col,c,p: f"=ROUND({c}9*{ASM}!C34*{ASM}!C186,0)")
+
+# Row 135: Table transactions saved vs one write per entity
+R = 135; proj_row(ws2, R, "Table Transactions Saved by Batching", bold_font)
+proj_formula(ws2, R,
+    lambda m,col,c,p: f"=ROUND({c}9*{ASM}!C34*{ASM}!C42,0)+{c}131-{c}134-{c}133",
+    font_=bold_font)
+
+# Row 136: Average time a log entity waits in the buffer (half the fill time)
+R = 136; proj_row(ws2, R, "Avg Log Write Delay (ms)")
+proj_formula(ws2, R,
+    lambda m,col,c,p: f"=IF(AND({ASM}!C179=1,{c}131>0),MIN({ASM}!C182,{ASM}!C180/({c}131/2592000/{ASM}!C183))*1000/2,0)",
+    fmt=num_fmt)
+
+# ── FUNCTIONS HOSTING PLAN COMPARISON (rows 138-148) ────────────────────────
+R = 138; sc(ws2, R, 2, "FUNCTIONS HOSTING PLAN COMPARISON", font=section_font)
+
+# Row 139: Average invocation rate across the app
+R = 139; proj_row(ws2, R, "Invocations per Minute (avg)")
+proj_formula(ws2, R, lambda m,col,c,p: f"={c}22/43200", fmt=num_2dp)
+
+# Row 140: Consumption plan (row 41)
+R = 140; proj_row(ws2, R, "Consumption Plan Cost")
+proj_formula(ws2, R, lambda m,col,c,p: f"={c}41", fmt=currency_fmt)
+
+# Row 141: Premium instances — pre-warmed minimum or peak concurrency / per-instance concurrency
+R = 141; proj_row(ws2, R, "Premium EP1 Instances Needed")
+proj_formula(ws2, R,
+    lambda m,col,c,p: f"=MAX({ASM}!C194,CEILING({c}22/2592000*{ASM}!C196*{ASM}!C71/1000/{ASM}!C195,1))")
+
+# Row 142: Premium plan cost
+R = 142; proj_row(ws2, R, "Premium Plan Cost")
+proj_formula(ws2, R, lambda m,col,c,p: f"={c}141*{ASM}!C193", fmt=currency_fmt)
+
+# Row 143: Flex Consumption cost — executions + on-demand GB-s + always-ready baseline.
+# Flex bills instance memory while any call runs, so concurrent calls share the GB-s
+R = 143; proj_row(ws2, R, "Flex Consumption Plan Cost")
+proj_formula(ws2, R,
+    lambda m,col,c,p: ("=" + tiered_formula("flex_executions", f"{c}22")
+                       + "+" + tiered_formula("flex_gb_seconds",
+                           f"{c}22*({ASM}!C71/1000)*({ASM}!C199/1024)"
+                           f"/MIN({ASM}!C195,MAX(1,{c}22/2592000*{ASM}!C71/1000))")
+                       + f"+{ASM}!C202*{ASM}!C199/1024*2592000*{ASM}!C203"),
+    fmt=currency_fmt)
+
+# Row 144: Cheapest plan this month
+R = 144; proj_row(ws2, R, "Cheapest Plan", bold_font)
+proj_formula(ws2, R,
+    lambda m,col,c,p: f'=IF(AND({c}140<={c}142,{c}140<={c}143),"Consumption",IF({c}142<={c}143,"Premium","Flex"))',
+    fmt="General", font_=bold_font)
+
+# Row 145-146: Probability a call lands on a cold instance (app idle past the timeout)
+R = 145; proj_row(ws2, R, "Cold-Start Probability — Consumption")
+proj_formula(ws2, R, lambda m,col,c,p: f"=EXP(-{c}139*{ASM}!C191)", fmt='0.00%')
+
+R = 146; proj_row(ws2, R, "Cold-Start Probability — Flex")
+proj_formula(ws2, R, lambda m,col,c,p: f"=IF({ASM}!C202>0,0,{c}145)", fmt='0.00%')
+
+# Row 147-148: Expected cold-start latency added per call (Premium is pre-warmed: 0)
+R = 147; proj_row(ws2, R, "Expected Cold-Start ms per Call — Consumption")
+proj_formula(ws2, R, lambda m,col,c,p: f"={c}145*{ASM}!C192", fmt=num_1dp)
+
+R = 148; proj_row(ws2, R, "Expected Cold-Start ms per Call — Flex")
+proj_formula(ws2, R, lambda m,col,c,p: f"={c}146*{ASM}!C204", fmt=num_1dp)
+
+# ── SCALE LIMITS (rows 150-161) ─────────────────────────────────────────────
+R = 150; sc(ws2, R, 2, "SCALE LIMITS (peak rates vs service limits)", font=section_font)
+
+# Rows 151-155: peak-second rates (average month rate x peak-to-average ratio)
+R = 151; proj_row(ws2, R, "Peak Table Transactions / s")
+proj_formula(ws2, R, lambda m,col,c,p: f"={c}27/2592000*{ASM}!C196", fmt=num_1dp)
+
+R = 152; proj_row(ws2, R, "Peak Hot-Partition Entities / s")
+proj_formula(ws2, R, lambda m,col,c,p: f"={c}151*{ASM}!C211", fmt=num_1dp)
+
+R = 153; proj_row(ws2, R, "Peak Functions Instances (Consumption)")
+proj_formula(ws2, R, lambda m,col,c,p: f"=CEILING({c}22/2592000*{ASM}!C196*{ASM}!C71/1000/{ASM}!C195,1)")
+
+# Uploads bunch into the peak claim hour (C113), views follow the peak ratio
+R = 154; proj_row(ws2, R, "Peak R2 Class A Ops / s")
+proj_formula(ws2, R, lambda m,col,c,p: f"={c}23/30*{ASM}!C113/3600", fmt=num_2dp)
+
+R = 155; proj_row(ws2, R, "Peak R2 Class B Ops / s")
+proj_formula(ws2, R, lambda m,col,c,p: f"={c}24/2592000*{ASM}!C196", fmt=num_2dp)
+
+R = 156; proj_row(ws2, R, "CIAM Monthly Active Users")
+proj_formula(ws2, R, lambda m,col,c,p: f"=ROUND({c}11*{ASM}!C126,0)")
+
+R = 157; proj_row(ws2, R, "Functions GB-Seconds")
+proj_formula(ws2, R, lambda m,col,c,p: f"={c}22*({ASM}!C71/1000)*({ASM}!C72/1024)")
+
+# Row 158: hard limits crossed this month (throttling / redesign needed)
+R = 158; proj_row(ws2, R, "Service Limits Exceeded (count)", bold_font)
+proj_formula(ws2, R,
+    lambda m,col,c,p: (f"=({c}152>{ASM}!C209)+({c}151>{ASM}!C210)+({c}153>{ASM}!C212)"
+                       f"+({c}154>{ASM}!C213)+({c}155>{ASM}!C214)"),
+    font_=bold_font)
+
+# Row 159: free allowances used up this month (pricing steps)
+R = 159; proj_row(ws2, R, "Free Tiers Exceeded (count)", bold_font)
+proj_formula(ws2, R,
+    lambda m,col,c,p: (f"=({c}156>{ASM}!C125)+({c}22>{ASM}!C73)+({c}157>{ASM}!C74)"
+                       f"+({c}23>{ASM}!C122)+({c}24>{ASM}!C123)+({c}16>{ASM}!C59)"),
+    font_=bold_font)
+
+# ── PER-MEDIA-TYPE STREAMS (rows 162-177) ───────────────────────────────────
+R = 162; sc(ws2, R, 2, "PER-MEDIA-TYPE STREAMS", font=section_font)
+
+# Five rows per type: stored GB, objects, views, R2 GETs, bandwidth.
+# Size/mix from rows 29-31, request shape from Assumptions columns C/D/E rows 225-231
+for base, label, size_row, shape_col in [(163, "Video", 29, "C"), (168, "Gallery", 30, "D"), (173, "Audio", 31, "E")]:
+    R = base; proj_row(ws2, R, f"{label} — Stored GB (cumulative)")
+    proj_formula(ws2, R,
+        lambda m,col,c,p, sr=size_row, sc_=shape_col, r=base: (
+            f"=ROUND({c}9*{ASM}!C34*{ASM}!D{sr}*{ASM}!C{sr}*IF({ASM}!C236=1,{ASM}!{sc_}241,1)/1024,2)"
+                                                + (f"+{p}{r}" if p else "")),
+        fmt=num_1dp)
+    R = base + 1; proj_row(ws2, R, f"{label} — Objects Stored")
+    proj_formula(ws2, R,
+        lambda m,col,c,p, sr=size_row, sc_=shape_col, r=base + 1: (
+            f"=ROUND({c}9*{ASM}!C34*{ASM}!D{sr},0)*{ASM}!{sc_}226" + (f"+{p}{r}" if p else "")))
+    R = base + 2; proj_row(ws2, R, f"{label} — Views")
+    proj_formula(ws2, R, lambda m,col,c,p, sc_=shape_col: f"=ROUND({c}20*{ASM}!{sc_}229,0)")
+    R = base + 3; proj_row(ws2, R, f"{label} — R2 GETs")
+    proj_formula(ws2, R, lambda m,col,c,p, sc_=shape_col, r=base + 2: f"={c}{r}*{ASM}!{sc_}231")
+    R = base + 4; proj_row(ws2, R, f"{label} — Bandwidth (GB)")
+    proj_formula(ws2, R, lambda m,col,c,p, sc_=shape_col, r=base + 2: f"={c}{r}*{ASM}!{sc_}230/1024", fmt=num_1dp)
+
+# ── RECOMPRESSION (rows 179-181) ────────────────────────────────────────────
+R = 179; sc(ws2, R, 2, "SERVER-SIDE RECOMPRESSION", font=section_font)
+
+# Row 180: One-time transcoding compute for this month's uploads (in TOTAL INFRASTRUCTURE)
+R = 180; proj_row(ws2, R, "Transcoding Compute ($)")
+proj_formula(ws2, R, lambda m,col,c,p: f"={c}116*{ASM}!C244", fmt=currency_fmt)
+
+# Row 181: Stored GB avoided vs keeping originals
+R = 181; proj_row(ws2, R, "Stored GB Avoided (cumulative)")
+proj_formula(ws2, R,
+    lambda m,col,c,p: f"=ROUND({c}9*{ASM}!C34*({ASM}!C33-{ASM}!C243)/1024,2)" + (f"+{p}181" if p else ""),
+    fmt=num_1dp)
+
 ws2.freeze_panes = "C5"
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -1261,8 +2306,8 @@ sc(ws5, R, 2, "SINGLE CHARM PROFILE", font=section_font)
 section_header(ws5, R+1, 2, 4, ["Metric", "Value", "Unit"])
 
 R = 7
-sc(ws5, R, 2, "Content size (weighted avg)", font=normal_font, border=thin_border)
-formula(ws5, R, 3, f"={A}!C33", normal_font, num_2dp)
+sc(ws5, R, 2, "Content size stored (weighted avg)", font=normal_font, border=thin_border)
+formula(ws5, R, 3, f"={A}!C243", normal_font, num_2dp)
 note(ws5, R, 4, "MB")
 note(ws5, R, 6, f"=TEXT({A}!D29*100,\"0\")&\"% video (\"&{A}!C29&\" MB), \"&TEXT({A}!D30*100,\"0\")&\"% image (\"&{A}!C30&\" MB), \"&TEXT({A}!D31*100,\"0\")&\"% audio (\"&{A}!C31&\" MB)\"")
 # simpler note
@@ -1297,17 +2342,19 @@ formula(ws5, R, 3, f"={A}!C40", normal_font, pct_fmt)
 
 R = 13
 sc(ws5, R, 2, "API calls per view (GetCharm + glyph if needed)", font=normal_font, border=thin_border)
-formula(ws5, R, 3, f"=1+C12", normal_font, num_2dp)
-note(ws5, R, 6, "1 GetCharm call per view + glyph verify probability")
+formula(ws5, R, 3, f"=(1-{A}!C175)+C12", normal_font, num_2dp)
+note(ws5, R, 6, "1 GetCharm call per uncached view + glyph verify probability")
 
 R = 14
 sc(ws5, R, 2, "Table reads per view", font=normal_font, border=thin_border)
-formula(ws5, R, 3, f"={A}!C43", normal_font, num_fmt)
+formula(ws5, R, 3, f"={A}!C43*(1-{A}!C175)", normal_font, num_2dp)
+note(ws5, R, 6, "Cache hits skip the Table lookup (Assumptions C175)")
 
 R = 15
 sc(ws5, R, 2, "Table writes per view (glyph attempts + rate-limit log)", font=normal_font, border=thin_border)
-formula(ws5, R, 3, f"=ROUND(C12*2+0.1,1)", normal_font, num_1dp)
-note(ws5, R, 6, "2 writes per glyph verify + 10% sampled request logging")
+batch = f"IF({A}!C179=1,MAX(1,{A}!C180),1)"
+formula(ws5, R, 3, f"=ROUND(C12*(1+1/{batch})+0.1/{batch},2)", normal_font, num_2dp)
+note(ws5, R, 6, "Rate-limit write + glyph/request logs in full batches (Assumptions C179-C180)")
 
 # ────────────────────────────────────────────────────────────────────────────
 # SECTION: One-Time Setup Costs (Claim → Configure → Upload → Finalize)
@@ -1329,28 +2376,28 @@ note(ws5, R, 6, "claim + configure + get-upload-urls + finalize + preview")
 # R2 Class A — initial upload writes
 R = 20
 sc(ws5, R, 2, "Cloudflare R2: Upload Writes (Class A)", font=normal_font, border=thin_border)
-# 2 write ops * (1 + re-upload rate) / 1M * rate
+# ops per upload * (1 + re-upload rate) / 1M * rate
 formula(ws5, R, 3,
-    f"=(2*(1+{A}!C35)/1000000)*{A}!C56",
+    f"=({A}!C114*{A}!C118/1000000)*{A}!C56",
     normal_font, cost_6dp)
-note(ws5, R, 4, "2 PUT ops x (1+re-upload rate)")
-note(ws5, R, 6, "PUT blob + list verify; re-uploads during 14-day settling")
+note(ws5, R, 4, "ops/upload x (1+re-upload rate)")
+note(ws5, R, 6, "Multipart parts + retries + list verify; re-uploads during 14-day settling")
 
 # Azure Blob — backup upload writes
 R = 21
 sc(ws5, R, 2, "Azure Blob: Backup Upload Writes", font=normal_font, border=thin_border)
 formula(ws5, R, 3,
-    f"=(2*(1+{A}!C35)/10000)*{A}!C48",
+    f"=({A}!C115*{A}!C118/10000)*{A}!C48",
     normal_font, cost_6dp)
-note(ws5, R, 4, "2 ops x (1+re-upload rate) / 10K")
+note(ws5, R, 4, "blocks + commit x (1+re-upload rate) / 10K")
 
 # Azure Table — setup entities
 R = 22
 sc(ws5, R, 2, "Azure Table: Setup Entity Writes", font=normal_font, border=thin_border)
 formula(ws5, R, 3,
-    f"=({A}!C42/10000)*{A}!C64",
+    f"=({A}!C186/10000)*{A}!C64",
     normal_font, cost_6dp)
-note(ws5, R, 4, "8 writes / 10K x txn rate")
+note(ws5, R, 4, "setup txns (C186) / 10K x txn rate")
 note(ws5, R, 6, "charm + user-charm + profile + request log entities")
 
 # Azure Table — entity storage (one-time provisioning, ongoing is below)
@@ -1364,7 +2411,8 @@ note(ws5, R, 4, "~2 KB entity / GB x rate")
 # TOTAL ONE-TIME
 R = 24
 sc(ws5, R, 2, "TOTAL ONE-TIME SETUP COST", font=bold_font, border=thin_border, fill=red_fill)
-formula(ws5, R, 3, "=SUM(C19:C23)", bold_font, cost_4dp)
+formula(ws5, R, 3, f"=SUM(C19:C23)+{A}!C244*{A}!C118", bold_font, cost_4dp)
+note(ws5, R, 6, "Includes transcoding compute when recompression is on (Assumptions C244)")
 style_range(ws5, R, 2, 5, fill=red_fill)
 
 # ────────────────────────────────────────────────────────────────────────────
@@ -1387,9 +2435,9 @@ note(ws5, R, 4, "GB x $0.015/GB/mo")
 
 R = 30
 sc(ws5, R, 2, "  R2: Class B Reads — playback downloads", font=normal_font, border=thin_border)
-formula(ws5, R, 3, f"=(C11/1000000)*{A}!C57", normal_font, cost_6dp)
-note(ws5, R, 4, "views/mo / 1M x rate")
-note(ws5, R, 6, "Every view = 1 GET from R2")
+formula(ws5, R, 3, f"=(C11*{A}!C232/1000000)*{A}!C57", normal_font, cost_6dp)
+note(ws5, R, 4, "GETs/mo / 1M x rate")
+note(ws5, R, 6, "Blended GETs per view (Assumptions C232): ranges + gallery images")
 
 R = 31
 sc(ws5, R, 2, "  R2: Egress / Bandwidth", font=normal_font, border=thin_border)
@@ -1412,21 +2460,21 @@ formula(ws5, R, 3, f"=C8*{A}!C47", normal_font, cost_6dp)
 note(ws5, R, 4, "GB x $0.01/GB/mo")
 
 R = 36
-sc(ws5, R, 2, "  Azure Blob: Read Ops (fallback — 2% of views)", font=normal_font, border=thin_border)
-formula(ws5, R, 3, f"=(C11*0.02/10000)*{A}!C49", normal_font, cost_6dp)
-note(ws5, R, 4, "2% fallback reads")
+sc(ws5, R, 2, "  Azure Blob: Read Ops (fallback share of views)", font=normal_font, border=thin_border)
+formula(ws5, R, 3, f"=(C11*{A}!C152/10000)*{A}!C49", normal_font, cost_6dp)
+note(ws5, R, 4, "fallback reads (Assumptions C152)")
 note(ws5, R, 6, "Only when R2 is unavailable; client falls back to Azure")
 
 R = 37
 sc(ws5, R, 2, "  Azure Blob: Data Retrieval (cool tier penalty)", font=normal_font, border=thin_border)
-formula(ws5, R, 3, f"=C11*0.02*C8*{A}!C50", normal_font, cost_6dp)
-note(ws5, R, 4, "2% fallback x GB x retrieval rate")
+formula(ws5, R, 3, f"=C11*{A}!C152*C8*{A}!C50", normal_font, cost_6dp)
+note(ws5, R, 4, "fallback x GB x retrieval rate")
 note(ws5, R, 6, "Cool tier charges per-GB on read; hot tier does not")
 
 R = 38
 sc(ws5, R, 2, "  Azure Blob: Egress (fallback downloads)", font=normal_font, border=thin_border)
-formula(ws5, R, 3, f"=C11*0.02*C8*{A}!C51", normal_font, cost_6dp)
-note(ws5, R, 4, "2% fallback x GB x egress rate")
+formula(ws5, R, 3, f"=C11*{A}!C152*C8*{A}!C51", normal_font, cost_6dp)
+note(ws5, R, 4, "fallback x GB x egress rate")
 note(ws5, R, 6, "$0.087/GB — only on Azure-direct downloads")
 
 R = 39
@@ -1484,9 +2532,9 @@ sc(ws5, R, 2, "ENTRA CIAM (Authentication)", font=Font(name="Calibri", bold=True
 style_range(ws5, R, 2, 5, fill=PatternFill(start_color=LIGHT_BLUE, end_color=LIGHT_BLUE, fill_type="solid"))
 
 R = 53
-sc(ws5, R, 2, "  CIAM: Per-MAU cost (1 charm ≈ 0.3 MAU avg)", font=normal_font, border=thin_border)
-formula(ws5, R, 3, f"=0.3*{A}!C79", normal_font, cost_6dp)
-note(ws5, R, 4, "0.3 MAU x $0.0025/MAU")
+sc(ws5, R, 2, "  CIAM: Per-MAU cost (MAU per active charm x rate)", font=normal_font, border=thin_border)
+formula(ws5, R, 3, f"={A}!C126*{A}!C79", normal_font, cost_6dp)
+note(ws5, R, 4, "MAU/charm x $/MAU (list rate, before free band)")
 note(ws5, R, 6, "Not every charm = unique monthly active user")
 
 R = 54
@@ -1607,37 +2655,42 @@ ws5.cell(row=R, column=4).fill = red_fill
 # ────────────────────────────────────────────────────────────────────────────
 R = 78
 sc(ws5, R, 2, "CONTENT SIZE SENSITIVITY — Monthly Cost at Different Sizes", font=section_font)
-note(ws5, R, 6, "Holding view rate constant, varying content size")
+note(ws5, R, 6, "Holding view rate constant; sizes are percentiles of the capped upload mix")
 section_header(ws5, R+1, 2, 6, ["Content Size", "R2 Storage", "Azure Blob", "Functions+Table", "Total Monthly", "Annual"])
 
-sizes_mb = [6, 15, 35.85, 55, 100, 150]
-for i, size in enumerate(sizes_mb):
+# Sizes from the capped lognormal mix (Assumptions rows 216-221) — percentiles in rows 124-127
+SIZE_PCTS = [(0.10, "P10 upload"), (0.50, "Median upload"), (0.90, "P90 upload"), (0.99, "P99 upload")]
+size_cell = {q: f"$D${124 + i}" for i, (q, _) in enumerate(SIZE_PCTS)}
+sizes_mb = [
+    (size_cell[0.10], f'="P10 upload — "&TEXT({size_cell[0.10]},"0.0")&" MB"'),
+    (size_cell[0.50], f'="Median upload — "&TEXT({size_cell[0.50]},"0.0")&" MB"'),
+    (f"{A}!C33", "Mean upload (weighted avg — base case)"),
+    (size_cell[0.90], f'="P90 upload — "&TEXT({size_cell[0.90]},"0.0")&" MB"'),
+    (size_cell[0.99], f'="P99 upload — "&TEXT({size_cell[0.99]},"0.0")&" MB"'),
+    (f"{A}!C221", "Upload cap (API limit)"),
+]
+for i, (size, label) in enumerate(sizes_mb):
     row = 80 + i
-    label = (f"{size} MB" + (
-        " (audio only)" if size == 6
-        else " (image gallery)" if size == 15
-        else " (weighted avg — base case)" if size == 35.85
-        else " (avg video — iPhone 1080p mix)" if size == 55
-        else " (4K / H.264 heavy)" if size == 100
-        else " (max — 150 MB limit)" ))
-    sc(ws5, row, 2, label, font=bold_font if size == 35.85 else normal_font, border=thin_border)
+    base = size == f"{A}!C33"
+    sc(ws5, row, 2, label, font=bold_font if base else normal_font, border=thin_border)
     # R2 storage = size/1024 * R2 rate
     formula(ws5, row, 3, f"=({size}/1024)*{A}!C55", normal_font, cost_6dp)
     # Azure blob = size/1024 * Azure rate + fallback read/egress
     formula(ws5, row, 4,
-        f"=({size}/1024)*{A}!C47 + (C11*0.02/10000)*{A}!C49 + C11*0.02*({size}/1024)*{A}!C50 + C11*0.02*({size}/1024)*{A}!C51",
+        f"=({size}/1024)*{A}!C47 + (C11*{A}!C152/10000)*{A}!C49 + C11*{A}!C152*({size}/1024)*{A}!C50 + C11*{A}!C152*({size}/1024)*{A}!C51",
         normal_font, cost_6dp)
     # Functions + Table (same regardless of content size, driven by views)
     formula(ws5, row, 5, "=C50+C45", normal_font, cost_6dp)
     # Total monthly
     cell = ws5.cell(row=row, column=6)
     cell.value = f"=C{row}+D{row}+E{row}+C54"
-    cell.font = bold_font if size == 35.85 else normal_font
+    cell.font = bold_font if base else normal_font
     cell.number_format = cost_4dp
     cell.border = thin_border
 
-    if size == 35.85:
+    if base:
         style_range(ws5, row, 2, 6, fill=green_fill)
+note(ws5, 86, 2, '="Largest 10% of uploads hold "&TEXT(C128,"0%")&" of stored MB (row 128)"')
 
 # Total annual column
 R = 78
@@ -1651,6 +2704,143 @@ for i in range(len(sizes_mb)):
     cell.number_format = cost_4dp
     cell.border = thin_border
 
+# ────────────────────────────────────────────────────────────────────────────
+# SECTION: Marginal cost at scale (free tiers applied)
+# ────────────────────────────────────────────────────────────────────────────
+R = 88
+sc(ws5, R, 2, "MARGINAL COST AT SCALE — Free Tiers Applied", font=section_font)
+note(ws5, R, 6, "Cost of one more charm when the fleet is this size (tiered pricing engine)")
+section_header(ws5, R+1, 2, 6, ["Active Charms", "Marginal $/Month", "Avg $/Month", "No-Free-Tier $/Month", "Free-Tier Saving"])
+
+# Monthly quantity of each ongoing service for ONE charm (profile rows 7-15)
+per_charm_qty = {
+    "r2_storage": "C8",
+    "r2_class_b": f"C11*{A}!C232",
+    "blob_storage": "C8",
+    "blob_reads": f"C11*{A}!C152",
+    "blob_retrieval": f"C11*{A}!C152*C8",
+    "blob_egress": f"C11*{A}!C152*C8",
+    "table_storage": f"{A}!C65/1024/1024",
+    "table_txn": "C11*(C14+C15)",
+    "fn_executions": "C11*C13",
+    "fn_gb_seconds": f"C11*C13*({A}!C71/1000)*({A}!C72/1024)",
+    "ciam_mau": f"{A}!C126",
+}
+fleet_sizes = [1000, 10000, 50000, 100000, 250000, 1000000, 10000000]
+for i, n in enumerate(fleet_sizes):
+    row = R + 2 + i
+    sc(ws5, row, 2, f"{n:,} active charms", font=normal_font, border=thin_border)
+    marginal = "+".join(f"{tiered_marginal_formula(svc, f'{n}*{q}')}*{q}" for svc, q in per_charm_qty.items())
+    average = "+".join(tiered_formula(svc, f"{n}*{q}") for svc, q in per_charm_qty.items())
+    formula(ws5, row, 3, f"={marginal}", bold_font, cost_6dp)
+    formula(ws5, row, 4, f"=({average})/{n}", normal_font, cost_6dp)
+    formula(ws5, row, 5, "=C56", normal_font, cost_6dp)
+    formula(ws5, row, 6, f"=IF(E{row}>0,1-D{row}/E{row},0)", normal_font, pct_fmt)
+note(ws5, R + 2 + len(fleet_sizes), 2, "Marginal = 0 for a service while the fleet is inside its free allowance")
+
+# ────────────────────────────────────────────────────────────────────────────
+# SECTION: Table write batching trade-off (month-24 glyph volume)
+# ────────────────────────────────────────────────────────────────────────────
+R = 100
+sc(ws5, R, 2, "TABLE WRITE BATCHING — Flush Interval Trade-off", font=section_font)
+note(ws5, R, 6, "Glyph-log volume at month 24 (Projections Z131); batching on, Assumptions rows 179-185")
+section_header(ws5, R+1, 2, 7, ["Flush Interval (s)", "Entities / Batch", "Log Txns / Month",
+                                 "Entities / Batch @100x", "Log Txns @100x", "Avg Write Delay (ms)"])
+log_rate = f"({P}!Z131/2592000/{A}!C183)"
+for i, flush in enumerate([0, 1, 5, 15, 60, 300]):
+    row = R + 2 + i
+    sc(ws5, row, 2, "Unbatched" if flush == 0 else flush, font=normal_font, number_format=num_fmt, border=thin_border)
+    formula(ws5, row, 3, f"=MAX(1,MIN({A}!C180,{log_rate}*{flush}))", normal_font, num_1dp)
+    formula(ws5, row, 4, f"=ROUND({P}!Z131/C{row},0)", normal_font, num_fmt)
+    formula(ws5, row, 5, f"=MAX(1,MIN({A}!C180,100*{log_rate}*{flush}))", normal_font, num_1dp)
+    formula(ws5, row, 6, f"=ROUND(100*{P}!Z131/E{row},0)", normal_font, num_fmt)
+    formula(ws5, row, 7, f"=IF({log_rate}>0,MIN({flush},C{row}/{log_rate})*1000/2,0)", normal_font, num_fmt)
+row = R + 9
+sc(ws5, row, 2, "Claim setup: transactions / write latency", font=normal_font, border=thin_border)
+formula(ws5, row, 3, f"={A}!C42", normal_font, num_fmt)
+formula(ws5, row, 4, f"={A}!C186", bold_font, num_fmt)
+formula(ws5, row, 5, f"={A}!C42*{A}!C184", normal_font, num_fmt)
+formula(ws5, row, 6, f"={A}!C187", bold_font, num_fmt)
+note(ws5, row + 1, 2, "Setup row: C = unbatched txns, D = batched txns, E = unbatched ms, F = batched ms")
+
+# ────────────────────────────────────────────────────────────────────────────
+# SECTION: Discounted lifetime hosting — price declines + discount rate
+# ────────────────────────────────────────────────────────────────────────────
+R = 112
+sc(ws5, R, 2, "DISCOUNTED LIFETIME HOSTING (present value per charm)", font=section_font)
+note(ws5, R, 7, "Each group: $/month x (1-q^n)/(1-q), q = PV factor on Assumptions rows 249-253")
+section_header(ws5, R+1, 2, 6, ["Service Group", "$/Month Today", "PV 10-Year", "PV 15-Year", "PV Perpetual"])
+for i, (label, cost) in enumerate([
+    ("Storage (R2 + Blob + Table entities)", "=C29+C35+C42"),
+    ("Operations (reads / writes / txns)", "=C30+C36+C43+C44"),
+    ("Bandwidth & retrieval", "=C31+C37+C38"),
+    ("Compute (Functions)", "=C50"),
+    ("Authentication (CIAM MAU, month-24 free band)",
+     f"=IF({P}!Z11>0,({tiered_formula('ciam_mau', f'{P}!Z11*{A}!C126')})/{P}!Z11,0)"),
+]):
+    row = R + 2 + i
+    q = f"{A}!$D${249 + i}"
+    sc(ws5, row, 2, label, font=normal_font, border=thin_border)
+    formula(ws5, row, 3, cost, normal_font, cost_6dp)
+    for k, months in enumerate((120, 180, 360)):
+        formula(ws5, row, 4 + k, f"=IF({q}=1,$C{row}*{months},$C{row}*(1-{q}^{months})/(1-{q}))", normal_font, cost_4dp)
+R = 119
+sc(ws5, R, 2, "PV OF LIFETIME HOSTING", font=bold_font, border=thin_border, fill=red_fill)
+for col in "CDEF":
+    formula(ws5, R, "CDEF".index(col) + 3, f"=SUM({col}114:{col}118)", bold_font, cost_4dp)
+style_range(ws5, R, 2, 6, fill=red_fill)
+R = 120
+sc(ws5, R, 2, "PV as % of flat-price lifetime (rows 65-67)", font=normal_font, border=thin_border)
+formula(ws5, R, 4, "=IF(C65>0,D119/C65,0)", normal_font, pct_fmt)
+formula(ws5, R, 5, "=IF(C66>0,E119/C66,0)", normal_font, pct_fmt)
+formula(ws5, R, 6, "=IF(C67>0,F119/C67,0)", normal_font, pct_fmt)
+
+# ────────────────────────────────────────────────────────────────────────────
+# SECTION: Upload size percentiles — feed the sensitivity rows 80-86
+# ────────────────────────────────────────────────────────────────────────────
+# The three-type mixture has no closed-form inverse, so percentiles are read
+# off its CDF on a log grid (rows 131+) by linear interpolation.
+SIZE_GRID = 241
+R = 122
+sc(ws5, R, 2, "UPLOAD SIZE PERCENTILES (capped three-type mix)", font=section_font)
+note(ws5, R, 6, "Median / sigma / mix on Assumptions rows 29-31 and 216-221; CDF grid below")
+section_header(ws5, R + 1, 2, 4, ["Percentile", "Grid Row", "Size (MB)"])
+grid_x = f"$B$131:$B${130 + SIZE_GRID}"
+grid_f = f"$C$131:$C${130 + SIZE_GRID}"
+for i, (q, label) in enumerate(SIZE_PCTS):
+    row = R + 2 + i
+    sc(ws5, row, 2, q, font=normal_font, number_format=pct_fmt, border=thin_border)
+    formula(ws5, row, 3, f"=MIN(IFERROR(MATCH(B{row},{grid_f},1),1),{SIZE_GRID - 1})", normal_font, num_fmt)
+    lo_x, hi_x = f"INDEX({grid_x},C{row})", f"INDEX({grid_x},C{row}+1)"
+    lo_f, hi_f = f"INDEX({grid_f},C{row})", f"INDEX({grid_f},C{row}+1)"
+    formula(ws5, row, 4, f"={lo_x}+MAX(0,B{row}-{lo_f})/({hi_f}-{lo_f})*({hi_x}-{lo_x})", bold_font, num_1dp)
+
+# Share of stored (capped) MB above P90: partial lognormal means, closed form
+row = 128
+sc(ws5, row, 2, "Share of stored MB above P90", font=normal_font, border=thin_border)
+above, total = [], []
+for mix, r in (("D29", 218), ("D30", 219), ("D31", 220)):
+    m, sg, cap = f"{A}!C{r}", f"{A}!D{r}", f"{A}!C221"
+    above.append(f"{A}!{mix}*({m}*EXP({sg}^2/2)*(NORMSDIST(LN({cap}/{m})/{sg}-{sg})"
+                 f"-NORMSDIST(LN(MIN({cap},$D$126)/{m})/{sg}-{sg}))+{cap}*(1-NORMSDIST(LN({cap}/{m})/{sg})))")
+    total.append(f"{A}!{mix}*{A}!F{r}")
+formula(ws5, row, 3, f"=({'+'.join(above)})/({'+'.join(total)})", bold_font, pct_fmt)
+
+R = 130
+section_header(ws5, R, 2, 3, ["Size (MB)", "Mix CDF"])
+mix_total = f"({A}!$D$29+{A}!$D$30+{A}!$D$31)"
+for k in range(SIZE_GRID):
+    row = R + 1 + k
+    if k == SIZE_GRID - 1:
+        # Mass trimmed to the cap: a vertical step at the cap, so the top percentiles land on it
+        formula(ws5, row, 2, f"={A}!$C$221", normal_font, num_2dp)
+        formula(ws5, row, 3, "=1", normal_font, '0.0000')
+        continue
+    formula(ws5, row, 2, f"=EXP(LN(0.01)+(LN({A}!$C$221)-LN(0.01))*{k}/{SIZE_GRID - 2})", normal_font, num_2dp)
+    cdf = "+".join(f"{A}!$D${c}*NORMSDIST(LN(B{row}/{A}!$C${r})/{A}!$D${r})"
+                   for c, r in ((29, 218), (30, 219), (31, 220)))
+    formula(ws5, row, 3, f"=MIN(1,({cdf})/{mix_total})", normal_font, '0.0000')
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # SHEET 6: REVENUE RECOGNITION — Cash vs Hybrid vs Straight-Line
@@ -2083,9 +3273,1128 @@ for m in range(1, 25):
     cell.font = bold_font; cell.number_format = pct_fmt; cell.border = thin_border
 note(ws6, R, 6, "> 100% = escrow covers all future hosting. < 100% = shortfall risk.")
 
+# Row 65: full-lifetime PV of every charm sold (no months served deducted)
+R = 65; sc(ws6, R, 2, "Full-Lifetime PV of Charms Sold (no months served deducted)", font=normal_font, border=thin_border)
+for m in range(1, 25):
+    col = m + 2; c = get_column_letter(col)
+    f = f"={c}15*{PCC}!$D$119+{c}16*{PCC}!$E$119+{c}17*{PCC}!$F$119"
+    cell = ws6.cell(row=R, column=col); cell.value = f
+    cell.font = normal_font; cell.number_format = currency_whole; cell.border = thin_border
+note(ws6, R, 27, "Per-Charm Costs row 119 x cumulative units — upper bound, not the obligation still owed")
+
+# Row 66: Coverage ratio on a PV basis — against the per-cohort remaining PV
+# (Obligation NPV sheet, base case); formulas are filled in once that sheet exists
+R = 66; sc(ws6, R, 2, "PV COVERAGE RATIO (deferred balance / remaining PV, Obligation NPV)", font=bold_font, border=thin_border)
+
+# Rows 68-76: reconciliation with the Deferred Runoff sheet, which recognizes
+# on units net of returns — the gap should be exactly the returned share
+R = 68; sc(ws6, R, 2, "RECONCILIATION TO DEFERRED RUNOFF (base case)", font=section_font)
+note(ws6, R, 7, "Rows 42-52 recognize gross units and reverse returns separately; the runoff recognizes net units")
+RECON_ROWS = {"Hybrid": (69, 24), "Straight-Line": (73, 29)}
+for method, (R, src) in RECON_ROWS.items():
+    labels = [f"{method}: recognized on gross units (row {src})",
+              f"{method}: recognized net of returns (Deferred Runoff snapshot)",
+              "  Returned units' share (gross x Assumptions C96)",
+              "  Unreconciled difference"]
+    for j, label in enumerate(labels):
+        sc(ws6, R + j, 2, label, font=bold_font if j == 3 else normal_font, border=thin_border)
+    for m in range(1, 25):
+        col = m + 2; c = get_column_letter(col)
+        for j, f in ((0, f"={c}{src}"), (2, f"={c}{R}*{ASM}!C96"), (3, f"={c}{R}-{c}{R + 1}-{c}{R + 2}")):
+            cell = ws6.cell(row=R + j, column=col); cell.value = f
+            cell.font = bold_font if j == 3 else normal_font; cell.number_format = currency_whole; cell.border = thin_border
+
 ws6.freeze_panes = "C5"
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# SHEET 7: UPLOAD INGESTION — Multipart part-size trade-off
+# ═══════════════════════════════════════════════════════════════════════════════
+ws7 = wb.create_sheet("Upload Ingestion")
+ws7.sheet_properties.tabColor = "00838F"
+ws7.column_dimensions["A"].width = 3
+ws7.column_dimensions["B"].width = 30
+for col in "CDEFGH":
+    ws7.column_dimensions[col].width = 20
+
+sc(ws7, 1, 2, "Upload Ingestion — Multipart Part-Size Trade-Off", font=title_font)
+sc(ws7, 2, 2, "Bigger parts = fewer Class A ops but more data re-sent when a mobile upload drops", font=Font(name="Calibri", italic=True, size=10, color="666666"))
+sc(ws7, 3, 2, "Failure rate, bandwidth, threshold and request overhead come from Assumptions rows 107-113", font=Font(name="Calibri", italic=True, size=10, color="666666"))
+
+part_sizes_mb = [5, 8, 10, 16, 32, 64, 100, 150]
+upload_cases = [
+    # (section title, upload size expression)
+    ("AVERAGE VIDEO CHARM (Assumptions C29)", f"{ASM}!C29"),
+    ("MAXIMUM UPLOAD (API limit, Assumptions C221)", f"{ASM}!C221"),
+]
+
+R = 5
+for title, size in upload_cases:
+    sc(ws7, R, 2, title, font=section_font)
+    section_header(ws7, R + 1, 2, 8, ["Part Size", "Parts", "Part Retry Prob.", "Class A Ops / Upload",
+                                      "Class A $ / 1K Uploads", "MB Sent / Upload", "Upload Time (s)"])
+    for i, part in enumerate(part_sizes_mb):
+        row = R + 2 + i
+        sc(ws7, row, 2, f"{part} MB parts", font=normal_font, border=thin_border)
+        formula(ws7, row, 3, f"=IF({size}>{ASM}!C107,ROUNDUP({size}/{part},0),1)", normal_font, num_fmt)
+        formula(ws7, row, 4, f"=1-EXP(-{ASM}!C109*IF({size}>{ASM}!C107,MIN({part},{size}),{size}))", normal_font, pct_fmt)
+        formula(ws7, row, 5,
+            f"=IF({size}>{ASM}!C107,C{row}*EXP({ASM}!C109*MIN({part},{size}))+2,EXP({ASM}!C109*{size}))+1",
+            normal_font, num_2dp)
+        formula(ws7, row, 6, f"=E{row}/1000*{ASM}!C56", normal_font, currency_micro)
+        formula(ws7, row, 7, f"={size}*EXP({ASM}!C109*IF({size}>{ASM}!C107,MIN({part},{size}),{size}))", normal_font, num_2dp)
+        formula(ws7, row, 8, f"=G{row}*8/{ASM}!C112+(E{row}-1)*{ASM}!C111/1000", bold_font, num_1dp)
+        # Highlight follows the default part size input rather than a fixed row
+        ws7.conditional_formatting.add(f"B{row}:H{row}",
+                                       FormulaRule(formula=[f"{ASM}!$C$108={part}"], fill=green_fill))
+    R += len(part_sizes_mb) + 4
+
+note(ws7, R - 1, 2, "Green row = default part size (Assumptions C108). R2 requires parts >= 5 MiB except the last.")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SHEET 8: MARGINAL COST AT SCALE — live base case, scenario snapshots
+# ═══════════════════════════════════════════════════════════════════════════════
+# Base Case rows are formulas over the Projections sheet. Conservative and
+# Optimistic override Assumptions cells only in financial_engine.SCENARIOS, so
+# those blocks are evaluated at build time — re-run the generator to refresh.
+base_inputs = read_assumptions(ws)
+scenario_names, scn = scenario_inputs(base_inputs)
+scn_proj = project(scn)
+scn_marginal = marginal_cost_per_charm(scn, scn_proj)
+
+ws8 = wb.create_sheet("Marginal Cost at Scale")
+ws8.sheet_properties.tabColor = "6A1B9A"
+ws8.column_dimensions["A"].width = 3
+ws8.column_dimensions["B"].width = 44
+
+sc(ws8, 1, 2, "Marginal Hosting Cost per Charm — by Month & Scenario", font=title_font)
+sc(ws8, 2, 2, "Free allowances applied per service per month. Base Case is live; gray italic scenario blocks are build-time snapshots.", font=Font(name="Calibri", italic=True, size=10, color="666666"))
+
+R = 4
+sc(ws8, R, 2, "", font=header_font, fill=header_fill)
+for m in range(1, 25):
+    col = m + 2
+    ws8.column_dimensions[get_column_letter(col)].width = 12
+    sc(ws8, R, col, f"Month {m}", font=header_font, fill=header_fill, alignment=Alignment(horizontal="center"))
+
+R = 6
+for s_i, name in enumerate(scenario_names):
+    live = name == "Base Case"
+    sc(ws8, R, 2, name.upper() + ("" if live else SNAPSHOT), font=section_font)
+    rows = [
+        ("Active Charms", 11, num_fmt, normal_font),
+        ("Total Infrastructure ($/month)", 43, currency_fmt, normal_font),
+        ("Avg Infra Cost per Active Charm", 83, currency_micro, normal_font),
+        ("Marginal Cost of One More Charm", None, currency_micro, bold_font),
+    ]
+    for j, (label, src, fmt, font_) in enumerate(rows):
+        row = R + 1 + j
+        sc(ws8, row, 2, label, font=font_, border=thin_border)
+        for m in range(24):
+            c = get_column_letter(m + 3)
+            if live:
+                f = f"={P}!{c}{src}" if src else f"={marginal_cost_formula(c, P)}"
+                formula(ws8, row, m + 3, f, font_, fmt)
+            else:
+                values = scn_proj[src][s_i] if src else scn_marginal[s_i]
+                sc(ws8, row, m + 3, float(values[m]), font=snapshot_font, number_format=fmt, border=thin_border)
+    R += len(rows) + 2
+
+ws8.freeze_panes = "C5"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SHEET 9: STORAGE TIERING — cheapest placement per charm age band
+# ═══════════════════════════════════════════════════════════════════════════════
+# The base case is live: the placement matrix prices every (band, placement)
+# from the Assumptions tier table, each band's tier-move writes are charged
+# against the previous band's MATCH-ed pick, and the summaries read the matrix.
+tiering = optimize_lifecycle(scn)
+band_labels = [ws.cell(row=r, column=2).value for r in AGE_BAND_ROWS]
+fleet_bands = charms_by_age_band(scn, scn_proj)
+base_i = scenario_names.index("Base Case")
+
+ws9 = wb.create_sheet("Storage Tiering")
+ws9.sheet_properties.tabColor = "455A64"
+ws9.column_dimensions["A"].width = 3
+ws9.column_dimensions["B"].width = 30
+ws9.column_dimensions["C"].width = 18
+ws9.column_dimensions["D"].width = 26
+for col in "EFGHIJKL":
+    ws9.column_dimensions[col].width = 16
+
+sc(ws9, 1, 2, "Storage Lifecycle Tiering — R2 / Azure Placement by Charm Age", font=title_font)
+sc(ws9, 2, 2, "Every age band x placement priced from Assumptions rows 128-145. Base Case is live; gray italic scenario values are build-time snapshots.", font=Font(name="Calibri", italic=True, size=10, color="666666"))
+
+# Row layout: scenario blocks, lifetime + fleet summaries, then the live matrix
+block_rows = len(band_labels) + 3
+life_R = 4 + len(scenario_names) * block_rows
+fleet_R = life_R + 6
+mat_R = fleet_R + 7
+mat_first = mat_R + 2
+mat_last = mat_first + len(PLACEMENTS) - 1
+best_row = mat_last + 1
+claims_row = best_row + 1
+age_row = claims_row + 2
+lat_col = get_column_letter(3 + len(band_labels))
+band_col = lambda b: get_column_letter(3 + b)  # noqa: E731
+base_block = 4 + base_i * block_rows + 2                                 # first band row of the live block
+
+R = 4
+for s_i, name in enumerate(scenario_names):
+    live = s_i == base_i
+    sc(ws9, R, 2, f"{name.upper()} — BEST PLACEMENT PER AGE BAND" + ("" if live else SNAPSHOT), font=section_font)
+    section_header(ws9, R + 1, 2, 8, ["Age Band", "Today $/Charm/Mo", "Best Placement", "Best $/Charm/Mo",
+                                      "Saving / Charm/Mo", "Saving %", "Added Latency (ms)"])
+    for b, label in enumerate(band_labels):
+        row = R + 2 + b
+        sc(ws9, row, 2, label, font=normal_font, border=thin_border)
+        if live:
+            c, best = band_col(b), f"{band_col(b)}${best_row}"
+            formula(ws9, row, 3, f"={placement_cost_formula(b, 0, 1)}", normal_font, cost_6dp)
+            formula(ws9, row, 4, f"=INDEX($B${mat_first}:$B${mat_last},{best})", bold_font)
+            formula(ws9, row, 5, f"=MIN({c}${mat_first}:{c}${mat_last})", bold_font, cost_6dp)
+            formula(ws9, row, 6, f"=C{row}-E{row}", normal_font, cost_6dp)
+            formula(ws9, row, 7, f"=IF(C{row}>0,F{row}/C{row},0)", normal_font, pct_fmt)
+            formula(ws9, row, 8, f"=INDEX(${lat_col}${mat_first}:${lat_col}${mat_last},{best})", normal_font, num_fmt)
+            continue
+        current = float(tiering["current_cost"][s_i, b])
+        best = float(tiering["best_cost"][s_i, b])
+        sc(ws9, row, 3, current, font=snapshot_font, number_format=cost_6dp, border=thin_border)
+        sc(ws9, row, 4, PLACEMENTS[int(tiering["best"][s_i, b])][0], font=snapshot_font, border=thin_border)
+        sc(ws9, row, 5, best, font=snapshot_font, number_format=cost_6dp, border=thin_border)
+        sc(ws9, row, 6, current - best, font=snapshot_font, number_format=cost_6dp, border=thin_border)
+        sc(ws9, row, 7, (current - best) / current if current > 0 else 0, font=snapshot_font, number_format=pct_fmt, border=thin_border)
+        sc(ws9, row, 8, float(tiering["added_latency"][s_i, b]), font=snapshot_font, number_format=num_fmt, border=thin_border)
+    R += block_rows
+
+# Lifetime savings per charm by tier, and fleet savings at month 24
+R = life_R
+sc(ws9, R, 2, "LIFETIME SAVING PER CHARM (optimized vs dual copy forever)", font=section_font)
+section_header(ws9, R + 1, 2, 2 + len(scenario_names), ["Tier"] + scenario_names)
+for k, (label, lifetime) in enumerate([("10-Year Charm", 120), ("15-Year Charm", 180), ("Perpetual (30-yr est)", 360)]):
+    row = R + 2 + k
+    saving = (band_months_within(scn, lifetime) * tiering["saving"]).sum(axis=-1)
+    sc(ws9, row, 2, label, font=normal_font, border=thin_border)
+    for s_i in range(len(scenario_names)):
+        if s_i == base_i:
+            f = "+".join(f"MAX(0,MIN({ASM}!D{r},{lifetime})-{ASM}!C{r})*F{base_block + b}"
+                         for b, r in enumerate(AGE_BAND_ROWS))
+            formula(ws9, row, 3 + s_i, f"={f}", bold_font, currency_micro)
+        else:
+            sc(ws9, row, 3 + s_i, float(saving[s_i]), font=snapshot_font, number_format=currency_micro, border=thin_border)
+
+R = fleet_R
+sc(ws9, R, 2, "FLEET SAVING AT MONTH 24", font=section_font)
+section_header(ws9, R + 1, 2, 2 + len(scenario_names), ["Metric"] + scenario_names)
+fleet_current = (fleet_bands * tiering["current_cost"]).sum(axis=-1)
+fleet_best = (fleet_bands * tiering["best_cost"]).sum(axis=-1)
+band_sum = lambda col: "+".join(f"{band_col(b)}{claims_row}*{col}{base_block + b}" for b in range(len(band_labels)))  # noqa: E731
+for k, (label, values, fmt, live_f) in enumerate([
+        ("Claimed charms stored", fleet_bands.sum(axis=-1), num_fmt, f"SUM(C{claims_row}:{band_col(len(band_labels) - 1)}{claims_row})"),
+        ("Monthly storage-path cost — today", fleet_current, currency_fmt, band_sum("C")),
+        ("Monthly storage-path cost — optimized", fleet_best, currency_fmt, band_sum("E")),
+        ("Monthly saving", fleet_current - fleet_best, currency_fmt, None)]):
+    row = R + 2 + k
+    sc(ws9, row, 2, label, font=normal_font, border=thin_border)
+    for s_i in range(len(scenario_names)):
+        c = get_column_letter(3 + s_i)
+        if s_i == base_i:
+            formula(ws9, row, 3 + s_i, f"={live_f or f'{c}{row - 2}-{c}{row - 1}'}", normal_font, fmt)
+        else:
+            sc(ws9, row, 3 + s_i, float(values[s_i]), font=snapshot_font, number_format=fmt, border=thin_border)
+
+# Full placement matrix for the base case so the runner-up options are visible
+R = mat_R
+sc(ws9, R, 2, "BASE CASE — $/CHARM/MONTH FOR EVERY PLACEMENT (x = rejected: latency or no backup)", font=section_font)
+note(ws9, R, 9, f"Tier-move writes charged against the previous band's best placement (row {best_row})")
+section_header(ws9, R + 1, 2, 3 + len(band_labels), ["Placement"] + band_labels + ["Added Latency (ms)"])
+for o, (label, _, _) in enumerate(PLACEMENTS):
+    row = mat_first + o
+    sc(ws9, row, 2, label, font=normal_font, border=thin_border)
+    for b in range(len(band_labels)):
+        prev = 1 if b == 0 else f"{band_col(b - 1)}${best_row}"
+        formula(ws9, row, 3 + b, f'=IF({placement_feasible_formula(o)},{placement_cost_formula(b, o, prev)},"x")',
+                normal_font, cost_6dp)
+    formula(ws9, row, 3 + len(band_labels), f"={placement_latency_formula(o)}", normal_font, num_fmt)
+last_band = band_col(len(band_labels) - 1)
+ws9.conditional_formatting.add(f"C{mat_first}:{last_band}{mat_last}",
+                               FormulaRule(formula=[f"C{mat_first}=MIN(C${mat_first}:C${mat_last})"], fill=green_fill))
+
+sc(ws9, best_row, 2, "Best placement # (cheapest feasible)", font=bold_font, border=thin_border)
+sc(ws9, claims_row, 2, "Claimed charms in band at month 24", font=normal_font, border=thin_border)
+for b, r in enumerate(AGE_BAND_ROWS):
+    c = band_col(b)
+    formula(ws9, best_row, 3 + b, f"=MATCH(MIN({c}{mat_first}:{c}{mat_last}),{c}{mat_first}:{c}{mat_last},0)", bold_font)
+    formula(ws9, claims_row, 3 + b,
+            f"=SUMPRODUCT({P}!$C$9:$Z$9,--($C${age_row}:$Z${age_row}>={ASM}!C{r}),--($C${age_row}:$Z${age_row}<{ASM}!D{r}))*{ASM}!C34",
+            normal_font, num_fmt)
+sc(ws9, age_row, 2, "Cohort age at month 24 (months)", font=note_font)
+for m in range(24):
+    sc(ws9, age_row, 3 + m, 23 - m, font=note_font)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SHEET 10: PLAYBACK SLO — fallback latency & mirror cost vs availability
+# ═══════════════════════════════════════════════════════════════════════════════
+# Base Case is live. The TTFF mixture has no closed-form inverse, so its
+# percentiles are read off CDF columns on a log grid at the bottom of the
+# sheet (one per outage level), as with the upload sizes on Per-Charm Costs.
+OUTAGE_SWEEP = [0, 15, 43, 120, 240, 720, 1440]                          # R2 outage minutes / month
+TTFF_GRID = 401
+slo = playback_latency(scn)
+base_i = scenario_names.index("Base Case")
+
+ws10 = wb.create_sheet("Playback SLO")
+ws10.sheet_properties.tabColor = "C62828"
+ws10.column_dimensions["A"].width = 3
+ws10.column_dimensions["B"].width = 34
+for col in "CDEFGHIJ":
+    ws10.column_dimensions[col].width = 16
+
+sc(ws10, 1, 2, "Playback SLO — R2 Primary with Azure Fallback", font=title_font)
+sc(ws10, 2, 2, "Time-to-first-frame mixture (lognormal per path + fallback detection delay); inputs on Assumptions rows 147-161. Base Case is live; gray italic values are build-time snapshots.", font=Font(name="Calibri", italic=True, size=10, color="666666"))
+
+# Row layout: scenario table, outage sweep, mirror blocks, then the CDF grid
+sweep_R = 4 + 9
+mirror_R = sweep_R + 8
+grid_R = mirror_R + len(scenario_names) * (len(MIRROR_OPTIONS) + 3) + 2
+grid_first, grid_last = grid_R + 2, grid_R + 1 + TTFF_GRID
+grid_x = f"$B${grid_first}:$B${grid_last}"
+sweep_col = lambda o: get_column_letter(3 + o)  # noqa: E731
+cdf_idx = {None: 3, **{o: 4 + k for k, o in enumerate(OUTAGE_SWEEP)}}
+cdf_col = {o: get_column_letter(i) for o, i in cdf_idx.items()}
+
+
+def ttff_quantile(q, col):
+    """Interpolated TTFF percentile `q` off CDF grid column `col`."""
+    rng = f"${col}${grid_first}:${col}${grid_last}"
+    k = f"MIN(IFERROR(MATCH({q},{rng},1),1),{TTFF_GRID - 1})"
+    lo_x, hi_x = f"INDEX({grid_x},{k})", f"INDEX({grid_x},{k}+1)"
+    lo_f, hi_f = f"INDEX({rng},{k})", f"INDEX({rng},{k}+1)"
+    return f"={lo_x}+MAX(0,{q}-{lo_f})/({hi_f}-{lo_f})*({hi_x}-{lo_x})"
+
+
+R = 4
+sc(ws10, R, 2, "LATENCY & AVAILABILITY BY SCENARIO", font=section_font)
+note(ws10, R, 6, "Conservative / Optimistic columns" + SNAPSHOT)
+section_header(ws10, R + 1, 2, 2 + len(scenario_names), ["Metric"] + scenario_names)
+for k, (label, values, fmt, live_f) in enumerate([
+        ("Fallback share of views", scn["C152"].ravel(), '0.000%', f"={ASM}!C152"),
+        ("Mean TTFF (ms)", slo["mean"].ravel(), num_fmt, f"={ASM}!C160"),
+        ("P50 TTFF (ms)", slo[0.5].ravel(), num_fmt, ttff_quantile(0.5, cdf_col[None])),
+        ("P95 TTFF (ms)", slo[0.95].ravel(), num_fmt, ttff_quantile(0.95, cdf_col[None])),
+        ("P99 TTFF (ms)", slo[0.99].ravel(), num_fmt, ttff_quantile(0.99, cdf_col[None])),
+        ("Playback availability", scn["C161"].ravel(), '0.0000%', f"={ASM}!C161")]):
+    row = R + 2 + k
+    sc(ws10, row, 2, label, font=normal_font, border=thin_border)
+    for s_i in range(len(scenario_names)):
+        if s_i == base_i:
+            formula(ws10, row, 3 + s_i, live_f, normal_font, fmt)
+        else:
+            sc(ws10, row, 3 + s_i, float(values[s_i]), font=snapshot_font, number_format=fmt, border=thin_border)
+
+# Month-24 load and the per-option mirror cost at a given fallback share
+gb24, writes24, views24 = (f"{P}!$Z${r}" for r in (17, 25, 20))
+gb_view = f"{ASM}!$C$243/1024"
+
+
+def mirror_formulas(tier, fallback):
+    """Month-24 cost and availability expressions of one MIRROR_OPTIONS tier."""
+    if tier is None:
+        return "0", f"1-{fallback}"
+    r = TIER_ROWS[tier]
+    reads = "0" if tier == "archive" else f"{views24}*{fallback}"
+    cost = (f"{gb24}*{ASM}!$C${r}+{writes24}*{ASM}!$F${r}/10000"
+            f"+{reads}*({ASM}!$E${r}/10000+{gb_view}*{ASM}!$D${r})"
+            f"+{tiered_formula('blob_egress', f'{reads}*{gb_view}')}")
+    serves = "0" if tier == "archive" else f"{ASM}!$C$159"
+    return cost, f"1-{fallback}*(1-{serves})"
+
+
+# Outage sweep — latency tail and availability as R2 outage minutes grow
+R = sweep_R
+sc(ws10, R, 2, "BASE CASE — R2 OUTAGE SWEEP (Azure Cool mirror)", font=section_font)
+section_header(ws10, R + 1, 2, 2 + len(OUTAGE_SWEEP), ["Outage min / month"] + [str(o) for o in OUTAGE_SWEEP])
+for k, (label, fmt) in enumerate([("P50 TTFF (ms)", num_fmt), ("P95 TTFF (ms)", num_fmt), ("P99 TTFF (ms)", num_fmt),
+                                  ("Playback availability", '0.0000%'), ("Failed views / month (month 24)", num_fmt)]):
+    row = R + 2 + k
+    sc(ws10, row, 2, label, font=normal_font, border=thin_border)
+    for o, minutes in enumerate(OUTAGE_SWEEP):
+        avail = mirror_formulas("cool", f"({ASM}!$C$149*(1-{ASM}!$C$150)+{minutes}/43200)")[1]
+        f = [ttff_quantile(q, cdf_col[minutes]) for q in (0.5, 0.95, 0.99)] + [
+            f"={avail}", f"={views24}*(1-{sweep_col(o)}{R + 5})"]
+        formula(ws10, row, 3 + o, f[k], normal_font, fmt)
+
+# Mirror options at the modeled outage level (Assumptions C151)
+outage_min = float(base_inputs["C151"])
+mirror_cost, mirror_avail, mirror_failed = mirror_cost_availability(scn, scn_proj, [outage_min])
+outage_i = 0
+R = mirror_R
+for s_i, name in enumerate(scenario_names):
+    live = s_i == base_i
+    title = f"{name.upper()} — BACKUP MIRROR COST vs AVAILABILITY (month 24, "
+    sc(ws10, R, 2, title + ("outage = Assumptions C151)" if live else f"{outage_min:g} min outage)" + SNAPSHOT),
+       font=section_font)
+    section_header(ws10, R + 1, 2, 6, ["Mirror", "$/Month", "Availability", "Failed Views / Mo", "$ per Avoided Failure"])
+    no_mirror_failed = float(mirror_failed[s_i, outage_i, 0])
+    for o, (label, tier) in enumerate(MIRROR_OPTIONS):
+        row = R + 2 + o
+        sc(ws10, row, 2, label, font=normal_font, border=thin_border)
+        if live:
+            cost, avail = mirror_formulas(tier, f"{ASM}!$C$152")
+            formula(ws10, row, 3, f"={cost}", normal_font, currency_fmt)
+            formula(ws10, row, 4, f"={avail}", normal_font, '0.0000%')
+            formula(ws10, row, 5, f"={views24}*(1-D{row})", normal_font, num_fmt)
+            formula(ws10, row, 6, f'=IF($E${R + 2}-E{row}>0,C{row}/($E${R + 2}-E{row}),"n/a")', bold_font, currency_micro)
+            continue
+        cost = float(mirror_cost[s_i, outage_i, o])
+        avoided = no_mirror_failed - float(mirror_failed[s_i, outage_i, o])
+        sc(ws10, row, 3, cost, font=snapshot_font, number_format=currency_fmt, border=thin_border)
+        sc(ws10, row, 4, float(mirror_avail[s_i, outage_i, o]), font=snapshot_font, number_format='0.0000%', border=thin_border)
+        sc(ws10, row, 5, float(mirror_failed[s_i, outage_i, o]), font=snapshot_font, number_format=num_fmt, border=thin_border)
+        sc(ws10, row, 6, cost / avoided if avoided > 0 else "n/a", font=snapshot_font, number_format=currency_micro, border=thin_border)
+    R += len(MIRROR_OPTIONS) + 3
+note(ws10, R, 2, "Archive keeps a durable copy but cannot serve playback (hours to rehydrate), so it buys no availability.")
+
+# TTFF mixture CDF on a log grid, 10 ms .. 100 s — one column per outage level
+R = grid_R
+sc(ws10, R, 2, "TTFF MIXTURE CDF (feeds the percentiles above)", font=section_font)
+section_header(ws10, R + 1, 2, 3 + len(OUTAGE_SWEEP),
+               ["TTFF (ms)", "C151 outage"] + [f"{o} min" for o in OUTAGE_SWEEP])
+sd_r2 = f"(LN({ASM}!$C$154/{ASM}!$C$153)/1.645)"
+sd_az = f"(LN({ASM}!$C$156/{ASM}!$C$155)/1.645)"
+err = f"{ASM}!$C$149*(1-{ASM}!$C$150)"
+for k in range(TTFF_GRID):
+    row = grid_first + k
+    formula(ws10, row, 2, f"=10^(1+4*{k}/{TTFF_GRID - 1})", normal_font, num_1dp)
+    for minutes, col in cdf_idx.items():
+        out = f"{ASM}!$C$151/43200" if minutes is None else f"{minutes}/43200"
+        az = lambda d: (f"IF($B{row}>{d},NORMSDIST((LN(MAX($B{row}-{d},1E-9))-LN({ASM}!$C$155))/{sd_az}),0)")  # noqa: E731
+        formula(ws10, row, col,
+                f"=(1-{err}-{out})*NORMSDIST((LN($B{row})-LN({ASM}!$C$153))/{sd_r2})"
+                f"+{err}*{az(f'{ASM}!$C$157')}+{out}*{az(f'{ASM}!$C$158')}",
+                normal_font, '0.0000')
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SHEET 11: GETCHARM CACHE — invocations, Table reads and latency saved
+# ═══════════════════════════════════════════════════════════════════════════════
+# Base Case reads the Projections cache rows (124-128); the infrastructure
+# saving re-prices rows 22 and 27 with the cache hits added back.
+no_cache_proj = project({**scn, "C165": scn["C165"] * 0})
+
+ws11 = wb.create_sheet("GetCharm Cache")
+ws11.sheet_properties.tabColor = "00838F"
+ws11.column_dimensions["A"].width = 3
+ws11.column_dimensions["B"].width = 44
+
+sc(ws11, 1, 2, "GetCharm Metadata Cache — Savings by Month & Scenario", font=title_font)
+sc(ws11, 2, 2, "Hit ratio from TTL, PoPs, session repeats and invalidate-on-edit (Assumptions rows 163-175). Base Case is live; gray italic scenario blocks are build-time snapshots.", font=Font(name="Calibri", italic=True, size=10, color="666666"))
+
+R = 4
+sc(ws11, R, 2, "", font=header_font, fill=header_fill)
+for m in range(1, 25):
+    col = m + 2
+    ws11.column_dimensions[get_column_letter(col)].width = 12
+    sc(ws11, R, col, f"Month {m}", font=header_font, fill=header_fill, alignment=Alignment(horizontal="center"))
+
+
+
+def cache_saving_formula(c):
+    """Functions + Table cost of month column `c` with every cache hit sent back to GetCharm."""
+    fn = f"ROUND(({P}!{c}9*{ASM}!C34*{ASM}!C41)+{P}!{c}20+{P}!{c}21+({P}!{c}20*0.02),0)"
+    txn = f"ROUND({P}!{c}134+{P}!{c}20*{ASM}!C43+{P}!{c}21+{P}!{c}133,0)"
+    gb_s = f"*({ASM}!C71/1000)*({ASM}!C72/1024)"
+    cost = lambda calls, reads: (f"{tiered_formula('fn_executions', calls)}"  # noqa: E731
+                                 f"+{tiered_formula('fn_gb_seconds', calls + gb_s)}"
+                                 f"+{tiered_formula('table_txn', reads)}")
+    return f"=({cost(fn, txn)})-({cost(f'{P}!{c}22', f'{P}!{c}27')})"
+
+
+R = 6
+for s_i, name in enumerate(scenario_names):
+    live = name == "Base Case"
+    sc(ws11, R, 2, name.upper() + ("" if live else SNAPSHOT), font=section_font)
+    rows = [
+        ("Active Charms", 11, num_fmt, normal_font),
+        ("Cache Hit Ratio", 124, pct_fmt, bold_font),
+        ("Functions Invocations Avoided", 125, num_fmt, normal_font),
+        ("Table Transactions Avoided", 126, num_fmt, normal_font),
+        ("Latency Saved per View (ms)", 128, num_1dp, normal_font),
+        ("Infrastructure Saving ($/month)", None, currency_fmt, bold_font),
+    ]
+    for j, (label, src, fmt, font_) in enumerate(rows):
+        row = R + 1 + j
+        sc(ws11, row, 2, label, font=font_, border=thin_border)
+        for m in range(24):
+            c = get_column_letter(m + 3)
+            if live:
+                formula(ws11, row, m + 3, f"={P}!{c}{src}" if src else cache_saving_formula(c), font_, fmt)
+                continue
+            values = scn_proj[src][s_i] if src else no_cache_proj[43][s_i] - scn_proj[43][s_i]
+            sc(ws11, row, m + 3, float(values[m]), font=snapshot_font, number_format=fmt, border=thin_border)
+    R += len(rows) + 2
+
+# Hit ratio as the active base outgrows per-PoP capacity (long-tail charms)
+fleet_sizes = [10000, 50000, 100000, 250000, 1000000, 10000000]
+sc(ws11, R, 2, "LONG-TAIL HIT RATIO vs ACTIVE CHARMS (capacity-limited)", font=section_font)
+note(ws11, R, 6, "Conservative / Optimistic columns" + SNAPSHOT)
+section_header(ws11, R + 1, 2, 2 + len(scenario_names), ["Active Charms"] + scenario_names)
+for k, n in enumerate(fleet_sizes):
+    row = R + 2 + k
+    hit = scn["C165"] * (scn["C168"] + (scn["C174"] - scn["C168"]) * (scn["C170"] / n).clip(max=1))
+    sc(ws11, row, 2, f"{n:,}", font=normal_font, border=thin_border)
+    for s_i, name in enumerate(scenario_names):
+        if name == "Base Case":
+            formula(ws11, row, 3 + s_i,
+                    f"={ASM}!C165*({ASM}!C168+({ASM}!C174-{ASM}!C168)*MIN(1,{ASM}!C170/{n}))", normal_font, pct_fmt)
+        else:
+            sc(ws11, row, 3 + s_i, float(hit[s_i, 0]), font=snapshot_font, number_format=pct_fmt, border=thin_border)
+
+ws11.freeze_panes = "C5"
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SHEET 12: HOSTING PLANS — Consumption vs Premium vs Flex break-even
+# ═══════════════════════════════════════════════════════════════════════════════
+# Base Case reads the Projections plan rows (138-148) and finds each crossover
+# with MATCH; the volume table prices the same plans at fixed loads.
+crossover = plan_crossover(scn, scn_proj)
+
+ws12 = wb.create_sheet("Hosting Plans")
+ws12.sheet_properties.tabColor = "EF6C00"
+ws12.column_dimensions["A"].width = 3
+ws12.column_dimensions["B"].width = 44
+
+sc(ws12, 1, 2, "Azure Functions Hosting Plans — Cost & Cold Starts by Month", font=title_font)
+sc(ws12, 2, 2, "Row 22 invocation load priced per plan (Assumptions rows 189-204). Base Case is live; gray italic values are build-time snapshots.", font=Font(name="Calibri", italic=True, size=10, color="666666"))
+
+R = 4
+sc(ws12, R, 2, "", font=header_font, fill=header_fill)
+for m in range(1, 25):
+    col = m + 2
+    ws12.column_dimensions[get_column_letter(col)].width = 12
+    sc(ws12, R, col, f"Month {m}", font=header_font, fill=header_fill, alignment=Alignment(horizontal="center"))
+
+R = 6
+for s_i, name in enumerate(scenario_names):
+    live = name == "Base Case"
+    sc(ws12, R, 2, name.upper() + ("" if live else SNAPSHOT), font=section_font)
+    rows = [
+        ("Functions Invocations", 22, num_fmt, normal_font),
+        ("Consumption ($/month)", 140, currency_fmt, normal_font),
+        ("Premium EP1 ($/month)", 142, currency_fmt, normal_font),
+        ("Flex Consumption ($/month)", 143, currency_fmt, normal_font),
+        ("Cold-Start Probability — Consumption", 145, '0.00%', normal_font),
+        ("Expected Cold-Start ms — Consumption", 147, num_1dp, normal_font),
+        ("Expected Cold-Start ms — Flex", 148, num_1dp, normal_font),
+    ]
+    for j, (label, src, fmt, font_) in enumerate(rows):
+        row = R + 1 + j
+        sc(ws12, row, 2, label, font=font_, border=thin_border)
+        for m in range(24):
+            c = get_column_letter(m + 3)
+            if live:
+                formula(ws12, row, m + 3, f"={P}!{c}{src}", font_, fmt)
+            else:
+                sc(ws12, row, m + 3, float(scn_proj[src][s_i][m]), font=snapshot_font, number_format=fmt, border=thin_border)
+    R += len(rows) + 2
+
+sc(ws12, R, 2, "CROSSOVER MONTH vs CONSUMPTION (first month the plan is cheaper)", font=section_font)
+note(ws12, R, 6, "Conservative / Optimistic columns" + SNAPSHOT)
+section_header(ws12, R + 1, 2, 2 + len(scenario_names), ["Plan"] + scenario_names)
+for k, (plan, src) in enumerate(zip(PLAN_NAMES[1:], (142, 143)), start=1):
+    row = R + 2 + k - 1
+    sc(ws12, row, 2, plan, font=normal_font, border=thin_border)
+    for s_i, name in enumerate(scenario_names):
+        if name == "Base Case":
+            formula(ws12, row, 3 + s_i,
+                    f'=IFERROR("Month "&MATCH(1,INDEX(--({P}!C{src}:Z{src}<{P}!C140:Z140),0),0),"Not within 24 months")',
+                    bold_font, "General")
+            continue
+        month = int(crossover[s_i, k])
+        sc(ws12, row, 3 + s_i, f"Month {month}" if month else "Not within 24 months", font=snapshot_font, border=thin_border)
+R += 5
+
+# Break-even by volume — where each plan wins regardless of the sales ramp
+volumes = [1e6, 5e6, 10e6, 50e6, 100e6, 500e6, 1e9, 5e9]
+sc(ws12, R, 2, "BASE INPUTS — MONTHLY COST BY INVOCATION VOLUME", font=section_font)
+section_header(ws12, R + 1, 2, 8, ["Invocations / Month", "Consumption", "Premium EP1", "EP1 Instances",
+                                   "Flex Consumption", "Cold-Start % (Consumption)", "Cheapest"])
+for k, v in enumerate(volumes):
+    row = R + 2 + k
+    inv = f"$B{row}"
+    sc(ws12, row, 2, v, font=normal_font, number_format=num_fmt, border=thin_border)
+    # Same plan formulas as Projections rows 140-145, priced at a fixed load
+    formula(ws12, row, 3, "=" + tiered_formula("fn_executions", inv) + "+"
+            + tiered_formula("fn_gb_seconds", f"{inv}*({ASM}!C71/1000)*({ASM}!C72/1024)"), normal_font, currency_fmt)
+    formula(ws12, row, 4, f"=E{row}*{ASM}!C193", normal_font, currency_fmt)
+    formula(ws12, row, 5, f"=MAX({ASM}!C194,CEILING({inv}/2592000*{ASM}!C196*{ASM}!C71/1000/{ASM}!C195,1))",
+            normal_font, num_fmt)
+    formula(ws12, row, 6, "=" + tiered_formula("flex_executions", inv) + "+"
+            + tiered_formula("flex_gb_seconds", f"{inv}*({ASM}!C71/1000)*({ASM}!C199/1024)"
+                             f"/MIN({ASM}!C195,MAX(1,{inv}/2592000*{ASM}!C71/1000))")
+            + f"+{ASM}!C202*{ASM}!C199/1024*2592000*{ASM}!C203", normal_font, currency_fmt)
+    formula(ws12, row, 7, f"=EXP(-{inv}/43200*{ASM}!C191)", normal_font, '0.00%')
+    formula(ws12, row, 8, f'=IF(AND(C{row}<=D{row},C{row}<=F{row}),"{PLAN_NAMES[0]}",'
+            f'IF(D{row}<=F{row},"{PLAN_NAMES[1]}","{PLAN_NAMES[2]}"))', bold_font, "General")
+
+ws12.freeze_panes = "C5"
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SHEET 13: SCALE LIMITS — 10x / 100x / 1000x stress test timeline
+# ═══════════════════════════════════════════════════════════════════════════════
+# The base case at 1x (the Assumptions C208 multiplier the Projections sheet
+# runs at) is live. Larger multipliers and the other scenarios need their own
+# projection runs, so those are build-time snapshots.
+stress = stress_inputs(scn)
+stress_util = limit_utilization(stress, project(stress)).reshape(
+    len(scenario_names), len(STRESS_MULTIPLIERS), len(SCALE_LIMITS), -1)
+stress_first = first_crossing(stress_util)
+
+ws13 = wb.create_sheet("Scale Limits")
+ws13.sheet_properties.tabColor = "B71C1C"
+ws13.column_dimensions["A"].width = 3
+ws13.column_dimensions["B"].width = 38
+
+sc(ws13, 1, 2, "Scale Cliffs — Service Limits & Pricing Steps Under Stress", font=title_font)
+sc(ws13, 2, 2, "Launch sales (C18-C20) scaled by each multiplier; limits on Assumptions rows 206-214 and the free tiers. Base Case 1x is live; gray italic values are build-time snapshots.", font=Font(name="Calibri", italic=True, size=10, color="666666"))
+
+limit_fill = lambda k: red_fill if k < 5 else orange_fill  # noqa: E731
+
+# First month each limit is crossed — scenario x multiplier
+R = 4
+for s_i, name in enumerate(scenario_names):
+    sc(ws13, R, 2, f"{name.upper()} — FIRST MONTH CROSSED" + ("" if s_i == base_i else SNAPSHOT), font=section_font)
+    section_header(ws13, R + 1, 2, 2 + len(STRESS_MULTIPLIERS), ["Limit"] + [f"{x:,}x" for x in STRESS_MULTIPLIERS])
+    for k, (label, src, cell) in enumerate(SCALE_LIMITS):
+        row = R + 2 + k
+        sc(ws13, row, 2, label, font=normal_font, border=thin_border)
+        for j, mult in enumerate(STRESS_MULTIPLIERS):
+            if s_i == base_i and mult == 1:
+                formula(ws13, row, 3 + j,
+                        f'=IFERROR("Month "&MATCH(1,INDEX(--({P}!C{src}:Z{src}>{ASM}!{cell}),0),0),"—")',
+                        bold_font, "General")
+                ws13.cell(row=row, column=3 + j).alignment = Alignment(horizontal="center")
+                ws13.conditional_formatting.add(f"{get_column_letter(3 + j)}{row}", FormulaRule(
+                    formula=[f'{get_column_letter(3 + j)}{row}<>"—"'], fill=limit_fill(k)))
+                continue
+            month = int(stress_first[s_i, j, k])
+            sc(ws13, row, 3 + j, f"Month {month}" if month else "—", font=snapshot_font,
+               border=thin_border, alignment=Alignment(horizontal="center"),
+               fill=limit_fill(k) if month else None)
+    R += len(SCALE_LIMITS) + 3
+note(ws13, R - 1, 2, "Red = hard service limit (throttling / redesign); yellow = free allowance used up (pricing step)")
+
+# Utilization timeline for the base case at every multiplier
+R += 1
+for col in range(3, 27):
+    ws13.column_dimensions[get_column_letter(col)].width = 11
+for j, mult in enumerate(STRESS_MULTIPLIERS):
+    live = mult == 1
+    sc(ws13, R, 2, f"BASE CASE x{mult:,} — USAGE AS % OF LIMIT" + ("" if live else SNAPSHOT), font=section_font)
+    sc(ws13, R + 1, 2, "Limit", font=header_font, fill=header_fill)
+    for m in range(1, 25):
+        sc(ws13, R + 1, m + 2, f"Month {m}", font=header_font, fill=header_fill, alignment=Alignment(horizontal="center"))
+    for k, (label, src, cell) in enumerate(SCALE_LIMITS):
+        row = R + 2 + k
+        sc(ws13, row, 2, label, font=normal_font, border=thin_border)
+        for m in range(24):
+            c = get_column_letter(m + 3)
+            if live:
+                # A zero allowance is used up by the first unit — no finite percentage
+                formula(ws13, row, m + 3,
+                        f'=IF({ASM}!{cell}>0,{P}!{c}{src}/{ASM}!{cell},IF({P}!{c}{src}>0,"∞",0))', normal_font, '0%')
+                ws13.cell(row=row, column=m + 3).alignment = Alignment(horizontal="right")
+                continue
+            u = float(stress_util[base_i, j, k, m])
+            sc(ws13, row, m + 3, u if u != float("inf") else "∞", font=snapshot_font, number_format='0%',
+               border=thin_border, alignment=Alignment(horizontal="right"),
+               fill=limit_fill(k) if u > 1 else None)
+        if live:
+            ws13.conditional_formatting.add(f"C{row}:Z{row}", FormulaRule(
+                formula=[f'OR(C{row}="∞",AND(ISNUMBER(C{row}),C{row}>1))'], fill=limit_fill(k)))
+    R += len(SCALE_LIMITS) + 3
+
+ws13.freeze_panes = "C4"
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SHEET 14: MEDIA MIX — which media type drives each cost line
+# ═══════════════════════════════════════════════════════════════════════════════
+# Base Case splits the month-24 Projections cost lines by the per-type driver
+# rows (163-177) with formulas; the other scenarios are build-time snapshots.
+media_costs = media_cost_attribution(scn, scn_proj)
+# Cost line -> (Projections cost rows, driver offset within each media block)
+MEDIA_LINES = {
+    "Storage (R2 + Azure)": ((31, 36), 0),
+    "Upload writes (R2 + Azure)": ((32, 37), 1),
+    "R2 reads (Class B)": ((38,), 3),
+    "Azure fallback reads + egress": ((33, 34), 4),
+    "Functions + Table": ((40, 41), 2),
+}
+
+ws14 = wb.create_sheet("Media Mix")
+ws14.sheet_properties.tabColor = "8E24AA"
+ws14.column_dimensions["A"].width = 3
+ws14.column_dimensions["B"].width = 40
+for col in "CDEFG":
+    ws14.column_dimensions[col].width = 16
+
+sc(ws14, 1, 2, "Media Mix — Month-24 Cost by Media Type", font=title_font)
+sc(ws14, 2, 2, "Each cost line split by its driver (GB, objects, GETs, bandwidth, views) from Projections rows 163-177. Base Case is live; gray italic blocks are build-time snapshots.", font=Font(name="Calibri", italic=True, size=10, color="666666"))
+
+type_cols = "".join(get_column_letter(3 + t) for t in range(len(MEDIA_TYPES)))
+largest = lambda row: (f'=IF(SUM(C{row}:E{row})>0,CHOOSE(MATCH(MAX(C{row}:E{row}),C{row}:E{row},0),'  # noqa: E731
+                       + ",".join(f'"{t}"' for t in MEDIA_TYPES) + '),"—")')
+
+R = 4
+for s_i, name in enumerate(scenario_names):
+    live = s_i == base_i
+    font_ = normal_font if live else snapshot_font
+    sc(ws14, R, 2, name.upper() + ("" if live else SNAPSHOT), font=section_font)
+    section_header(ws14, R + 1, 2, 6, ["Cost Line ($/month)"] + list(MEDIA_TYPES) + ["Largest Driver"])
+    totals = [0.0] * len(MEDIA_TYPES)
+    for k, (label, values) in enumerate(media_costs.items()):
+        row = R + 2 + k
+        sc(ws14, row, 2, label, font=normal_font, border=thin_border)
+        if live:
+            cost_rows, offset = MEDIA_LINES[label]
+            line = "+".join(f"{P}!$Z${r}" for r in cost_rows)
+            drivers = "+".join(f"{P}!$Z${base + offset}" for base in MEDIA_ROWS)
+            for t, base in enumerate(MEDIA_ROWS):
+                formula(ws14, row, 3 + t, f"=({line})*{P}!$Z${base + offset}/MAX({drivers},1E-12)",
+                        normal_font, currency_micro)
+            formula(ws14, row, 6, largest(row), bold_font, "General")
+            continue
+        for t in range(len(MEDIA_TYPES)):
+            totals[t] += float(values[s_i, t])
+            sc(ws14, row, 3 + t, float(values[s_i, t]), font=font_, number_format=currency_micro, border=thin_border)
+        sc(ws14, row, 6, MEDIA_TYPES[int(values[s_i].argmax())] if values[s_i].sum() > 0 else "—",
+           font=font_, border=thin_border)
+    first, row = R + 2, R + 2 + len(media_costs)
+    sc(ws14, row, 2, "TOTAL", font=bold_font, border=thin_border, fill=red_fill)
+    for t, total in enumerate(totals):
+        c = type_cols[t]
+        if live:
+            formula(ws14, row, 3 + t, f"=SUM({c}{first}:{c}{row - 1})", bold_font, currency_micro, fill=red_fill)
+        else:
+            sc(ws14, row, 3 + t, total, font=snapshot_font, number_format=currency_micro, border=thin_border, fill=red_fill)
+    # Per-type optimization headroom: what a 25% size cut on that type saves
+    row += 1
+    sc(ws14, row, 2, "Saving if this type's files were 25% smaller", font=normal_font, border=thin_border)
+    storage_row, fallback_row = first, first + list(media_costs).index("Azure fallback reads + egress")
+    for t in range(len(MEDIA_TYPES)):
+        c = type_cols[t]
+        if live:
+            formula(ws14, row, 3 + t, f"=0.25*({c}{storage_row}+{c}{fallback_row})", normal_font, currency_micro)
+            continue
+        size_driven = (float(media_costs["Storage (R2 + Azure)"][s_i, t])
+                       + float(media_costs["Azure fallback reads + egress"][s_i, t]))
+        sc(ws14, row, 3 + t, 0.25 * size_driven, font=font_, number_format=currency_micro, border=thin_border,
+           fill=green_fill if t == int(media_costs["Storage (R2 + Azure)"][s_i].argmax()) else None)
+    if live:
+        ws14.conditional_formatting.add(f"C{row}:E{row}", FormulaRule(
+            formula=[f"AND(C{storage_row}>0,C{storage_row}=MAX($C${storage_row}:$E${storage_row}))"], fill=green_fill))
+    row += 1
+    sc(ws14, row, 2, "Stored GB at month 24", font=normal_font, border=thin_border)
+    for t, base in enumerate(MEDIA_ROWS):
+        if live:
+            formula(ws14, row, 3 + t, f"={P}!$Z${base}", normal_font, num_1dp)
+        else:
+            sc(ws14, row, 3 + t, float(scn_proj[base][s_i, -1]), font=font_, number_format=num_1dp, border=thin_border)
+    row += 1
+    sc(ws14, row, 2, "R2 GETs in month 24", font=normal_font, border=thin_border)
+    for t, base in enumerate(MEDIA_ROWS):
+        if live:
+            formula(ws14, row, 3 + t, f"={P}!$Z${base + 3}", normal_font, num_fmt)
+        else:
+            sc(ws14, row, 3 + t, float(scn_proj[base + 3][s_i, -1]), font=font_, number_format=num_fmt, border=thin_border)
+    R = row + 3
+note(ws14, R - 2, 2, "Free allowances are shared, so a line inside its free tier attributes $0 to every type.")
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SHEET 15: RECOMPRESSION — does a transcoding pipeline pay for itself?
+# ═══════════════════════════════════════════════════════════════════════════════
+# Per-charm economics and the base-case cohort net are formulas over the
+# Assumptions recompression rows. The fleet view compares two full projection
+# runs (pipeline on vs off), so it is a build-time snapshot.
+recomp_on = derive({**scn, "C236": scn["C236"] * 0 + 1})
+recomp_off = derive({**scn, "C236": scn["C236"] * 0})
+recomp_on_proj, recomp_off_proj = project(recomp_on), project(recomp_off)
+recomp_per = recompression_per_charm(recomp_on)
+recomp_cohorts = recompression_cohorts(recomp_on, recomp_on_proj)
+
+ws15 = wb.create_sheet("Recompression")
+ws15.sheet_properties.tabColor = "558B2F"
+ws15.column_dimensions["A"].width = 3
+ws15.column_dimensions["B"].width = 40
+
+sc(ws15, 1, 2, "Server-Side Recompression — Break-Even by Media Type, Cohort & Scenario", font=title_font)
+sc(ws15, 2, 2, "Ratios, eligibility and compute on Assumptions rows 234-244. Fleet view is a build-time snapshot (on vs off); gray italic values are snapshots.", font=Font(name="Calibri", italic=True, size=10, color="666666"))
+
+# Per-charm economics (base case, marginal rates)
+R = 4
+sc(ws15, R, 2, "BASE CASE — PER CHARM (marginal rates, free tiers ignored)", font=section_font)
+headers = ["Media Type", "Compute $ / Charm", "MB Saved", "Saving $ / Month", "Break-Even (months)"] + \
+          [f"Net {label}" for label, _, _ in TIER_LIFETIMES]
+section_header(ws15, R + 1, 2, 1 + len(headers), headers)
+for col in range(3, 3 + len(headers)):
+    ws15.column_dimensions[get_column_letter(col)].width = 16
+# Marginal $ saved per GB-month not stored: R2 + Azure storage and fallback retrieval/egress
+per_gb = (f"({ASM}!C55+{ASM}!C47+({ASM}!C38*3+{ASM}!C39*9)/12*{ASM}!C152*({ASM}!C50+{ASM}!C51))")
+per_charm_rows = {}
+for t, (label, (col, size_row)) in enumerate(zip(MEDIA_TYPES, MEDIA_COLUMNS)):
+    row = per_charm_rows[col] = R + 2 + t
+    sc(ws15, row, 2, label, font=normal_font, border=thin_border)
+    formula(ws15, row, 3, f"={ASM}!{col}242", normal_font, currency_micro)
+    formula(ws15, row, 4, f"={ASM}!C{size_row}*(1-{ASM}!{col}241)", normal_font, num_2dp)
+    formula(ws15, row, 5, f"=D{row}/1024*{per_gb}", normal_font, currency_micro)
+    formula(ws15, row, 6, f"=IF(E{row}>0,C{row}/E{row},0)", normal_font, num_1dp)
+    for k, (_, _, months) in enumerate(TIER_LIFETIMES):
+        formula(ws15, row, 7 + k, f"=E{row}*{months}-C{row}", bold_font, currency_micro)
+net_cols = f"G{R + 2}:{get_column_letter(6 + len(TIER_LIFETIMES))}{R + 1 + len(MEDIA_TYPES)}"
+ws15.conditional_formatting.add(net_cols, FormulaRule(formula=[f"G{R + 2}>0"], fill=green_fill))
+ws15.conditional_formatting.add(net_cols, FormulaRule(formula=[f"G{R + 2}<=0"], fill=red_fill))
+R += 7
+
+# Fleet view over the projection horizon (free tiers applied)
+fleet_saving = recomp_off_proj[43] - (recomp_on_proj[43] - recomp_on_proj[180])
+fleet_net = (fleet_saving - recomp_on_proj[180]).cumsum(axis=-1)
+sc(ws15, R, 2, "", font=header_font, fill=header_fill)
+for m in range(1, 25):
+    sc(ws15, R, m + 2, f"Month {m}", font=header_font, fill=header_fill, alignment=Alignment(horizontal="center"))
+R += 1
+for s_i, name in enumerate(scenario_names):
+    sc(ws15, R, 2, f"{name.upper()} — FLEET (free tiers applied)" + SNAPSHOT, font=section_font)
+    rows = [
+        ("Transcoding compute ($)", recomp_on_proj[180][s_i], currency_fmt),
+        ("Infrastructure saving ex-compute ($)", fleet_saving[s_i], currency_fmt),
+        ("Cumulative net ($)", fleet_net[s_i], currency_fmt),
+        ("Stored GB avoided (cumulative)", recomp_on_proj[181][s_i], num_1dp),
+    ]
+    for j, (label, values, fmt) in enumerate(rows):
+        row = R + 1 + j
+        sc(ws15, row, 2, label, font=bold_font if j == 2 else normal_font, border=thin_border)
+        for m in range(24):
+            sc(ws15, row, m + 3, float(values[m]), font=snapshot_font, number_format=fmt, border=thin_border)
+    R += len(rows) + 2
+
+# Cohort lifetime net — each month's sales over their tier lifetimes
+sc(ws15, R, 2, "COHORT LIFETIME NET SAVING (marginal rates, by tier mix)", font=section_font)
+note(ws15, R, 6, "Conservative / Optimistic columns" + SNAPSHOT)
+section_header(ws15, R + 1, 2, 2 + len(scenario_names), ["Sales Cohort"] + scenario_names)
+mix = lambda c: "+".join(f"{ASM}!D{r}*${c}${per_charm_rows[col]}" for col, r in MEDIA_COLUMNS)  # noqa: E731
+base_col = get_column_letter(3 + base_i)
+for m in range(24):
+    row = R + 2 + m
+    c = get_column_letter(m + 3)
+    sc(ws15, row, 2, f"Month {m + 1}", font=normal_font, border=thin_border)
+    for s_i in range(len(scenario_names)):
+        if s_i == base_i:
+            net = "+".join(f"{P}!{c}{tier_row}*{ASM}!C34*(({mix('E')})*{months}-({mix('C')})*{ASM}!C118)"
+                           for _, tier_row, months in TIER_LIFETIMES)
+            formula(ws15, row, 3 + s_i, f"={net}", normal_font, currency_fmt)
+            continue
+        v = float(recomp_cohorts[s_i, m])
+        sc(ws15, row, 3 + s_i, v, font=snapshot_font, number_format=currency_fmt, border=thin_border,
+           fill=green_fill if v > 0 else red_fill)
+cohort_cells = f"{base_col}{R + 2}:{base_col}{R + 25}"
+ws15.conditional_formatting.add(cohort_cells, FormulaRule(formula=[f"{base_col}{R + 2}>0"], fill=green_fill))
+ws15.conditional_formatting.add(cohort_cells, FormulaRule(formula=[f"{base_col}{R + 2}<=0"], fill=red_fill))
+row = R + 26
+sc(ws15, row, 2, "All 24 cohorts", font=bold_font, border=thin_border)
+for s_i in range(len(scenario_names)):
+    if s_i == base_i:
+        formula(ws15, row, 3 + s_i, f"=SUM({base_col}{R + 2}:{base_col}{R + 25})", bold_font, currency_fmt)
+    else:
+        sc(ws15, row, 3 + s_i, float(recomp_cohorts[s_i].sum()), font=snapshot_font, number_format=currency_fmt,
+           border=thin_border)
+
+ws15.freeze_panes = "C4"
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SHEET 16: DEFERRED RUNOFF — cohort recognition to the end of every lifetime
+# ═══════════════════════════════════════════════════════════════════════════════
+# Snapshot: returns reach the books through a lag-kernel convolution and every
+# cohort runs out to month 384, so the whole table is evaluated at build time.
+runoff = {method: deferred_waterfall(scn, scn_proj, method) for method in RECOGNITION_METHODS}
+runoff_fields = [("New Deferrals", "new_deferrals"), ("Return Reversals", "reversals"),
+                 ("Recognized", "recognition"), ("Closing Balance", "balance")]
+
+ws16 = wb.create_sheet("Deferred Runoff")
+ws16.sheet_properties.tabColor = "1565C0"
+ws16.column_dimensions["A"].width = 3
+ws16.column_dimensions["B"].width = 16
+
+sc(ws16, 1, 2, "Deferred Revenue Runoff — Every Sales Cohort to the End of Its Lifetime" + SNAPSHOT, font=title_font)
+sc(ws16, 2, 2, "Long format (one row per scenario x month) for pivoting. Recognition is on units net of returns; "
+               "Revenue Recognition rows 68-76 reconcile months 1-24 with its gross-unit schedule. "
+               "Values are computed at build time — re-run the generator after editing Assumptions.",
+   font=Font(name="Calibri", italic=True, size=10, color="666666"))
+
+headers = ["Scenario", "Month"] + [f"{method}: {label}" for method in RECOGNITION_METHODS for label, _ in runoff_fields]
+section_header(ws16, 4, 2, 1 + len(headers), headers)
+for col in range(3, 2 + len(headers)):
+    ws16.column_dimensions[get_column_letter(col)].width = 18
+horizon = runoff["Hybrid"]["balance"].shape[-1]
+R = 5
+for s_i, name in enumerate(scenario_names):
+    for m in range(horizon):
+        sc(ws16, R, 2, name, font=normal_font)
+        sc(ws16, R, 3, m + 1, font=normal_font, number_format=num_fmt)
+        col = 4
+        for method in RECOGNITION_METHODS:
+            for _, key in runoff_fields:
+                sc(ws16, R, col, float(runoff[method][key][s_i, m]), font=snapshot_font, number_format=currency_whole)
+                col += 1
+        R += 1
+ws16.auto_filter.ref = f"B4:{get_column_letter(1 + len(headers))}{R - 1}"
+
+# Revenue Recognition reconciliation rows pull the base case's runoff recognition
+base_runoff_row = 5 + scenario_names.index("Base Case") * horizon
+for method, (row, _) in RECON_ROWS.items():
+    rec_col = get_column_letter(4 + RECOGNITION_METHODS.index(method) * len(runoff_fields)
+                                + [key for _, key in runoff_fields].index("recognition"))
+    for m in range(1, 25):
+        cell = ws6.cell(row=row + 1, column=m + 2)
+        cell.value = f"='Deferred Runoff'!{rec_col}{base_runoff_row + m - 1}"
+        cell.font = normal_font; cell.number_format = currency_whole; cell.border = thin_border
+
+# Summary beside the long table
+S = 2 + len(headers) + 1
+ws16.column_dimensions[get_column_letter(S)].width = 34
+sc(ws16, 4, S, "RUNOFF SUMMARY", font=section_font)
+section_header(ws16, 5, S, S + len(scenario_names), ["Metric"] + scenario_names)
+summary = []
+for method in RECOGNITION_METHODS:
+    bal = runoff[method]["balance"]
+    peak, peak_month = bal.max(axis=-1), bal.argmax(axis=-1)
+    after_peak = range(horizon) > peak_month[:, None]
+    summary += [
+        (f"{method}: peak balance", peak, currency_whole),
+        (f"{method}: peak month", peak_month + 1, num_fmt),
+        (f"{method}: half run off (month)", (after_peak & (bal < peak[:, None] / 2)).argmax(axis=-1) + 1, num_fmt),
+        (f"{method}: total reversed", runoff[method]["reversals"].sum(axis=-1), currency_whole),
+    ]
+for j, (label, values, fmt) in enumerate(summary):
+    sc(ws16, 6 + j, S, label, font=normal_font, border=thin_border)
+    for s_i in range(len(scenario_names)):
+        sc(ws16, 6 + j, S + 1 + s_i, float(values[s_i]), font=snapshot_font, number_format=fmt, border=thin_border)
+
+ws16.freeze_panes = "D5"
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SHEET 17: OBLIGATION NPV — discounted hosting owed vs the deferred pool
+# ═══════════════════════════════════════════════════════════════════════════════
+# Base Case flat and PV obligations are formulas: each service group's PV owed
+# (rows below the blocks) sums every cohort's remaining months at the
+# Assumptions PV factor. Monte Carlo bands are build-time snapshots.
+obligation = obligation_coverage(scn, scn_proj, runoff["Hybrid"]["balance"])
+
+ws17 = wb.create_sheet("Obligation NPV")
+ws17.sheet_properties.tabColor = "1565C0"
+ws17.column_dimensions["A"].width = 3
+ws17.column_dimensions["B"].width = 46
+
+sc(ws17, 1, 2, "Hosting Obligation NPV — Remaining Hosting Owed per Cohort vs Deferred Pool", font=title_font)
+sc(ws17, 2, 2, f"Discount rate and price declines on Assumptions rows 247-256; Monte Carlo = {obligation['draws']:,} draws "
+               "per scenario. Units net of returns; each cohort owes only its remaining lifetime months. "
+               "Gray italic values are build-time snapshots.",
+   font=Font(name="Calibri", italic=True, size=10, color="666666"))
+
+R = 4
+sc(ws17, R, 2, "", font=header_font, fill=header_fill)
+for m in range(1, 25):
+    ws17.column_dimensions[get_column_letter(m + 2)].width = 13
+    sc(ws17, R, m + 2, f"Month {m}", font=header_font, fill=header_fill, alignment=Alignment(horizontal="center"))
+R += 1
+block_rows = 10
+group_R = 5 + len(scenario_names) * block_rows + len(SERVICE_GROUPS) + 3      # PV owed by group, base case
+cohort_row = group_R + 1 + len(SERVICE_GROUPS)
+bal_col = get_column_letter(4 + [key for _, key in runoff_fields].index("balance"))  # Hybrid balance
+for s_i, name in enumerate(scenario_names):
+    live = s_i == base_i
+    sc(ws17, R, 2, name.upper() + ("" if live else SNAPSHOT), font=section_font)
+    if live:
+        base_pv_row = R + 2
+    rows = [
+        ("Flat obligation (today's price x full lifetime)", obligation["flat"][s_i], currency_whole, None),
+        ("PV of remaining obligation", obligation["pv"][s_i], currency_whole, bold_font),
+        ("  Monte Carlo P10", obligation["pv_p10"][s_i], currency_whole, None),
+        ("  Monte Carlo P90", obligation["pv_p90"][s_i], currency_whole, None),
+        ("Hybrid deferred balance (Deferred Runoff snapshot)", obligation["pool"][s_i], currency_whole, None),
+        ("PV coverage ratio", obligation["coverage"][s_i], pct_fmt, bold_font),
+        ("  Coverage P10 (stress)", obligation["coverage_p10"][s_i], pct_fmt, None),
+        ("  P(coverage < 100%)", obligation["shortfall_prob"][s_i], pct_fmt, None),
+    ]
+    live_rows = {
+        0: lambda m, c: (f"=({'+'.join(f'SUM({P}!$C${r}:{c}{r})*{months}' for _, r, months in TIER_LIFETIMES)})"
+                         f"*{PCC}!$C$119"),
+        1: lambda m, c: f"=SUM({c}{group_R + 1}:{c}{group_R + len(SERVICE_GROUPS)})",
+        4: lambda m, c: f"='Deferred Runoff'!{bal_col}{base_runoff_row + m}",
+        5: lambda m, c: f"=IF({c}{R + 2}>0,{c}{R + 5}/{c}{R + 2},0)",
+    }
+    for j, (label, values, fmt, font_) in enumerate(rows):
+        row = R + 1 + j
+        sc(ws17, row, 2, label, font=font_ or normal_font, border=thin_border)
+        for m in range(24):
+            c = get_column_letter(m + 3)
+            if live and j in live_rows:
+                formula(ws17, row, m + 3, live_rows[j](m, c), font_ or normal_font, fmt)
+            else:
+                sc(ws17, row, m + 3, float(values[m]), font=snapshot_font, number_format=fmt, border=thin_border)
+    if live:
+        ws17.conditional_formatting.add(f"C{R + 6}:Z{R + 6}", FormulaRule(formula=[f"C{R + 6}>=1"], fill=green_fill))
+        ws17.conditional_formatting.add(f"C{R + 6}:Z{R + 6}", FormulaRule(formula=[f"C{R + 6}<1"], fill=red_fill))
+    else:
+        for m in range(24):
+            ws17.cell(row=R + 6, column=m + 3).fill = green_fill if rows[5][1][m] >= 1 else red_fill
+    R += block_rows
+
+# Revenue Recognition row 66: same remaining-PV basis as the coverage rows above
+for m in range(1, 25):
+    c = get_column_letter(m + 2)
+    obl = f"'Obligation NPV'!{c}{base_pv_row}"
+    cell = ws6.cell(row=66, column=m + 2)
+    cell.value = f"=IF({obl}>0,{c}62/{obl},0)"
+    cell.font = bold_font; cell.number_format = pct_fmt; cell.border = thin_border
+
+# Per-charm PV by group and tier (base case) — reads Per-Charm Costs rows 114-118
+sc(ws17, R, 2, "BASE CASE — PV PER CHARM BY SERVICE GROUP", font=section_font)
+section_header(ws17, R + 1, 2, 6, ["Service Group", "$/Month Today"] + [f"PV {label}" for label, _, _ in TIER_LIFETIMES])
+for g, label in enumerate(SERVICE_GROUPS):
+    row = R + 2 + g
+    sc(ws17, row, 2, label, font=normal_font, border=thin_border)
+    formula(ws17, row, 3, f"={PCC}!C{114 + g}", normal_font, cost_6dp)
+    for k in range(len(TIER_LIFETIMES)):
+        formula(ws17, row, 4 + k, f"={PCC}!{get_column_letter(4 + k)}{114 + g}", normal_font, cost_4dp)
+
+# PV still owed per service group at each month end (base case), summed into the PV row:
+# sum over cohorts c <= m of kept units x (1 - q^(L-m+c)) / (1-q), at month m's declined price
+R = group_R
+sc(ws17, R, 2, "BASE CASE — PV OF REMAINING OBLIGATION BY SERVICE GROUP", font=section_font)
+for g, label in enumerate(SERVICE_GROUPS):
+    row = R + 1 + g
+    r = SERVICE_GROUP_ROWS[g]
+    q, drift = f"{ASM}!$D${r}", f"(1-{ASM}!$C${r})^(1/12)"
+    sc(ws17, row, 2, f"  {label}", font=normal_font, border=thin_border)
+    for m in range(1, 25):
+        c = get_column_letter(m + 2)
+        cohorts = f"$C${cohort_row}" if m == 1 else f"$C${cohort_row}:{c}{cohort_row}"
+        units = lambda tr: f"{P}!$C${tr}" if m == 1 else f"{P}!$C${tr}:{c}{tr}"  # noqa: E731
+        # Month 1 has a single cohort — a plain product, not SUMPRODUCT over a one-cell range
+        total = (lambda x: x) if m == 1 else (lambda x: f"SUMPRODUCT({x})")  # noqa: E731
+        flat = "+".join(total(f"{units(tr)}*({months}-{m}+{cohorts})") for _, tr, months in TIER_LIFETIMES)
+        disc = "+".join(total(f"{units(tr)}*(1-{q}^({months}-{m}+{cohorts}))") for _, tr, months in TIER_LIFETIMES)
+        formula(ws17, row, m + 2,
+                f"=(1-{ASM}!$C$96)*{PCC}!$C${114 + g}*{drift}^{m - 1}*IF({q}=1,{flat},({disc})/(1-{q}))",
+                normal_font, currency_whole)
+sc(ws17, cohort_row, 2, "Sales cohort (month #)", font=note_font)
+for m in range(1, 25):
+    sc(ws17, cohort_row, m + 2, m, font=note_font)
+
+ws17.freeze_panes = "C5"
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SHEET 18+: PORTFOLIO — consolidated P&L and one sheet per product
+# ═══════════════════════════════════════════════════════════════════════════════
+product_names, product_lines, portfolio_total = portfolio(scn)
+
+PNL_ROWS = [
+    ("Charms Sold (units)", "units", num_fmt, None),
+    ("Active Charms (cumulative claimed)", "active", num_fmt, None),
+    ("Charm Revenue", "charm_revenue", currency_whole, None),
+    ("Upsell Revenue", "upsell_revenue", currency_whole, None),
+    ("TOTAL REVENUE", "revenue", currency_whole, green_fill),
+    ("COGS", "cogs", currency_whole, None),
+    ("GROSS PROFIT", "gross_profit", currency_whole, green_fill),
+    ("Infrastructure (shared pool, allocated)", "infra_shared", currency_whole, None),
+    ("  Infrastructure if run standalone", "infra_standalone", currency_whole, None),
+    ("Marketing", "marketing", currency_whole, None),
+    ("Fulfillment", "fulfillment", currency_whole, None),
+    ("Payment Processing", "processing", currency_whole, None),
+    ("Support & Overhead (shared, by units)", "overhead", currency_whole, None),
+    ("EBITDA", "ebitda", currency_whole, green_fill),
+]
+
+
+def write_pnl(ws_, start, lines_, extra=()):
+    """Month-by-month P&L block (base case) from portfolio() lines; returns the next free row."""
+    sc(ws_, start, 2, "", font=header_font, fill=header_fill)
+    for m in range(1, 25):
+        ws_.column_dimensions[get_column_letter(m + 2)].width = 13
+        sc(ws_, start, m + 2, f"Month {m}", font=header_font, fill=header_fill, alignment=Alignment(horizontal="center"))
+    sc(ws_, start, 27, "24-Mo Total", font=header_font, fill=header_fill, alignment=Alignment(horizontal="center"))
+    ws_.column_dimensions["AA"].width = 15
+    row = start + 1
+    for label, key, fmt, fill in list(PNL_ROWS) + list(extra):
+        values = lines_[key][base_i]
+        font_ = bold_font if fill else normal_font
+        sc(ws_, row, 2, label, font=font_, border=thin_border, fill=fill)
+        for m in range(24):
+            sc(ws_, row, m + 3, float(values[m]), font=font_, number_format=fmt, border=thin_border, fill=fill)
+        total = values[-1] if key == "active" else values.sum()
+        sc(ws_, row, 27, float(total), font=bold_font, number_format=fmt, border=thin_border, fill=fill)
+        row += 1
+    return row
+
+
+ws18 = wb.create_sheet("Portfolio P&L")
+ws18.sheet_properties.tabColor = "2E7D32"
+ws18.column_dimensions["A"].width = 3
+ws18.column_dimensions["B"].width = 42
+sc(ws18, 1, 2, "Portfolio P&L — MemoryCharm + Rug Charm on Shared Infrastructure (Base Case)", font=title_font)
+sc(ws18, 2, 2, "One project() pass over products x scenarios. Infra priced on the combined load (free tiers, "
+               "volume bands, CIAM MAU band), then allocated by each product's usage.",
+   font=Font(name="Calibri", italic=True, size=10, color="666666"))
+R = write_pnl(ws18, 4, portfolio_total, extra=[
+    ("  Scale economies (standalone - shared infra)", "scale_savings", currency_whole, None),
+    ("Tax (on positive EBITDA)", "tax", currency_whole, None),
+    ("NET INCOME", "net_income", currency_whole, green_fill),
+])
+
+R += 1
+sc(ws18, R, 2, "24-MONTH TOTALS BY SCENARIO", font=section_font)
+section_header(ws18, R + 1, 2, 2 + len(scenario_names), ["Metric"] + scenario_names)
+summary = [(f"{name}: revenue", product_lines["revenue"][n]) for n, name in enumerate(product_names)]
+summary += [(f"{name}: EBITDA", product_lines["ebitda"][n]) for n, name in enumerate(product_names)]
+summary += [("Portfolio EBITDA", portfolio_total["ebitda"]), ("Scale economies", portfolio_total["scale_savings"]),
+            ("Portfolio net income", portfolio_total["net_income"])]
+for j, (label, values) in enumerate(summary):
+    row = R + 2 + j
+    sc(ws18, row, 2, label, font=normal_font, border=thin_border)
+    for s_i in range(len(scenario_names)):
+        sc(ws18, row, 3 + s_i, float(values[s_i].sum()), font=normal_font, number_format=currency_whole, border=thin_border)
+note(ws18, R + 3 + len(summary), 2, "Rug Charm price, volume and growth vary by scenario (Assumptions rows 281-285); "
+                                     "its other inputs (rows 270-279) are shared")
+note(ws18, R + 4 + len(summary), 2, "Snapshot computed at build time — re-run the generator after editing Assumptions")
+ws18.freeze_panes = "C5"
+
+for n, name in enumerate(product_names):
+    ws_p = wb.create_sheet(f"Product - {name}")
+    ws_p.sheet_properties.tabColor = "66BB6A"
+    ws_p.column_dimensions["A"].width = 3
+    ws_p.column_dimensions["B"].width = 42
+    sc(ws_p, 1, 2, f"{name} — Product P&L on Shared Infrastructure (Base Case)", font=title_font)
+    write_pnl(ws_p, 4, {key: values[n] for key, values in product_lines.items()})
+    ws_p.freeze_panes = "C5"
+
+
 # ── Save ─────────────────────────────────────────────────────────────────────
 output_path = r"c:\Users\appli\source\repos\MemoryCharm\MemoryCharm_Financial_Model.xlsx"
 wb.save(output_path)
@@ -0,0 +1,308 @@
+"""
+Render a MemoryCharm deck to PNG without an office suite, and diff the
+renders against stored baselines. Covers exactly what generate_deck.py draws:
+solid slide backgrounds, rectangles, rounded rectangles, ovals, single-run
+text boxes, placed screenshots and line charts (sketched as polylines). Text
+is wrapped with the same advance tables the generator's overflow check uses,
+so a render shows the layout the build measured. Baselines are only written
+or compared when the theme font (Segoe UI or Selawik) is installed; without
+it the render is a rough preview in Pillow's bundled face.
+"""
+
+import argparse
+import io
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from PIL import Image, ImageChops, ImageDraw, ImageFont
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+from pptx.enum.text import PP_ALIGN
+from pptx.oxml.ns import qn
+
+from generate_deck import (
+    OUTPUT_DIR, TEXT_INSET_X, TEXT_INSET_Y, THEME_FONT, THEME_TEXT, glyph_advances, wrap_text,
+)
+
+RENDER_DPI = 96                 # 1280 x 720 for the 13.333" x 7.5" slide
+DIFF_TOLERANCE = 24             # per-channel difference treated as antialiasing noise
+DIFF_HIGHLIGHT = (255, 0, 96)
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "deck_baselines")
+DEFAULT_DECK = os.path.join(OUTPUT_DIR, "MemoryCharm_ClaimFlow_UX_v2.pptx")
+
+ALIGN = {PP_ALIGN.CENTER: "center", PP_ALIGN.RIGHT: "right"}
+
+
+# ── Slide -> primitives ──────────────────────────────────────────────────
+# Parsed in the parent process into plain tuples and dicts, so the workers
+# only draw and never touch the pptx package.
+
+def _hex(el):
+    """RGB tuple from the first srgbClr under el, or None."""
+    clr = el.find(".//" + qn("a:srgbClr")) if el is not None else None
+    return tuple(bytes.fromhex(clr.get("val"))) if clr is not None else None
+
+
+def _fill(spPr):
+    solid = spPr.find(qn("a:solidFill"))
+    return _hex(solid)
+
+
+def _line(spPr):
+    """(colour, width EMU) of an explicit solid outline, else None."""
+    ln = spPr.find(qn("a:ln"))
+    if ln is None or ln.find(qn("a:solidFill")) is None:
+        return None
+    return _hex(ln.find(qn("a:solidFill"))), int(ln.get("w", 12700))
+
+
+def _geometry(spPr):
+    """("rect" | "roundRect" | "ellipse", corner adjustment) from the preset geometry."""
+    geom = spPr.find(qn("a:prstGeom"))
+    prst = geom.get("prst") if geom is not None else "rect"
+    adj = 0.16667
+    for gd in geom.iter(qn("a:gd")) if geom is not None else ():
+        if gd.get("name") == "adj":
+            adj = int(gd.get("fmla").split()[1]) / 100000
+    return prst, adj
+
+
+def _text(shape):
+    """The single styled run of a text frame as a dict, or None when empty."""
+    if not shape.has_text_frame:
+        return None
+    paragraph = shape.text_frame.paragraphs[0]
+    if not paragraph.runs or not paragraph.runs[0].text:
+        return None
+    run = paragraph.runs[0]
+    body = shape.text_frame._txBody.bodyPr
+    return dict(
+        text=run.text,
+        size=run.font.size.pt,
+        color=tuple(run.font.color.rgb) if run.font.color.type is not None else tuple(THEME_TEXT),
+        bold=bool(run.font.bold),
+        font=run.font.name or THEME_FONT,
+        align=ALIGN.get(paragraph.alignment, "left"),
+        wrap=body.get("wrap") != "none",
+        anchor=body.get("anchor", "t"),
+        insets=(int(body.get("lIns", TEXT_INSET_X)), int(body.get("tIns", TEXT_INSET_Y)),
+                int(body.get("rIns", TEXT_INSET_X)), int(body.get("bIns", TEXT_INSET_Y))),
+    )
+
+
+def slide_primitives(slide):
+    """(background colour, [primitive dicts in z-order]) for one slide."""
+    # Slide, then layout, then master background
+    for part in (slide, slide.slide_layout, slide.slide_layout.slide_master):
+        bg = part._element.cSld.bg
+        if bg is not None:
+            background = _hex(bg)
+            break
+    else:
+        background = (255, 255, 255)
+    prims = []
+    for shape in slide.shapes:
+        box = (shape.left, shape.top, shape.width, shape.height)
+        if shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
+            prims.append(dict(kind="picture", box=box, blob=shape.image.blob))
+            continue
+        if shape.has_chart:
+            series = [(list(s.values), tuple(s.format.line.color.rgb)) for s in shape.chart.plots[0].series]
+            prims.append(dict(kind="chart", box=box, series=series))
+            continue
+        spPr = shape._element.spPr
+        prst, adj = _geometry(spPr)
+        prims.append(dict(kind=prst, box=box, adj=adj, fill=_fill(spPr), line=_line(spPr), text=_text(shape)))
+    return background, prims
+
+
+# ── Drawing ──────────────────────────────────────────────────────────────
+
+CHART_AXIS = (0x44, 0x44, 0x60)
+CHART_INSET = 0.06              # plot area inset, as a share of the chart box
+
+
+def _draw_chart(draw, box, series):
+    """Line chart sketch: zero-based value axis, one polyline per series, no labels."""
+    left, top, width, height = box
+    x0, y0 = left + width * CHART_INSET, top + height * CHART_INSET
+    x1, y1 = left + width * (1 - CHART_INSET), top + height * (1 - 2 * CHART_INSET)
+    draw.line([(x0, y0), (x0, y1), (x1, y1)], fill=CHART_AXIS, width=1)
+    values = [v for vals, _ in series for v in vals if v is not None]
+    if not values:  # empty or all-blank series: the bare axis
+        return
+    lo, hi = min(0, *values), max(0, *values)
+    span = (hi - lo) or 1
+    for vals, color in series:
+        step = (x1 - x0) / max(1, len(vals) - 1)
+        points = [(x0 + i * step, y1 - (v - lo) / span * (y1 - y0)) for i, v in enumerate(vals) if v is not None]
+        if len(points) > 1:
+            draw.line(points, fill=color, width=2)
+
+
+def missing_reference_fonts():
+    """Weights of the theme font with no installed file; renders only match baselines when empty."""
+    return [f"{THEME_FONT}{' Bold' if bold else ''}" for bold in (False, True)
+            if glyph_advances(THEME_FONT, bold).path is None]
+
+
+@lru_cache(maxsize=None)
+def _draw_font(font_name, bold, size_px):
+    """The installed font the advance table came from, else Pillow's bundled face."""
+    path = glyph_advances(font_name, bold).path
+    return ImageFont.truetype(path, size_px) if path else ImageFont.load_default(size_px)
+
+
+def _draw_text(draw, box, text, px):
+    left, top, width, height = box
+    l_ins, t_ins, r_ins, b_ins = (px(v) for v in text["insets"])
+    size_px = max(1, round(text["size"] * RENDER_DPI / 72))
+    advances = glyph_advances(text["font"], text["bold"])
+    avail_w = width - l_ins - r_ins
+    if text["wrap"]:
+        lines = wrap_text(text["text"], avail_w / size_px, advances)
+    else:
+        lines = text["text"].split("\n")
+    font = _draw_font(text["font"], text["bold"], size_px)
+    line_h = advances.line_height * size_px
+    block_h = line_h * len(lines)
+    if text["anchor"] == "ctr":
+        y = top + (height - block_h) / 2
+    elif text["anchor"] == "b":
+        y = top + height - b_ins - block_h
+    else:
+        y = top + t_ins
+    for line in lines:
+        w = font.getlength(line)
+        if text["align"] == "center":
+            x = left + l_ins + (avail_w - w) / 2
+        elif text["align"] == "right":
+            x = left + width - r_ins - w
+        else:
+            x = left + l_ins
+        draw.text((x, y), line, font=font, fill=text["color"])
+        y += line_h
+
+
+def render_slide(background, prims, size):
+    """Rasterise one slide's primitives onto a size (w, h) pixel canvas."""
+    img = Image.new("RGB", size, background)
+    draw = ImageDraw.Draw(img)
+    px = lambda emu: round(emu * RENDER_DPI / 914400)
+    for prim in prims:
+        box = tuple(px(v) for v in prim["box"])
+        left, top, width, height = box
+        if prim["kind"] == "chart":
+            _draw_chart(draw, box, prim["series"])
+            continue
+        if prim["kind"] == "picture":
+            with Image.open(io.BytesIO(prim["blob"])) as pic:
+                img.paste(pic.convert("RGB").resize((max(1, width), max(1, height)), Image.BILINEAR), (left, top))
+            continue
+        xy = (left, top, left + max(0, width - 1), top + max(0, height - 1))
+        outline, line_w = (prim["line"][0], max(1, px(prim["line"][1]))) if prim["line"] else (None, 0)
+        if prim["fill"] or outline:
+            if prim["kind"] == "ellipse":
+                draw.ellipse(xy, fill=prim["fill"], outline=outline, width=line_w)
+            elif prim["kind"] == "roundRect":
+                radius = round(prim["adj"] * min(width, height))
+                draw.rounded_rectangle(xy, radius, fill=prim["fill"], outline=outline, width=line_w)
+            else:
+                draw.rectangle(xy, fill=prim["fill"], outline=outline, width=line_w)
+        if prim["text"]:
+            _draw_text(draw, box, prim["text"], px)
+    return img
+
+
+# ── Baseline diff ────────────────────────────────────────────────────────
+
+def diff_images(render, baseline):
+    """(fraction of pixels differing beyond DIFF_TOLERANCE, highlighted diff image)."""
+    if render.size != baseline.size:
+        return 1.0, render
+    mask = ImageChops.difference(render, baseline).convert("L").point(lambda v: 255 if v > DIFF_TOLERANCE else 0)
+    changed = mask.histogram()[255] / (render.width * render.height)
+    highlight = Image.blend(render, Image.new("RGB", render.size, (0, 0, 0)), 0.6)
+    highlight.paste(DIFF_HIGHLIGHT, mask=mask)
+    return changed, highlight
+
+
+def _render_job(job):
+    """Worker: render one slide, save it, and compare it with its baseline if there is one."""
+    background, prims, size, out_path, baseline_path = job
+    img = render_slide(background, prims, size)
+    img.save(out_path, optimize=False)
+    name = os.path.basename(out_path)
+    if not baseline_path or not os.path.exists(baseline_path):
+        return name, "new", None
+    with Image.open(baseline_path) as baseline:
+        changed, highlight = diff_images(img, baseline.convert("RGB"))
+    if changed == 0:
+        return name, "same", 0.0
+    highlight.save(out_path.replace(".png", ".diff.png"))
+    return name, "changed", changed
+
+
+def render_deck(deck_path, out_dir, baseline_dir=None, workers=None):
+    """Render every slide of a deck to out_dir/slide-NN.png in worker processes; per-slide diff results."""
+    missing = missing_reference_fonts()
+    if baseline_dir and missing:
+        raise RuntimeError(f"Reference font not installed ({', '.join(missing)}); "
+                           "renders would not be comparable with the baselines")
+    prs = Presentation(deck_path)
+    size = (round(prs.slide_width * RENDER_DPI / 914400), round(prs.slide_height * RENDER_DPI / 914400))
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = []
+    for i, slide in enumerate(prs.slides, 1):
+        name = f"slide-{i:02d}.png"
+        jobs.append((*slide_primitives(slide), size, os.path.join(out_dir, name),
+                     os.path.join(baseline_dir, name) if baseline_dir else None))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_render_job, jobs))
+    if baseline_dir and os.path.isdir(baseline_dir):
+        rendered = {name for name, _, _ in results}
+        results += [(name, "missing", None) for name in sorted(os.listdir(baseline_dir))
+                    if name.endswith(".png") and name not in rendered]
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("deck", nargs="?", default=DEFAULT_DECK)
+    parser.add_argument("--out", default="renders", help="folder for the PNGs and diff images")
+    parser.add_argument("--baseline", default=BASELINE_DIR, help="folder of baseline PNGs, one subfolder per deck")
+    parser.add_argument("--update-baseline", action="store_true", help="replace the baselines with this render")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    stem = os.path.splitext(os.path.basename(args.deck))[0]
+    out_dir = os.path.join(args.out, stem)
+    baseline_dir = os.path.join(args.baseline, stem)
+
+    missing = missing_reference_fonts()
+    if missing and (args.update_baseline or os.path.isdir(baseline_dir)):
+        sys.exit(f"Reference font not installed ({', '.join(missing)}); install Segoe UI or Selawik "
+                 "before writing or comparing baselines")
+    if missing:
+        print(f"Warning: {', '.join(missing)} not installed; rendering a preview in Pillow's bundled face")
+
+    start = time.perf_counter()
+    results = render_deck(args.deck, out_dir, None if args.update_baseline or missing else baseline_dir, args.workers)
+    print(f"Rendered {stem} to {out_dir} in {time.perf_counter() - start:.2f}s")
+
+    if args.update_baseline:
+        shutil.rmtree(baseline_dir, ignore_errors=True)
+        os.makedirs(baseline_dir)
+        for name, _, _ in results:
+            shutil.copyfile(os.path.join(out_dir, name), os.path.join(baseline_dir, name))
+        print(f"Baseline updated: {baseline_dir}")
+    else:
+        for name, status, changed in results:
+            detail = f"  {changed:.2%} of pixels" if changed else ""
+            print(f"  {name:<14} {status}{detail}")
+        if any(status in ("changed", "missing") for _, status, _ in results):
+            sys.exit(1)
@@ -0,0 +1,31 @@
+"""Shared fixtures: a freshly generated workbook and its Assumptions inputs."""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import openpyxl
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from financial_engine import read_assumptions  # noqa: E402
+
+OUTPUT = r"c:\Users\appli\source\repos\MemoryCharm\MemoryCharm_Financial_Model.xlsx"
+
+
+@pytest.fixture(scope="session")
+def workbook_path(tmp_path_factory):
+    cwd = tmp_path_factory.mktemp("model")
+    subprocess.run([sys.executable, str(ROOT / "generate_financial_model.py")],
+                   cwd=cwd, check=True, capture_output=True)
+    # Off Windows the generator's absolute path lands as a single file name in cwd
+    return OUTPUT if os.name == "nt" else str(cwd / OUTPUT)
+
+
+@pytest.fixture(scope="session")
+def inputs(workbook_path):
+    ws = openpyxl.load_workbook(workbook_path)["Assumptions"]
+    return {k: np.array([[v]]) for k, v in read_assumptions(ws).items()}
@@ -0,0 +1,77 @@
+"""Engine checks: tiered pricing edges and the CIAM cost group."""
+import numpy as np
+import pytest
+
+from financial_engine import (
+    PRICING, SERVICE_GROUPS, derive, monthly_cost_by_group, project, scenario_inputs,
+    tiered_cost, tiered_formula, tiered_marginal, tiered_marginal_formula,
+)
+
+AUTH = SERVICE_GROUPS.index("Authentication")
+
+# Free band of 100, 2/unit up to 1,000, then 1/unit — a two-band service for the edge cases
+TIERS = {"unit": 1, "free": "C1", "bands": [("C2", "C3"), (None, "C4")]}
+TIER_CELLS = {"C1": 100.0, "C2": 1000.0, "C3": 2.0, "C4": 1.0}
+
+
+@pytest.fixture
+def two_band(monkeypatch):
+    monkeypatch.setitem(PRICING, "two_band", TIERS)
+    return "two_band"
+
+
+def _excel(expr, qty):
+    """Evaluate a tiered_* formula string with the test cells and qty substituted."""
+    env = {"MAX": max, "MIN": min, "IF": lambda c, t, f: t if c else f, "q": qty, **TIER_CELLS}
+    return eval(expr.replace("Assumptions!", ""), env)
+
+
+@pytest.mark.parametrize("qty, cost, marginal", [
+    (0, 0.0, 0.0),                  # no usage
+    (100, 0.0, 2.0),                # exactly on the free edge: next unit is billed
+    (1000, 1800.0, 1.0),            # exactly on the tier edge
+    (5000, 1800.0 + 4000.0, 1.0),   # above the top breakpoint
+])
+def test_tiered_pricing_edges(two_band, qty, cost, marginal):
+    assert tiered_cost(two_band, qty, TIER_CELLS) == pytest.approx(cost)
+    assert tiered_marginal(two_band, qty, TIER_CELLS) == pytest.approx(marginal)
+    assert _excel(tiered_formula(two_band, "q"), qty) == pytest.approx(cost)
+    assert _excel(tiered_marginal_formula(two_band, "q"), qty) == pytest.approx(marginal)
+
+
+def test_tiered_cost_broadcasts_and_applies_unit(two_band, monkeypatch):
+    qty = np.array([[0, 100, 1000, 5000]])
+    np.testing.assert_allclose(tiered_cost(two_band, qty, TIER_CELLS), [[0, 0, 1800, 5800]])
+    monkeypatch.setitem(TIERS, "unit", 10)
+    np.testing.assert_allclose(tiered_cost(two_band, qty, TIER_CELLS), [[0, 0, 180, 580]])
+    assert _excel(tiered_formula(two_band, "q"), 5000) == pytest.approx(580)
+
+
+def _ciam(a):
+    """Month-24 fleet CIAM cost: Projections row 42 less the fixed CIAM lines."""
+    p = project(derive(a))
+    return p, (p[42] - a["C78"] - a["C80"] - a["C81"])[..., -1]
+
+
+@pytest.mark.parametrize("free_mau", [None, 0.0, 1e12])
+def test_ciam_group_sums_to_projection_row_42(inputs, free_mau):
+    a = dict(inputs)
+    if free_mau is not None:
+        a["C125"] = np.array([[free_mau]])
+    p, ciam = _ciam(a)
+    auth = monthly_cost_by_group(derive(a), p)[..., -1, AUTH]
+    np.testing.assert_allclose(auth * p[11][..., -1], ciam, rtol=1e-12)
+
+
+def test_ciam_group_without_free_band_is_list_rate(inputs):
+    a = dict(inputs, C125=np.array([[0.0]]))
+    p, _ = _ciam(a)
+    auth = monthly_cost_by_group(derive(a), p)[..., -1, AUTH]
+    np.testing.assert_allclose(auth, (a["C126"] * a["C79"])[..., -1])
+
+
+def test_rug_line_varies_by_scenario(inputs):
+    base = {k: float(v[0, 0]) for k, v in inputs.items()}
+    names, scn = scenario_inputs(base)
+    expected = {"Conservative": "C283", "Base Case": "C267", "Optimistic": "D283"}
+    assert scn["C267"][:, 0].tolist() == [base[expected[n]] for n in names]
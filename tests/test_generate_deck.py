@@ -0,0 +1,67 @@
+"""Deck builder checks: spec loading, bulk insertion, text fitting, incremental builds, screenshots."""
+import json
+from copy import deepcopy
+
+import pytest
+from lxml import etree
+
+pytest.importorskip("pptx")
+
+from pptx import Presentation  # noqa: E402
+from pptx.util import Inches  # noqa: E402
+
+from generate_deck import (  # noqa: E402
+    FLOW_SPEC, ShapeBatch, add_blank_slide, build_incremental, draw_step_slide, find_screenshots,
+    fit_text_size, load_flow_spec, new_presentation, path_steps,
+)
+
+
+def test_spec_loader_rejects_unknown_step(tmp_path):
+    spec = {"steps": [{"id": "scan", "short": "Scan", "title": "Scan", "description": "."}],
+            "paths": [{"id": "p", "name": "P", "steps": ["scan", "nope"]}]}
+    path = tmp_path / "flow.json"
+    path.write_text(json.dumps(spec), encoding="utf-8")
+    with pytest.raises(ValueError, match="'p' references unknown steps: nope"):
+        load_flow_spec(str(path))
+
+
+def test_shape_batch_matches_per_shape_xml():
+    steps = path_steps(FLOW_SPEC)
+    prs = new_presentation()
+    single = add_blank_slide(prs)
+    draw_step_slide(single, steps, 2)
+    batched = add_blank_slide(prs)
+    with ShapeBatch(batched) as batch:
+        draw_step_slide(batch, steps, 2)
+    assert etree.tostring(batched.shapes._spTree) == etree.tostring(single.shapes._spTree)
+
+
+def test_text_fitter_shrinks_overflowing_text():
+    width, height = Inches(3), Inches(1)
+    assert fit_text_size("Short line.", width, height, 14) == (14, True)
+    size, fits = fit_text_size("a fairly long sentence that wraps " * 6, width, height, 14, min_size=6)
+    assert fits and 6 <= size < 14
+    assert fit_text_size("word " * 500, width, height, 14, min_size=10) == (10, False)
+
+
+def test_incremental_rewrites_only_changed_slides(tmp_path):
+    output = str(tmp_path / "deck.pptx")
+    written, total = build_incremental(output)
+    assert written == total
+    assert build_incremental(output) == (0, total)
+
+    spec = deepcopy(FLOW_SPEC)
+    spec["steps"][1]["description"] = "Edited description."
+    assert build_incremental(output, spec=spec) == (1, total)
+    assert build_incremental(output, spec=spec) == (0, total)
+    slide = Presentation(output).slides[3]  # title, overview, step 1, step 2
+    texts = [shape.text_frame.text for shape in slide.shapes if shape.name == "Step Description"]
+    assert texts == ["Edited description."]
+
+
+def test_missing_named_screenshot_warns(tmp_path):
+    (tmp_path / "scan.png").write_bytes(b"")
+    steps = [{"id": "scan"}, {"id": "bind", "screenshot": "bind-v2.png"}]
+    with pytest.warns(UserWarning, match="'bind': screenshot 'bind-v2.png' not found"):
+        found = find_screenshots(str(tmp_path), steps)
+    assert found == {"scan": str(tmp_path / "scan.png")}
@@ -0,0 +1,185 @@
+"""The numpy engine against the generated workbook's own formulas, evaluated with pycel."""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from openpyxl.utils import get_column_letter
+
+from financial_engine import (
+    PLACEMENTS, PLAN_NAMES, SCALE_LIMITS, TIER_LIFETIMES, _lag_sum, band_months_within, charms_by_age_band, derive,
+    first_crossing, functions_plan_costs, limit_utilization, marginal_cost_per_charm, media_cost_attribution,
+    mirror_cost_availability, monthly_cost_by_group, obligation_pv, optimize_lifecycle, plan_crossover,
+    playback_latency, project, recompression_cohorts, recompression_per_charm, size_quantiles, size_tail_share,
+    xround,
+)
+
+pycel = pytest.importorskip("pycel")
+sys.path.insert(0, str(Path(__file__).parent))
+
+PRJ = "'24-Month Projections'"
+PLANS = {"Consumption": 0, "Premium": 1, "Flex": 2}      # row 144 shows the plan name
+
+
+@pytest.fixture(scope="module")
+def excel(workbook_path):
+    return pycel.ExcelCompiler(filename=workbook_path, plugins=["xl_functions"])
+
+
+@pytest.fixture(scope="module")
+def base(inputs):
+    a = derive(dict(inputs))
+    return a, project(a)
+
+
+def _sheet_row(excel, row, sheet=PRJ):
+    vals = [excel.evaluate(f"{sheet}!{get_column_letter(m + 3)}{row}") for m in range(24)]
+    return np.array([PLANS.get(v, v) if isinstance(v, str) else v for v in vals], dtype=float)
+
+
+# Each case edits Assumptions inputs in both the workbook and the engine
+@pytest.mark.parametrize("overrides", [{}, {"C179": 0}, {"C125": 0, "C124": 0}], ids=["base", "unbatched", "no-free-bands"])
+def test_project_matches_projection_rows(excel, inputs, overrides):
+    a = dict(inputs)
+    for cell, value in overrides.items():
+        excel.set_value(f"Assumptions!{cell}", value)
+        a[cell] = np.array([[float(value)]])
+    try:
+        p = project(derive(a))
+        for row in sorted(p):
+            np.testing.assert_allclose(_sheet_row(excel, row), p[row][0], rtol=1e-9, atol=1e-9,
+                                       err_msg=f"Projections row {row}")
+    finally:
+        for cell in overrides:
+            excel.set_value(f"Assumptions!{cell}", float(inputs[cell][0, 0]))
+
+
+def test_row_122_is_three_month_lag_sum(excel, inputs):
+    new_charms = _sheet_row(excel, 9)
+    expected = xround(_lag_sum(new_charms, 3) * inputs["C38"][0, 0])
+    np.testing.assert_allclose(_sheet_row(excel, 122), expected)
+
+
+def test_size_percentiles_follow_the_mix(excel, inputs):
+    a = derive({k: float(v[0, 0]) for k, v in inputs.items()})
+    sheet = [excel.evaluate(f"'Per-Charm Costs'!D{row}") for row in range(124, 128)]
+    np.testing.assert_allclose(sheet, size_quantiles(a, [0.10, 0.50, 0.90, 0.99]), rtol=0.01)
+    tail = excel.evaluate("'Per-Charm Costs'!C128")
+    assert tail == pytest.approx(size_tail_share(a, 0.90), abs=0.005)
+
+
+@pytest.mark.parametrize("row", [72, 76])
+def test_runoff_reconciles_with_revenue_recognition(excel, row):
+    gap = [excel.evaluate(f"'Revenue Recognition'!{get_column_letter(m + 3)}{row}") for m in range(24)]
+    np.testing.assert_allclose(gap, 0, atol=1e-6)
+
+
+def test_marginal_cost_base_case_is_live(excel, base):
+    a, p = base
+    np.testing.assert_allclose(_sheet_row(excel, 14, "'Marginal Cost at Scale'"), p[43][0], rtol=1e-9)
+    np.testing.assert_allclose(_sheet_row(excel, 16, "'Marginal Cost at Scale'"),
+                               marginal_cost_per_charm(a, p)[0], rtol=1e-9)
+
+
+def _cells(excel, sheet, col, rows):
+    return [excel.evaluate(f"'{sheet}'!{col}{r}") for r in rows]
+
+
+@pytest.mark.parametrize("overrides", [{}, {"C145": 0, "C144": 60000000}], ids=["base", "single-copy-allowed"])
+def test_storage_tiering_base_case_is_live(excel, inputs, overrides):
+    a = dict(inputs)
+    for cell, value in overrides.items():
+        excel.set_value(f"Assumptions!{cell}", value)
+        a[cell] = np.array([[float(value)]])
+    try:
+        a = derive(a)
+        t = optimize_lifecycle(a)
+        bands = range(14, 19)                                       # Base Case block, one row per band
+        np.testing.assert_allclose(_cells(excel, "Storage Tiering", "C", bands), t["current_cost"][0], rtol=1e-9)
+        np.testing.assert_allclose(_cells(excel, "Storage Tiering", "E", bands), t["best_cost"][0], rtol=1e-9)
+        assert _cells(excel, "Storage Tiering", "D", bands) == [PLACEMENTS[i][0] for i in t["best"][0]]
+        saving = [(band_months_within(a, life) * t["saving"]).sum() for life in (120, 180, 360)]
+        np.testing.assert_allclose(_cells(excel, "Storage Tiering", "D", range(30, 33)), saving, rtol=1e-9)
+        p = project(a)
+        fleet = charms_by_age_band(a, p)[0]
+        np.testing.assert_allclose(excel.evaluate("'Storage Tiering'!D38"),
+                                   (fleet * t["best_cost"][0]).sum(), rtol=1e-9)
+    finally:
+        for cell in overrides:
+            excel.set_value(f"Assumptions!{cell}", float(inputs[cell][0, 0]))
+
+
+def test_playback_slo_base_case_is_live(excel, base):
+    a, p = base
+    slo = playback_latency(a)
+    table = _cells(excel, "Playback SLO", "D", range(6, 12))
+    np.testing.assert_allclose(table[:2], [a["C152"][0, 0], slo["mean"][0, 0]], rtol=1e-9)
+    np.testing.assert_allclose(table[2:5], [slo[q][0, 0] for q in (0.5, 0.95, 0.99)], rtol=0.01)
+    sweep = [0, 15, 43, 120, 240, 720, 1440]
+    tail = playback_latency(a, outage_minutes=sweep)[0.99][0]
+    np.testing.assert_allclose([excel.evaluate(f"'Playback SLO'!{get_column_letter(3 + o)}17") for o in range(7)],
+                               tail, rtol=0.01)
+    cost, avail, failed = mirror_cost_availability(a, p, [a["C151"][0, 0]])
+    np.testing.assert_allclose(_cells(excel, "Playback SLO", "C", range(30, 34)), cost[0, 0], rtol=1e-9)
+    np.testing.assert_allclose(_cells(excel, "Playback SLO", "E", range(30, 34)), failed[0, 0], rtol=1e-9)
+
+
+def test_getcharm_cache_base_case_is_live(excel, base):
+    a, p = base
+    no_cache = project({**a, "C165": a["C165"] * 0})
+    np.testing.assert_allclose(_sheet_row(excel, 16, "'GetCharm Cache'"), p[124][0], rtol=1e-9)
+    np.testing.assert_allclose(_sheet_row(excel, 20, "'GetCharm Cache'"), no_cache[43][0] - p[43][0],
+                               rtol=1e-9, atol=1e-9)
+
+
+def test_hosting_plans_base_case_is_live(excel, base):
+    a, p = base
+    np.testing.assert_allclose(_sheet_row(excel, 18, "'Hosting Plans'"), p[142][0], rtol=1e-9)
+    first = plan_crossover(a, p)[0, 1:]
+    assert _cells(excel, "Hosting Plans", "D", (35, 36)) == [
+        f"Month {m}" if m else "Not within 24 months" for m in first]
+    volumes = _cells(excel, "Hosting Plans", "B", range(40, 48))
+    plans = functions_plan_costs(a, np.array(volumes))
+    for col, key in zip("CDEFG", ("consumption", "premium", "premium_instances", "flex", "cold_consumption")):
+        np.testing.assert_allclose(_cells(excel, "Hosting Plans", col, range(40, 48)), plans[key][0], rtol=1e-9)
+    cheapest = np.argmin(np.stack([plans["consumption"], plans["premium"], plans["flex"]]), axis=0)[0]
+    assert _cells(excel, "Hosting Plans", "H", range(40, 48)) == [PLAN_NAMES[i] for i in cheapest]
+
+
+def test_scale_limits_base_case_is_live(excel, base):
+    a, p = base
+    util = limit_utilization(a, p)[0]
+    first = first_crossing(util[None])[0]
+    rows = range(20, 20 + len(SCALE_LIMITS))                  # Base Case first-crossed table, 1x column
+    assert _cells(excel, "Scale Limits", "C", rows) == [f"Month {m}" if m else "—" for m in first]
+    for k, row in enumerate(range(49, 49 + len(SCALE_LIMITS))):    # x1 utilization timeline
+        sheet = _sheet_row(excel, row, "'Scale Limits'")
+        np.testing.assert_allclose(sheet, util[k], rtol=1e-9, err_msg=SCALE_LIMITS[k][0])
+
+
+def test_media_mix_base_case_is_live(excel, base):
+    a, p = base
+    for k, (label, cost) in enumerate(media_cost_attribution(a, p).items()):
+        row = 19 + k
+        assert excel.evaluate(f"'Media Mix'!B{row}") == label
+        sheet = [excel.evaluate(f"'Media Mix'!{c}{row}") for c in "CDE"]
+        np.testing.assert_allclose(sheet, cost[0], rtol=1e-9, atol=1e-12, err_msg=label)
+
+
+def test_recompression_base_case_is_live(excel, base):
+    a, p = base
+    per = recompression_per_charm(a)
+    np.testing.assert_allclose(_cells(excel, "Recompression", "E", range(6, 9)), per["monthly_saving"][0, 0], rtol=1e-9)
+    np.testing.assert_allclose(_cells(excel, "Recompression", "F", range(6, 9)), per["break_even"][0, 0], rtol=1e-9)
+    np.testing.assert_allclose(_cells(excel, "Recompression", "I", range(6, 9)),
+                               per["lifetime_net"]["Perpetual (30-yr est)"][0, 0], rtol=1e-9)
+    np.testing.assert_allclose(_cells(excel, "Recompression", "D", range(32, 56)),
+                               recompression_cohorts(a, p)[0], rtol=1e-9)
+
+
+def test_obligation_npv_base_case_is_live(excel, base):
+    a, p = base
+    np.testing.assert_allclose(_sheet_row(excel, 17, "'Obligation NPV'"), obligation_pv(a, p)[0], rtol=1e-9)
+    flat = sum(np.cumsum(p[row][0]) * months for _, row, months in TIER_LIFETIMES)
+    np.testing.assert_allclose(_sheet_row(excel, 16, "'Obligation NPV'"),
+                               flat * monthly_cost_by_group(a, p)[0, 0].sum(), rtol=1e-9)
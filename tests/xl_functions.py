@@ -0,0 +1,6 @@
+"""Excel functions pycel lacks, loaded as a pycel plugin by the parity tests."""
+import math
+
+
+def normsdist(z):
+    return 0.5 * (1 + math.erf(z / math.sqrt(2)))